@@ -1,97 +1,230 @@
-from PyQt6.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
 import logging
 import threading
-from collections import deque
+import time
 
-class Worker(QObject):
-    finished = pyqtSignal(object)
-    error = pyqtSignal(object)
+class AsyncFuture:
+    """
+    Handle for one asynchronous DataManager call.
+    The callback runs on the GUI thread with the result, unless the future was cancelled.
+    """
+    PENDING, RUNNING, DONE, FAILED, CANCELLED = "pending", "running", "done", "failed", "cancelled"
 
-    def __init__(self, func, *args, **kwargs):
+    def __init__(self, manager, task, callback, group=None):
+        self._manager = manager
+        self._task = task
+        self.callback = callback
+        self.group = group
+        self.state = self.PENDING
+        self.result = None
+        self.error = None
+
+    def cancel(self):
+        """Drops the callback; the shared call itself is dequeued once no future waits for it."""
+        if self.state in (self.DONE, self.FAILED, self.CANCELLED):
+            return False
+        self.state = self.CANCELLED
+        self._manager._detach(self)
+        return True
+
+    def cancelled(self):
+        return self.state == self.CANCELLED
+
+    def done(self):
+        return self.state in (self.DONE, self.FAILED, self.CANCELLED)
+
+class _Task(QRunnable):
+    """One DataManager call, shared by every future that asked for the same thing."""
+
+    def __init__(self, manager, key, method_name, func, args, kwargs):
         super().__init__()
+        self.setAutoDelete(False)
+        self.manager = manager
+        self.key = key
+        self.method_name = method_name
         self.func = func
         self.args = args
         self.kwargs = kwargs
+        self.futures = []
+        self.submitted_at = time.perf_counter()
+        self.started_at = None
+        self.finished = False
 
-    @pyqtSlot()
     def run(self):
+        self.started_at = time.perf_counter()
+        for future in list(self.futures):
+            if future.state == AsyncFuture.PENDING:
+                future.state = AsyncFuture.RUNNING
         try:
-            result = self.func(*self.args, **self.kwargs)
-            self.finished.emit(result)
+            result, error = self.func(*self.args, **self.kwargs), None
         except Exception as e:
-            self.error.emit(e)
+            result, error = None, e
+        # Later identical requests must not attach to a result that is already computed
+        self.finished = True
+        self.manager._dispatcher.finished.emit(self, result, error)
+
+class _Dispatcher(QObject):
+    # Emitted from pool threads, delivered on the GUI thread
+    finished = pyqtSignal(object, object, object) # task, result, error
 
 class AsyncDataManager:
-    def __init__(self, data_manager):
+    """
+    Runs DataManager calls on a fixed-size QThreadPool.
+
+    Identical read calls that are still queued or running share one execution.
+    Every call returns an AsyncFuture that can be cancelled; futures submitted
+    with a `group` (e.g. the tab that asked) can be cancelled together with
+    cancel_group(), so reads for a tab the user left are not delivered.
+    """
+    # Read operations whose identical in-flight calls are merged
+    DEDUPLICATED = {"get_total_capital_balance", "get_category_stats", "get_transactions"}
+
+    def __init__(self, data_manager, max_workers=2):
         self.dm = data_manager
-        self._thread_pool = deque(maxlen=50)
-        self._pool_lock = threading.Lock()
-        self._cleanup_threshold = 30
-
-    def _cleanup_finished_threads(self):
-        with self._pool_lock:
-            while self._thread_pool and not self._thread_pool[0].isRunning():
-                self._thread_pool.popleft()
-            if len(self._thread_pool) > self._cleanup_threshold:
-                self._thread_pool.extend([t for t in self._thread_pool if not t.isFinished()])
-                while len(self._thread_pool) > self._cleanup_threshold:
-                    if self._thread_pool:
-                        self._thread_pool.popleft()
-
-    def _run_async(self, method_name, callback, *args, **kwargs):
-        method_name_str = method_name
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(max_workers)
+        self._dispatcher = _Dispatcher()
+        self._dispatcher.finished.connect(self._on_finished)
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._tasks = set()
+
+        self.submitted = 0
+        self.deduplicated = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.last_wait = 0.0
+        self.last_run = 0.0
+        self.max_run = 0.0
+        self._total_run = 0.0
+
+    def _run_async(self, method_name, callback, *args, group=None, **kwargs):
+        """Schedules dm.<method_name>(*args, **kwargs); callback(result) runs on the GUI thread."""
         try:
-            logging.debug(f"Async: starting {method_name_str}")
-            method = getattr(self.dm, method_name_str)
-            
-            thread = QThread()
-            worker = Worker(method, *args, **kwargs)
-            worker.moveToThread(thread)
-            
-            def on_finished(res):
-                logging.debug(f"Async: finished {method_name_str}")
-                callback(res)
-                self._cleanup_finished_threads()
-
-            worker.finished.connect(on_finished)
-            worker.finished.connect(thread.quit)
-            worker.finished.connect(worker.deleteLater)
-            
-            def on_error(e):
-                logging.error(f"Async error in {method_name_str}: {e}")
-            worker.error.connect(on_error)
-            worker.error.connect(thread.quit)
-            worker.error.connect(worker.deleteLater)
-            
-            thread.started.connect(worker.run)
-            thread.finished.connect(thread.deleteLater)
-            
-            if not thread.isRunning():
-                thread.start()
-                with self._pool_lock:
-                    self._thread_pool.append(thread)
-            else:
-                logging.warning(f"Thread for {method_name_str} already running")
+            func = getattr(self.dm, method_name)
         except AttributeError as e:
-            logging.error(f"Method {method_name_str} not found in DataManager: {e}")
-        except Exception as e:
-            logging.error(f"Failed to start async task {method_name_str}: {e}")
+            logging.error(f"Method {method_name} not found in DataManager: {e}")
+            return None
+
+        key = None
+        if method_name in self.DEDUPLICATED:
+            key = (method_name, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                key = None
+
+        with self._lock:
+            self.submitted += 1
+            task = self._in_flight.get(key) if key else None
+            is_new = task is None or task.finished
+            if is_new:
+                task = _Task(self, key, method_name, func, args, kwargs)
+                if key:
+                    self._in_flight[key] = task
+                self._tasks.add(task)
+            else:
+                self.deduplicated += 1
+            future = AsyncFuture(self, task, callback, group)
+            task.futures.append(future)
+
+        if is_new:
+            logging.debug(f"Async: starting {method_name}")
+            self._pool.start(task)
+        return future
+
+    def _detach(self, future):
+        task = future._task
+        with self._lock:
+            self.cancelled += 1
+            if any(f.state in (AsyncFuture.PENDING, AsyncFuture.RUNNING) for f in task.futures):
+                return
+            # Nobody waits for this call anymore: take it off the queue if it has not started
+            if task.started_at is None and self._pool.tryTake(task):
+                self._forget(task)
+
+    def _forget(self, task):
+        if task.key and self._in_flight.get(task.key) is task:
+            del self._in_flight[task.key]
+        self._tasks.discard(task)
+
+    def _on_finished(self, task, result, error):
+        finished_at = time.perf_counter()
+        with self._lock:
+            self._forget(task)
+            futures = list(task.futures)
+            run = finished_at - (task.started_at or finished_at)
+            self.last_wait = (task.started_at or finished_at) - task.submitted_at
+            self.last_run = run
+            self.max_run = max(self.max_run, run)
+            self._total_run += run
+            if error is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+        if error is not None:
+            logging.error(f"Async error in {task.method_name}: {error}")
+        else:
+            logging.debug(f"Async: finished {task.method_name}")
+
+        for future in futures:
+            if future.state == AsyncFuture.CANCELLED:
+                continue
+            if error is not None:
+                future.state, future.error = AsyncFuture.FAILED, error
+                continue
+            future.state, future.result = AsyncFuture.DONE, result
+            if future.callback:
+                try:
+                    future.callback(result)
+                except Exception as e:
+                    logging.error(f"Async callback for {task.method_name} failed: {e}")
+
+    def cancel_group(self, group):
+        """Cancels every unfinished future submitted with this group. Returns how many were cancelled."""
+        with self._lock:
+            futures = [f for task in self._tasks for f in task.futures if f.group == group]
+        return sum(1 for f in futures if f.cancel())
+
+    def stats(self):
+        """Queue/running counts, totals, and wait/run latency in seconds."""
+        with self._lock:
+            queued = sum(1 for task in self._tasks if task.started_at is None)
+            finished = self.completed + self.failed
+            return {
+                "queued": queued,
+                "running": len(self._tasks) - queued,
+                "submitted": self.submitted,
+                "deduplicated": self.deduplicated,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "last_wait": self.last_wait,
+                "last_run": self.last_run,
+                "max_run": self.max_run,
+                "avg_run": self._total_run / finished if finished else 0.0,
+            }
+
+    def wait_for_done(self, msecs=-1):
+        """Blocks until the pool is idle (for shutdown and tests)."""
+        return self._pool.waitForDone(msecs)
 
     # --- Async Wrappers for Read Operations ---
-    def get_total_capital_balance(self, callback):
-        self._run_async("get_total_capital_balance", callback)
+    def get_total_capital_balance(self, callback, group=None):
+        return self._run_async("get_total_capital_balance", callback, group=group)
 
-    def get_category_stats(self, callback, category):
-        self._run_async("get_category_stats", callback, category)
+    def get_category_stats(self, callback, category, group=None):
+        return self._run_async("get_category_stats", callback, category, group=group)
 
-    def get_transactions(self, callback, category):
-        self._run_async("get_transactions", callback, category)
+    def get_transactions(self, callback, category, group=None):
+        return self._run_async("get_transactions", callback, category, group=group)
 
     # --- Async Wrappers for Write Operations (fire-and-forget or with callback) ---
     def save_data(self, callback=None):
         if callback is None: callback = lambda r: logging.info("Async save completed.")
-        self._run_async("save_data", callback)
+        return self._run_async("save_data", callback)
 
     def add_transaction(self, callback, category, amount, comment, **kwargs):
-        self._run_async("add_transaction", callback, category, amount, comment, **kwargs)
+        return self._run_async("add_transaction", callback, category, amount, comment, **kwargs)
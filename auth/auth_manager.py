@@ -2,12 +2,13 @@ import sys
 import platform
 import subprocess
 import uuid
-import requests
 import json
 import os
 import logging
 import hashlib
 from datetime import datetime, timedelta
+from import_profiler import lazy_module
+requests = lazy_module("requests") # Loaded on first use, keeps it off the startup path
 
 logger = logging.getLogger(__name__)
 
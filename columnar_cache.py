@@ -0,0 +1,92 @@
+import bisect
+from array import array
+from operator import itemgetter
+
+# NumPy turns window reductions into vector operations; plain loops are the fallback
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class LedgerColumns:
+    """
+    Day ordinal, amount and ad cost columns of one ledger, sorted by date ascending.
+
+    Amounts are in minor units. ad_costs holds the ad_cost field of rows that have no
+    separate ad cost row (0 otherwise), so with_ad_costs reductions count every ad cost
+    once. Windows follow DataManager.query_transactions: rows with unparsable dates
+    (ordinal 0) only take part when both bounds are None.
+    """
+
+    def __init__(self, rows):
+        """rows: iterable of (date_ord, amount_minor, ad_cost_minor) in any order."""
+        rows = sorted(rows, key=itemgetter(0))
+        self.ords = array("q", map(itemgetter(0), rows))
+        self.amounts = array("q", map(itemgetter(1), rows))
+        self.ad_costs = array("q", map(itemgetter(2), rows))
+        if np is not None:
+            # Views of the arrays above through the buffer protocol
+            self.ords = np.asarray(self.ords, dtype=np.int64)
+            self.amounts = np.asarray(self.amounts, dtype=np.int64)
+            self.ad_costs = np.asarray(self.ad_costs, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.ords)
+
+    def window(self, start_ord=None, end_ord=None):
+        """[lo, hi) row range for inclusive ordinal bounds (None = unbounded)."""
+        if start_ord is None and end_ord is None:
+            return 0, len(self.ords)
+        first = max(start_ord or 0, 1)
+        if np is not None:
+            lo = int(np.searchsorted(self.ords, first, side="left"))
+            hi = len(self.ords) if end_ord is None else int(np.searchsorted(self.ords, end_ord, side="right"))
+        else:
+            lo = bisect.bisect_left(self.ords, first)
+            hi = len(self.ords) if end_ord is None else bisect.bisect_right(self.ords, end_ord)
+        return lo, max(lo, hi)
+
+    def totals(self, start_ord=None, end_ord=None, with_ad_costs=False):
+        """(income, expenses) in minor units over the window."""
+        lo, hi = self.window(start_ord, end_ord)
+        if np is not None:
+            amounts = self.amounts[lo:hi]
+            income = int(amounts[amounts > 0].sum())
+            expenses = -int(amounts[amounts < 0].sum())
+            if with_ad_costs:
+                expenses += int(self.ad_costs[lo:hi].sum())
+            return income, expenses
+
+        income = expenses = 0
+        for amount in self.amounts[lo:hi]:
+            if amount > 0: income += amount
+            else: expenses -= amount
+        if with_ad_costs:
+            expenses += sum(self.ad_costs[lo:hi])
+        return income, expenses
+
+    def daily(self, start_ord, end_ord, with_ad_costs=True):
+        """Per-day (incomes, expenses) lists in minor units, one entry per day of [start_ord, end_ord]."""
+        days = end_ord - start_ord + 1
+        if days <= 0:
+            return [], []
+        lo, hi = self.window(start_ord, end_ord)
+        if np is not None:
+            index = self.ords[lo:hi] - start_ord
+            amounts = self.amounts[lo:hi]
+            costs = np.where(amounts < 0, -amounts, 0)
+            if with_ad_costs:
+                costs = costs + self.ad_costs[lo:hi]
+            incomes = np.bincount(index, weights=np.where(amounts > 0, amounts, 0), minlength=days)
+            expenses = np.bincount(index, weights=costs, minlength=days)
+            return np.rint(incomes).astype(np.int64).tolist(), np.rint(expenses).astype(np.int64).tolist()
+
+        incomes, expenses = [0] * days, [0] * days
+        for i in range(lo, hi):
+            day, amount = self.ords[i] - start_ord, self.amounts[i]
+            if amount > 0: incomes[day] += amount
+            else: expenses[day] -= amount
+            if with_ad_costs:
+                expenses[day] += self.ad_costs[i]
+        return incomes, expenses
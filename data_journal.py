@@ -0,0 +1,242 @@
+import os
+import json
+import logging
+import threading
+import atexit
+
+
+class DataJournal:
+    """
+    Append-only change log that sits next to data.json.
+
+    Every line is one JSON operation with a monotonically increasing "seq".
+    Operations are buffered and written + fsynced in batches by a single
+    background thread. A full snapshot (data.json) records the last seq it
+    contains in _metadata.journal_seq, so startup = snapshot + replay of newer ops.
+
+    Supported operations (paths walk dicts by key and lists by item "id"):
+        {"op": "set",    "path": [...], "value": v}
+        {"op": "del",    "path": [...]}
+        {"op": "insert", "path": [...], "index": i, "value": item}
+        {"op": "remove", "path": [...], "id": item_id}
+    """
+
+    def __init__(self, path, flush_interval=0.5, compact_bytes=4 * 1024 * 1024, on_compact=None):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.compact_bytes = compact_bytes
+        self.on_compact = on_compact
+
+        self.last_seq = 0
+        self._pending = []
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._compacting = False
+        self._stopped = False
+        self._atexit_registered = False
+
+    # --- Writing ---
+
+    def append(self, ops):
+        """Queues operations for the next batched write. Returns the last assigned seq."""
+        with self._lock:
+            for op in ops:
+                self.last_seq += 1
+                op["seq"] = self.last_seq
+                # Serialize now: the values are live references into DataManager.data
+                self._pending.append(json.dumps(op, ensure_ascii=False) + "\n")
+            self._ensure_writer()
+            return self.last_seq
+
+    def _ensure_writer(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._writer_loop, name="DataJournalWriter", daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self._flush_at_exit)
+                self._atexit_registered = True
+
+    def _writer_loop(self):
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logging.error(f"Journal flush failed: {e}")
+            self._maybe_compact()
+
+    def flush(self):
+        """Writes and fsyncs all buffered operations."""
+        with self._lock:
+            if not self._pending:
+                return
+            batch = self._pending
+            self._pending = []
+            lines = "".join(batch)
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError:
+                # Keep the batch so the next flush retries it
+                self._pending = batch + self._pending
+                raise
+
+    def _flush_at_exit(self):
+        # Raising here would only print a traceback at interpreter exit
+        try:
+            self.flush()
+        except OSError as e:
+            logging.error(f"Journal flush at exit failed: {e}")
+
+    def stop(self):
+        """Flushes pending operations and stops the writer thread."""
+        self._stopped = True
+        self._wakeup.set()
+        if self._atexit_registered:
+            atexit.unregister(self._flush_at_exit)
+            self._atexit_registered = False
+        self.flush()
+
+    def size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def _maybe_compact(self):
+        if not self.on_compact or self._compacting:
+            return
+        if self.size() < self.compact_bytes:
+            return
+        self._compacting = True
+        try:
+            logging.info(f"Compacting journal {self.path} ({self.size()} bytes)")
+            self.on_compact()
+        except Exception as e:
+            logging.error(f"Journal compaction failed: {e}")
+        finally:
+            self._compacting = False
+
+    def truncate(self, upto_seq):
+        """Drops operations already contained in a snapshot (seq <= upto_seq)."""
+        with self._lock:
+            self.flush()
+            if not os.path.exists(self.path):
+                return
+            remaining = [op for op in self.read_ops() if op.get("seq", 0) > upto_seq]
+            if not remaining:
+                os.remove(self.path)
+                return
+            temp_file = self.path + ".tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                for op in remaining:
+                    f.write(json.dumps(op, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.path)
+
+    # --- Reading / Replay ---
+
+    def read_ops(self, after_seq=0):
+        """Yields journal operations with seq > after_seq. A torn last line is ignored."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    op = json.loads(line)
+                except ValueError:
+                    logging.warning(f"Skipping corrupt journal line in {self.path}")
+                    continue
+                if op.get("seq", 0) > after_seq:
+                    yield op
+
+    def replay(self, data):
+        """Applies journal operations newer than the snapshot to data. Returns applied count."""
+        snapshot_seq = data.get("_metadata", {}).get("journal_seq", 0)
+        applied = 0
+        max_seq = snapshot_seq
+        for op in self.read_ops(after_seq=snapshot_seq):
+            try:
+                apply_op(data, op)
+                applied += 1
+            except (KeyError, IndexError, TypeError, StopIteration) as e:
+                logging.warning(f"Failed to replay journal op {op.get('seq')}: {e}")
+            max_seq = max(max_seq, op.get("seq", 0))
+        with self._lock:
+            self.last_seq = max(self.last_seq, max_seq)
+        if applied:
+            logging.info(f"Replayed {applied} journal operations from {self.path}")
+        return applied
+
+
+def _child(node, key, create=False):
+    if isinstance(node, list):
+        if isinstance(key, int):
+            return node[key]
+        return next(item for item in node if isinstance(item, dict) and item.get("id") == key)
+    if create and key not in node:
+        node[key] = {}
+    return node[key]
+
+
+def _resolve(data, path, create=False):
+    node = data
+    for key in path:
+        node = _child(node, key, create)
+    return node
+
+
+def apply_op(data, op):
+    """Applies a single journal operation to data in place (idempotent)."""
+    kind = op["op"]
+    path = op["path"]
+
+    if kind == "set":
+        parent = _resolve(data, path[:-1], create=True)
+        key = path[-1]
+        if isinstance(parent, list):
+            for i, item in enumerate(parent):
+                if isinstance(item, dict) and item.get("id") == key:
+                    parent[i] = op["value"]
+                    break
+            else:
+                parent.append(op["value"])
+        else:
+            parent[key] = op["value"]
+
+    elif kind == "del":
+        parent = _resolve(data, path[:-1])
+        key = path[-1]
+        if isinstance(parent, list):
+            parent[:] = [item for item in parent if not (isinstance(item, dict) and item.get("id") == key)]
+        else:
+            parent.pop(key, None)
+
+    elif kind == "insert":
+        target = _resolve(data, path)
+        value = op["value"]
+        item_id = value.get("id") if isinstance(value, dict) else None
+        if item_id is not None:
+            target[:] = [item for item in target if not (isinstance(item, dict) and item.get("id") == item_id)]
+        index = op.get("index")
+        if index is None or index >= len(target):
+            target.append(value)
+        else:
+            target.insert(index, value)
+
+    elif kind == "remove":
+        target = _resolve(data, path)
+        item_id = op["id"]
+        target[:] = [item for item in target if not (isinstance(item, dict) and item.get("id") == item_id)]
+
+    else:
+        raise KeyError(f"Unknown journal op: {kind}")
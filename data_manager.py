@@ -7,16 +7,64 @@ import logging
 import time
 import hashlib
 import threading
-import requests
+import bisect
 from datetime import datetime
-from functools import lru_cache
-from collections import OrderedDict
-from PyQt6.QtCore import Qt, QByteArray, QBuffer, QIODevice, pyqtSignal, QObject, QFileSystemWatcher
+from PyQt6.QtCore import Qt, QByteArray, QBuffer, QIODevice, pyqtSignal, QObject, QFileSystemWatcher, QTimer
 from PyQt6.QtGui import QPixmap, QPainter
-from utils import Money
+from utils import Money, parse_date_ordinal
+from data_journal import DataJournal
+import json_codec
+from image_store import ImageStore, is_ref
+from thumbnail_cache import ThumbnailCache
+from save_scheduler import SaveScheduler
+from sqlite_storage import SQLiteStorage
+import profile_segments
+from profile_segments import ProfileSegments
+from columnar_cache import LedgerColumns
+from import_profiler import lazy_module
+requests = lazy_module("requests") # Loaded on first use, keeps it off the startup path
 
 APP_NAME = "MoneyTracker"
 
+# Categories with running income/expense totals (see DataManager._get_category_totals)
+AGGREGATED_CATEGORIES = ["car_rental", "mining", "farm_bp", "fishing", "clothes", "clothes_new", "cars_trade"]
+
+
+def tx_date_ord(t):
+    """Pre-parsed day ordinal of a transaction (the "date_ord" field), filled in on first use."""
+    ordinal = t.get("date_ord")
+    if ordinal is None:
+        ordinal = t["date_ord"] = parse_date_ordinal(t.get("date", ""))
+    return ordinal
+
+
+def tx_amount_minor(t):
+    """Amount of a transaction in minor units (the "amount_minor" field), filled in on first use."""
+    amount = t.get("amount_minor")
+    if amount is None:
+        amount = t["amount_minor"] = Money.to_minor(t.get("amount", 0))
+    return amount
+
+
+def refresh_tx_fields(t):
+    """
+    Recomputes date_ord and amount_minor from date and amount. Stored values are only a
+    cache: files edited by hand or by other versions may hold stale ones. Returns True
+    when a value changed.
+    """
+    ordinal = parse_date_ordinal(t.get("date", ""))
+    amount = Money.to_minor(t.get("amount", 0))
+    if t.get("date_ord") == ordinal and t.get("amount_minor") == amount:
+        return False
+    t["date_ord"] = ordinal
+    t["amount_minor"] = amount
+    return True
+
+
+def _tx_desc_key(t):
+    # Transaction lists are kept newest first: date DESC, then timestamp DESC
+    return (-tx_date_ord(t), -t.get("timestamp", 0))
+
 class ResourceLoader(QObject):
     """Handles flexible resource loading from local disk or URL with fallback and validation."""
     resource_updated = pyqtSignal(str, dict) # key, data
@@ -34,17 +82,17 @@ class ResourceLoader(QObject):
         logging.info(f"Loading resource '{key}' from source: {source}")
         
         # 1. Try to load from provided source
-        data = None
+        data = raw = None
         if source:
             if source.startswith(('http://', 'https://')):
-                data = self._load_from_url(source)
+                data, raw = self._load_from_url(source)
             else:
-                data = self._load_from_file(source)
+                data, raw = self._load_from_file(source)
         
         # 2. Validation
         if data:
             if self._validate_data(data, schema):
-                self._update_hash(key, data)
+                self._update_hash(key, raw)
                 if not source.startswith('http'):
                     self.watcher.addPath(os.path.abspath(source))
                 return data
@@ -59,46 +107,54 @@ class ResourceLoader(QObject):
         return None
 
     def _load_from_file(self, path):
+        """Returns (data, raw_bytes); (None, None) when missing or unreadable."""
         try:
-            if not os.path.exists(path): return None
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            if not os.path.exists(path): return None, None
+            return json_codec.load_file(path)
         except Exception as e:
             logging.error(f"Error loading file {path}: {e}")
-            return None
+            return None, None
 
     def _load_from_url(self, url):
         try:
             resp = requests.get(url, timeout=5)
             if resp.status_code == 200:
-                return resp.json()
+                return json_codec.loads(resp.content), resp.content
         except Exception as e:
             logging.error(f"Error loading URL {url}: {e}")
-        return None
+        return None, None
 
     def _validate_data(self, data, schema):
         # Basic JSON validation, can be extended to JSON Schema
         if not isinstance(data, (dict, list)): return False
         return True
 
-    def _update_hash(self, key, data):
-        h = hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
-        self._last_hashes[key] = h
+    def _update_hash(self, key, raw):
+        """Remembers the hash of the bytes a resource was loaded from (or last written as)."""
+        self._last_hashes[key] = json_codec.digest(raw)
 
     def _on_file_changed(self, path):
         logging.info(f"File changed: {path}")
         # Identify which resource this path belongs to
         # For now, we only watch the main data file
         if os.path.abspath(path) == os.path.abspath(self.dm.filename):
-            new_data = self._load_from_file(path)
+            try:
+                with open(path, "rb") as f:
+                    raw = f.read()
+            except OSError as e:
+                logging.error(f"Error reading changed file {path}: {e}")
+                return
+            # Our own saves record the hash of what they wrote, so they are skipped without parsing
+            new_hash = json_codec.digest(raw)
+            if new_hash == self._last_hashes.get("data"):
+                return
+            new_data, _ = self._load_from_file(path)
             if new_data and self._validate_data(new_data, None):
-                new_hash = hashlib.sha256(json.dumps(new_data, sort_keys=True).encode()).hexdigest()
-                if new_hash != self._last_hashes.get("data"):
-                    logging.info("Hot-reloading data due to file change")
-                    self._last_hashes["data"] = new_hash
-                    self.dm.data = new_data
-                    self.dm.data_changed.emit()
-                    self.resource_updated.emit("data", new_data)
+                logging.info("Hot-reloading data due to file change")
+                self._last_hashes["data"] = new_hash
+                self.dm.reload_data(new_data)
+                self.dm.data_changed.emit()
+                self.resource_updated.emit("data", new_data)
 
     def _get_default_data(self, key):
         if key == "data":
@@ -158,13 +214,22 @@ else:
 
 class DataManager(QObject):
     data_changed = pyqtSignal()
+    migration_progress = pyqtSignal(str, int, int) # migration id, done, total (deferred migrations)
     
-    _pixmap_cache = OrderedDict()
-    _cache_lock = threading.Lock()
     _data_lock = threading.RLock()
-    _MAX_CACHE_SIZE = 200
 
-    def __init__(self, filename=None):
+    # Startup migrations in order: (id, method, deferrable). Applied ids are recorded in
+    # data["_metadata"]["migrations"], so later launches skip the full-dataset scans.
+    # Deferrable ones only fill cosmetic fields and may finish on a background thread.
+    MIGRATIONS = [
+        ("0001_profile_structure", "migrate_profiles", False),
+        ("0002_russian_dates", "migrate_dates_to_russian_format", True),
+        ("0003_transaction_order", "migrate_transaction_order", False),
+        ("0004_clothes_date_sold", "migrate_clothes_data", True),
+        ("0005_inline_images", "migrate_inline_images", False),
+    ]
+
+    def __init__(self, filename=None, journaled=False, storage=None, save_delay=0.3, defer_migrations=False, segmented=None):
         super().__init__()
         # Resource Loader for dynamic updates
         self.loader = ResourceLoader(self)
@@ -172,21 +237,263 @@ class DataManager(QObject):
         # Use global DATA_FILE if filename not provided
         self.filename = filename if filename else DATA_FILE
         
+        # Running (income, expenses, inventory_value) per (profile_id, category), in minor units
+        self._aggregates = {}
+        # Main transaction id -> linked ad cost transaction id, per (profile_id, category)
+        self._ad_cost_index = {}
+        # Date-sorted LedgerColumns per (profile_id, ledger key), built on first window query
+        self._columns = {}
+        # Last transaction timestamp handed out; keeps same-day entries strictly ordered
+        self._last_tx_ts = 0.0
+        
+        # Append-only change log; when journaled, tracked mutations skip the full rewrite
+        self.journaled = journaled
+        self.journal = DataJournal(self.filename + ".journal", on_compact=self._save_data_sync)
+        # Full snapshot writes: one persistent writer, bursts within save_delay seconds coalesce
+        self.save_scheduler = SaveScheduler(self._scheduled_save, delay=save_delay)
+        
+        # Content-addressed image files; records keep only "sha256:..." references
+        self.image_store = ImageStore(os.path.join(self.get_data_dir(), "blobs"))
+        # Decoded pixmaps in memory plus per-size thumbnails on disk
+        self.thumbnails = ThumbnailCache(os.path.join(self.get_data_dir(), "thumbs"), parent=self)
+        # resolve_image_path results and directory listings, reset when the image folders change
+        self._resolved_paths = {}
+        self._dir_listings = {}
+        self._watch_image_dirs()
+        
         # Check if we need to migrate from local file to AppData
         self._check_and_migrate_local_data()
         
-        # Load data with fallback
+        # Load data with fallback, then replay changes not yet compacted into the snapshot
         self.data = self.loader.load_resource("data", source=self.filename, use_fallback=True)
         
+        # Profile layout: all profiles inline in data.json, or data.json as an index of
+        # stubs with one segment file per profile, only recently used ones in memory
+        self.segments = None
+        self.store = None
+        if segmented if segmented is not None else self.get_global_data("profile_segments", False):
+            self.segments = ProfileSegments(os.path.join(self.get_data_dir(), "profiles"))
+            self._materialize_for_replay()
+        self.journal.replay(self.data)
+        self._normalize_transaction_lists()
+        
         self.ensure_active_profile()
-        self.migrate_profiles()
-        self.migrate_dates_to_russian_format()
-        self.migrate_clothes_data()
+        if self.segments:
+            self._materialize(self.data["active_profile_id"])
+        self.run_migrations(defer=defer_migrations)
+        if self.segments:
+            self._evict_inactive()
+        
+        # Storage engine for transactions and trade items: "json" (in data.json) or "sqlite" (ledger.db;
+        # data.db belongs to DatabaseManager's engine)
+        self.store = None
+        storage = storage or self.get_global_data("storage_backend", "json")
+        db_path = os.path.join(self.get_data_dir(), "ledger.db")
+        location = self._storage_location()
+        if storage == "sqlite":
+            self.store = SQLiteStorage(db_path)
+            if (self.data.get("_metadata") or {}).get("storage_backend") == "json":
+                # Rows left from an earlier SQLite period were exported; data.json is newer
+                self.store.clear()
+            if self.store.migrate_from_json(self.data) or location != "sqlite":
+                self._set_storage_location("sqlite")
+                self._save_data_sync()
+            self.store.extract_inline_images(self.image_store)
+        elif location == "sqlite" and os.path.exists(db_path):
+            # Switched back from "sqlite": bring the stored records home first
+            self._export_store(db_path)
+
+    # --- Profile Segments ---
+
+    def _loaded_profiles(self):
+        """Profiles whose records are in memory (all of them unless segmented)."""
+        return [p for p in self.data["profiles"] if not profile_segments.is_stub(p)]
+
+    def _materialize(self, profile_id):
+        """Returns the in-memory record of a profile, loading it from its segment if needed."""
+        profiles = self.data["profiles"]
+        index = next((i for i, p in enumerate(profiles) if p["id"] == profile_id), None)
+        if index is None:
+            return None
+        if not self.segments:
+            return profiles[index]
+        
+        outdated = False
+        with self._data_lock:
+            entry = profiles[index]
+            if profile_segments.is_stub(entry):
+                try:
+                    profile, applied = self.segments.read(profile_id)
+                except (OSError, ValueError, KeyError) as e:
+                    logging.error(f"Profile segment {profile_id} is unreadable, starting it empty: {e}")
+                    profile, applied = {}, []
+                # The index holds the current name and starting amount
+                profile.update(profile_segments.header(entry))
+                self._normalize_transaction_lists([profile])
+                profiles[index] = profile
+                outdated = any(m[0] not in applied for m in self.MIGRATIONS)
+        if outdated:
+            # Saved before a migration was added: bring its structure up to date
+            self.run_migrations(force=True)
+        
+        for evicted_id in self.segments.touch(profile_id):
+            self._evict(evicted_id)
+        return profiles[index]
+
+    def _evict(self, profile_id):
+        """Writes an inactive profile to its segment and keeps only its stub in memory."""
+        if profile_id == self.data.get("active_profile_id"):
+            self.segments.touch(profile_id)
+            return False
+        with self._data_lock:
+            profiles = self.data["profiles"]
+            for i, profile in enumerate(profiles):
+                if profile["id"] == profile_id and not profile_segments.is_stub(profile):
+                    try:
+                        self.segments.write(profile, self._applied_migrations())
+                    except OSError as e:
+                        logging.error(f"Could not write profile segment {profile_id}, keeping it loaded: {e}")
+                        return False
+                    profiles[i] = profile_segments.stub(profile)
+                    return True
+        return False
+
+    def _evict_inactive(self):
+        """Stubs every loaded profile beyond the recently used ones (e.g. right after enabling segments)."""
+        active_id = self.data.get("active_profile_id")
+        recent = set(self.segments.loaded_ids())
+        evicted = [
+            p["id"] for p in self._loaded_profiles()
+            if p["id"] != active_id and p["id"] not in recent and self._evict(p["id"])
+        ]
+        if evicted:
+            # data.json still holds their full records until the index is rewritten
+            self.save_data()
+
+    def _reload_segments(self):
+        """Starts segment bookkeeping over for a replaced index, loading what the journal will touch."""
+        self.segments.reset()
+        self._materialize_for_replay()
+
+    def reload_data(self, data):
+        """Replaces the in-memory data with a newly read data.json, the same way __init__ loads it."""
+        try:
+            # Replay reads the journal file; changes still queued in memory must be in it
+            self.journal.flush()
+        except OSError as e:
+            logging.error(f"Could not write journal before reloading data: {e}")
+        with self._data_lock:
+            self.data = data
+            if self.segments:
+                self._reload_segments()
+            self.journal.replay(self.data)
+            self._normalize_transaction_lists()
+            if self.segments and self.data.get("active_profile_id"):
+                self._materialize(self.data["active_profile_id"])
+        self.invalidate_aggregates()
+
+    def _materialize_for_replay(self):
+        """Loads the profiles that journal operations newer than the snapshot will touch."""
+        snapshot_seq = (self.data.get("_metadata") or {}).get("journal_seq", 0)
+        profile_ids = {
+            op["path"][1] for op in self.journal.read_ops(after_seq=snapshot_seq)
+            if len(op.get("path", [])) > 1 and op["path"][0] == "profiles"
+        }
+        for profile_id in profile_ids:
+            self._materialize(profile_id)
+
+    def _write_segments(self):
+        """Writes loaded profiles to their segments; returns data.json's content (the index)."""
+        applied = self._applied_migrations()
+        for profile in self._loaded_profiles():
+            self.segments.write(profile, applied)
+        index = dict(self.data)
+        index["profiles"] = [profile_segments.stub(p) for p in self.data["profiles"]]
+        return index
+
+    def _applied_migrations(self):
+        return (self.data.get("_metadata") or {}).get("migrations", [])
+
+    # --- Storage Location ---
+
+    def _storage_location(self):
+        """Where transactions and trade items live: "sqlite" or "json" (also when never recorded)."""
+        if self.store:
+            return "sqlite"
+        metadata = (self.data.get("_metadata") or {}) if getattr(self, "data", None) else {}
+        return metadata.get("storage_backend") or "json"
+
+    def _set_storage_location(self, location):
+        self.data.setdefault("_metadata", {})["storage_backend"] = location
+
+    def _export_store(self, db_path):
+        """Moves the records of a SQLite database back into the JSON profiles and saves them."""
+        store = SQLiteStorage(db_path)
+        try:
+            moved = 0
+            for entry in list(self.data["profiles"]):
+                profile = self._materialize(entry["id"]) if self.segments else entry
+                moved += store.export_to_json(profile)
+        finally:
+            store.close()
+        if moved:
+            logging.info(f"Exported {moved} records from {db_path} into {self.filename}")
+            self.invalidate_aggregates()
+        self._set_storage_location("json")
+        self._save_data_sync()
+
+    def pending_migrations(self):
+        applied = set((self.data.get("_metadata") or {}).get("migrations", []))
+        return [m for m in self.MIGRATIONS if m[0] not in applied]
+
+    def run_migrations(self, defer=False, force=False):
+        """
+        Runs the startup migrations not yet recorded as applied (all of them with force,
+        e.g. after merging foreign data). With defer, deferrable ones run later from the
+        event loop, one per turn, and report through migration_progress.
+        """
+        pending = list(self.MIGRATIONS) if force else self.pending_migrations()
+        deferred = [m for m in pending if defer and m[2]]
+        for migration in pending:
+            if migration not in deferred:
+                getattr(self, migration[1])()
+        self._record_migrations([m[0] for m in pending if m not in deferred])
+        
+        if deferred:
+            # On the GUI thread, where every other edit of self.data happens: the window is
+            # shown first, and the GUI never sees a record a migration is halfway through
+            QTimer.singleShot(0, lambda: self._run_deferred_migrations(deferred, len(deferred)))
+
+    def _run_deferred_migrations(self, migrations, total):
+        migration_id, method_name, _ = migrations[0]
+        try:
+            getattr(self, method_name)()
+            self._record_migrations([migration_id])
+        except Exception as e:
+            logging.error(f"Deferred migration {migration_id} failed: {e}")
+        self.migration_progress.emit(migration_id, total - len(migrations) + 1, total)
+        if len(migrations) > 1:
+            QTimer.singleShot(0, lambda: self._run_deferred_migrations(migrations[1:], total))
+
+    def _record_migrations(self, migration_ids):
+        metadata = self.data.setdefault("_metadata", {})
+        applied = metadata.setdefault("migrations", [])
+        new_ids = [m for m in migration_ids if m not in applied]
+        if new_ids:
+            applied.extend(new_ids)
+            self.save_data(changes=[self._op_set(["_metadata", "migrations"], list(applied))])
+
+    def migrate_inline_images(self):
+        """Moves Base64 images embedded in records into the image store."""
+        count = self.image_store.extract_inline(self.data)
+        if count:
+            logging.info(f"Moved {count} inline images into {self.image_store.root}")
+            self.save_data()
 
     def migrate_clothes_data(self):
         """Ensure all sold clothes items have 'date_sold' field."""
         changed = False
-        for profile in self.data["profiles"]:
+        for profile in self._loaded_profiles():
             if "clothes" in profile and "sold_history" in profile["clothes"]:
                 for item in profile["clothes"]["sold_history"]:
                     if "date_sold" not in item:
@@ -203,7 +510,7 @@ class DataManager(QObject):
     def migrate_dates_to_russian_format(self):
         """Convert all transaction dates from YYYY-MM-DD to DD.MM.YYYY."""
         changed = False
-        for profile in self.data["profiles"]:
+        for profile in self._loaded_profiles():
             for cat in ["car_rental", "mining", "farm_bp"]:
                 if cat in profile and "transactions" in profile[cat]:
                     for t in profile[cat]["transactions"]:
@@ -214,6 +521,7 @@ class DataManager(QObject):
                                 if len(parts) == 3 and len(parts[0]) == 4: # YYYY-MM-DD
                                     dt = datetime.strptime(t["date"], "%Y-%m-%d")
                                     t["date"] = dt.strftime("%d.%m.%Y")
+                                    refresh_tx_fields(t)
                                     changed = True
                             except ValueError:
                                 pass
@@ -222,6 +530,37 @@ class DataManager(QObject):
             print("Migrated dates to DD.MM.YYYY format")
             self.save_data()
 
+    def migrate_transaction_order(self):
+        """Fills date_ord on all transactions and makes sure every list is sorted newest first."""
+        if self._normalize_transaction_lists():
+            logging.info("Migrated transactions: added date_ord and restored ordering")
+            self.save_data()
+
+    def _normalize_transaction_lists(self, profiles=None):
+        """
+        Recomputes the cached fields of every transaction (see refresh_tx_fields) and
+        re-sorts lists that are out of order. Runs whenever records come from disk.
+        """
+        changed = False
+        for profile in self._loaded_profiles() if profiles is None else profiles:
+            lists = [profile.get("transactions")]
+            lists += [profile[cat].get("transactions") for cat in ["car_rental", "mining", "farm_bp", "fishing"] if isinstance(profile.get(cat), dict)]
+            for transactions in lists:
+                if not transactions:
+                    continue
+                for t in transactions:
+                    if refresh_tx_fields(t):
+                        changed = True
+                keys = [_tx_desc_key(t) for t in transactions]
+                if any(keys[i] > keys[i + 1] for i in range(len(keys) - 1)):
+                    transactions.sort(key=_tx_desc_key)
+                    changed = True
+        return changed
+
+    def _insert_sorted(self, transactions, t):
+        """Inserts t into a newest-first transaction list, after rows with an equal key."""
+        bisect.insort(transactions, t, key=_tx_desc_key)
+
     def _check_and_migrate_local_data(self):
         """Check if data.json exists in local dir and move it to AppData if AppData is empty."""
         local_file = "data.json"
@@ -252,15 +591,15 @@ class DataManager(QObject):
                 print(f"Error migrating images: {e}")
 
     def save_pixmap_image(self, pixmap):
-        """Saves a QPixmap as Base64 string (for portability). Replaces old file-based saving."""
-        return self.save_image_to_base64(pixmap)
+        """Saves a QPixmap into the image store and returns its reference."""
+        return self.save_image_to_store(pixmap)
 
     def save_image(self, file_path):
-        """Loads an image from file_path and saves it as Base64 string."""
+        """Loads an image from file_path and saves it into the image store."""
         if not file_path or not os.path.exists(file_path):
             return None
         pixmap = QPixmap(file_path)
-        return self.save_image_to_base64(pixmap)
+        return self.save_image_to_store(pixmap)
 
     def get_placeholder_pixmap(self, w=200, h=200, text="No Image"):
         """Generates a placeholder pixmap."""
@@ -274,54 +613,39 @@ class DataManager(QObject):
         return pix
 
     def load_pixmap(self, path, max_size=None):
+        """QPixmap for an image path/reference, fit into max_size (w, h); a placeholder when unavailable."""
         if not path:
             return QPixmap()
         
-        cache_key = f"{path}_{max_size}"
-        
-        with self._cache_lock:
-            if cache_key in self._pixmap_cache:
-                self._pixmap_cache.move_to_end(cache_key)
-                return self._pixmap_cache[cache_key]
+        pix = self.thumbnails.get(path, max_size)
+        if pix is not None:
+            return pix
             
-        resolved = self.resolve_image_path(path)
-        pix = QPixmap()
-        
-        if resolved.startswith("data:image"):
-            try:
-                header, data = resolved.split(',', 1)
-                b64_data = QByteArray.fromBase64(data.encode())
-                pix.loadFromData(b64_data)
-            except Exception as e:
-                logging.error(f"Failed to load Base64 image: {e}")
-                return self.get_placeholder_pixmap(text="Error")
-        else:
-            if not os.path.exists(resolved) or os.path.isdir(resolved):
-                logging.warning(f"Image not found or is dir: {resolved}")
-                return self.get_placeholder_pixmap(text="Missing")
-                    
-            if os.path.getsize(resolved) == 0:
-                return self.get_placeholder_pixmap(text="Empty")
-                    
-            pix.load(resolved)
-            if pix.isNull():
-                return self.get_placeholder_pixmap(text="Bad Format")
+        pix, error = self.thumbnails.load(path, self.resolve_image_path(path), max_size)
+        if pix is None:
+            return self.get_placeholder_pixmap(text=error)
+        return pix
 
-        if max_size:
-            w, h = max_size
-            pix = pix.scaled(w, h, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    def load_pixmap_async(self, path, max_size, callback):
+        """
+        Like load_pixmap, but decodes off the GUI thread and calls callback(QPixmap) when done.
+        Cached pixmaps are delivered immediately.
+        """
+        if not path:
+            callback(QPixmap())
+            return
         
-        with self._cache_lock:
-            if len(self._pixmap_cache) >= self._MAX_CACHE_SIZE:
-                evicted_keys = list(self._pixmap_cache.keys())[:50]
-                for k in evicted_keys:
-                    del self._pixmap_cache[k]
-            self._pixmap_cache[cache_key] = pix
+        pix = self.thumbnails.get(path, max_size)
+        if pix is not None:
+            callback(pix)
+            return
         
-        return pix
+        def deliver(pix, error):
+            callback(pix if pix is not None else self.get_placeholder_pixmap(text=error))
+        self.thumbnails.load_async(path, self.resolve_image_path(path), max_size, deliver)
 
-    def save_image_to_base64(self, pixmap):
-        """Saves a QPixmap as a Base64 string."""
+    def save_image_to_store(self, pixmap):
+        """Saves a QPixmap as PNG in the image store. Returns the "sha256:..." reference."""
         if pixmap.isNull():
             return None
 
@@ -336,17 +660,31 @@ class DataManager(QObject):
         buffer = QBuffer(byte_array)
         buffer.open(QIODevice.OpenModeFlag.WriteOnly)
         pixmap.save(buffer, "PNG", quality=80)
-        base64_data = byte_array.toBase64().data().decode()
-        return f"data:image/png;base64,{base64_data}"
+        return self.image_store.put(byte_array.data())
+
+    # Older callers; images are no longer stored inline
+    save_image_to_base64 = save_image_to_store
 
     def resolve_image_path(self, path):
         """Resolves relative image path to absolute path in AppData or CWD."""
         if not path: return None
         
-        # Check if it's base64
+        # Image store reference
+        if is_ref(path):
+            return self.image_store.path(path)
+        
+        # Check if it's base64 (records from exports or not yet migrated)
         if path.startswith("data:image"):
             return path
             
+        resolved = self._resolved_paths.get(path)
+        if resolved is None:
+            # Misses are cached too (as the fallback path), so they are probed and logged once
+            resolved = self._resolved_paths[path] = self._resolve_uncached(path)
+        return resolved
+
+    def _resolve_uncached(self, path):
+        """The actual lookup behind resolve_image_path."""
         # 1. Check if path exists as-is (Absolute or Relative to CWD)
         if os.path.exists(path):
             return os.path.abspath(path)
@@ -379,30 +717,71 @@ class DataManager(QObject):
         else:
             basename = path
             
-        # 3. Search in standard locations
-        candidates = [
-            os.path.join(DATA_DIR, basename),
-            os.path.join(IMAGES_DIR, basename),
-            os.path.join(IMAGES_DIR, "helper", basename),
-            os.path.join(os.getcwd(), basename),
-            os.path.join(DATA_DIR, "images", basename),
-            os.path.join(os.path.expanduser("~"), "images", basename),
-            os.path.join(os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else os.getcwd(), basename)
-        ]
-        
-        for candidate in candidates:
-            if os.path.exists(candidate):
-                return candidate
+        # 3. Search in standard locations (plain file names via the cached directory listings)
+        search_dirs = self._image_search_dirs()
+        if os.path.basename(basename) == basename:
+            name_key = os.path.normcase(basename)
+            for directory in search_dirs:
+                name = self._dir_listing(directory).get(name_key)
+                if name:
+                    return os.path.join(directory, name)
+        else:
+            for directory in search_dirs:
+                candidate = os.path.join(directory, basename)
+                if os.path.exists(candidate):
+                    return candidate
             
-        logging.warning(f"Image not found: {path}. Checked: {len(candidates)} locations")
+        logging.warning(f"Image not found: {path}. Checked: {len(search_dirs)} locations")
         return os.path.join(DATA_DIR, path)
 
+    @staticmethod
+    def _image_search_dirs():
+        return [
+            DATA_DIR,
+            IMAGES_DIR,
+            os.path.join(IMAGES_DIR, "helper"),
+            os.getcwd(),
+            os.path.join(DATA_DIR, "images"),
+            os.path.join(os.path.expanduser("~"), "images"),
+            os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else os.getcwd()
+        ]
+
+    def _dir_listing(self, directory):
+        """Cached {normcase(name): name} of a directory's entries (empty if it does not exist)."""
+        listing = self._dir_listings.get(directory)
+        if listing is None:
+            try:
+                listing = {os.path.normcase(name): name for name in os.listdir(directory)}
+            except OSError:
+                listing = {}
+            self._dir_listings[directory] = listing
+        return listing
+
+    def _watch_image_dirs(self):
+        self._image_dir_watcher = QFileSystemWatcher(self)
+        for directory in dict.fromkeys([DATA_DIR, IMAGES_DIR, os.path.join(IMAGES_DIR, "helper")]):
+            if os.path.isdir(directory):
+                self._image_dir_watcher.addPath(directory)
+        self._image_dir_watcher.directoryChanged.connect(self.invalidate_image_paths)
+
+    def invalidate_image_paths(self, directory=None):
+        """
+        Forgets resolved image paths. With a directory only its listing is re-read;
+        without one (e.g. after images were copied into an unwatched folder) all listings are.
+        """
+        if directory is None:
+            self._dir_listings.clear()
+        else:
+            self._dir_listings.pop(os.path.normpath(directory), None)
+            self._dir_listings.pop(directory, None)
+        self._resolved_paths.clear()
+
+
     def load_data(self):
         if not os.path.exists(self.filename):
             return {"profiles": [], "active_profile_id": None}
         try:
-            with open(self.filename, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data, _ = json_codec.load_file(self.filename)
                 
             # Check for legacy format
             if isinstance(data, list):
@@ -411,7 +790,7 @@ class DataManager(QObject):
                 return self._migrate_legacy_data(data)
                 
             return data
-        except (json.JSONDecodeError, IOError):
+        except (json_codec.DecodeError, IOError):
             return {"profiles": [], "active_profile_id": None}
 
     def _migrate_legacy_data(self, old_data):
@@ -495,36 +874,93 @@ class DataManager(QObject):
         """Returns the absolute path to the data directory."""
         return os.path.dirname(os.path.abspath(self.filename))
 
-    def save_data(self):
-        # Use a background thread for saving to prevent UI freezes
-        threading.Thread(target=self._save_data_sync, daemon=True).start()
+    def save_data(self, changes=None):
+        """
+        Persists data.
+        
+        `changes` is an optional list of journal operations describing the mutation.
+        In journaled mode they are appended to the journal (O(change)); otherwise,
+        or when the caller mutated data directly, the full snapshot is rewritten.
+        """
+        if changes and self.journaled:
+            self._append_journal(changes)
+            return
+        if not changes:
+            # Untracked mutation: running totals may be stale
+            self.invalidate_aggregates()
+        # Written by the background save scheduler to prevent UI freezes
+        self.save_scheduler.request()
+
+    def flush(self):
+        """Forces pending saves and journal operations to disk (call before shutdown)."""
+        self.save_scheduler.flush()
+        self.journal.flush()
+
+    def close(self):
+        """Writes pending changes and stops the save and journal writer threads."""
+        self.save_scheduler.stop()
+        self.journal.stop()
+
+    def get_save_stats(self):
+        """Save queue depth and snapshot write latency (see SaveScheduler.stats)."""
+        return self.save_scheduler.stats()
+
+    def _append_journal(self, changes):
+        # No _data_lock here: a running compaction must not block the caller.
+        # Replay is idempotent, so ops that race into the snapshot are harmless.
+        self.journal.append(changes)
+        self._notify_data_changed()
+
+    def _notify_data_changed(self):
+        """Notifies listeners of a change that did not need a full save."""
+        QTimer.singleShot(0, self.data_changed.emit)
+
+    def _scheduled_save(self):
+        if not self._save_data_sync():
+            # Raising keeps the request pending, so the scheduler writes again later
+            raise OSError(f"Could not write {self.filename}")
 
     def _save_data_sync(self):
+        """Writes the full snapshot now. Returns False if it could not be written."""
         with self._data_lock:
-            # Clear calculation caches when data changes
-            self.get_category_stats.cache_clear()
-            self.get_total_capital_balance.cache_clear()
+            # This write includes every change requested so far
+            covered = self.save_scheduler.mark()
             
             # Create backup before saving
             self.perform_scheduled_backup()
             
             # Add metadata
+            journal_seq = self.journal.last_seq
+            applied_migrations = self._applied_migrations()
             self.data["_metadata"] = {
                 "version": "1.0.4",
                 "schema_version": 2,
                 "last_modified": datetime.now().isoformat(),
-                "app_version": APP_NAME
+                "app_version": APP_NAME,
+                "journal_seq": journal_seq,
+                "migrations": applied_migrations,
+                "storage_backend": self._storage_location()
             }
             
             # Use atomic write to prevent data corruption
             temp_file = self.filename + ".tmp"
             max_retries = 3
             
+            # Serialize once (minified JSON); the same bytes are hashed for change detection
+            try:
+                payload = json_codec.dumps(self._write_segments() if self.segments else self.data)
+            except Exception as e:
+                logging.critical(f"Failed to serialize data: {e}")
+                return False
+            
             for attempt in range(max_retries):
                 try:
-                    # Write to temp file first (minified JSON for performance and size)
-                    with open(temp_file, "w", encoding="utf-8") as f:
-                        json.dump(self.data, f, ensure_ascii=False)
+                    # Write to temp file first
+                    with open(temp_file, "wb") as f:
+                        f.write(payload)
+                    
+                    # Recorded before the replace so the watcher recognizes our own write
+                    self.loader._update_hash("data", payload)
                     
                     # Atomic replace
                     if os.path.exists(self.filename):
@@ -532,10 +968,13 @@ class DataManager(QObject):
                     else:
                         os.rename(temp_file, self.filename)
                     
+                    # Everything up to journal_seq now lives in the snapshot
+                    self.journal.truncate(journal_seq)
+                    self.save_scheduler.discard_pending(covered)
+                    
                     # Emit signal after successful save (using QTimer to emit on main thread)
-                    from PyQt6.QtCore import QTimer
                     QTimer.singleShot(0, self.data_changed.emit)
-                    return
+                    return True
                 except IOError as e:
                     logging.error(f"Error saving data (Attempt {attempt+1}): {e}")
                     time.sleep(0.1)
@@ -543,6 +982,31 @@ class DataManager(QObject):
                     logging.error(f"Unexpected error saving data: {e}")
                     
             logging.critical(f"Failed to save data after {max_retries} attempts.")
+            return False
+
+    # --- Journal Operations ---
+
+    @staticmethod
+    def _profile_path(profile, *keys):
+        return ["profiles", profile["id"], *keys]
+
+    @staticmethod
+    def _op_set(path, value):
+        return {"op": "set", "path": path, "value": value}
+
+    @staticmethod
+    def _op_remove(path, item_id):
+        return {"op": "remove", "path": path, "id": item_id}
+
+    @staticmethod
+    def _ops_reposition(path, items, item_ids):
+        """Ops that (re)insert the given items of a list at their current positions."""
+        ops = [{"op": "remove", "path": path, "id": item_id} for item_id in item_ids]
+        ids = set(item_ids)
+        for index, item in enumerate(items):
+            if item.get("id") in ids:
+                ops.append({"op": "insert", "path": path, "index": index, "value": item})
+        return ops
 
     # --- Backup Management ---
 
@@ -583,6 +1047,10 @@ class DataManager(QObject):
             self.create_backup(extra_channel=channel)
             self.set_global_data("last_backup_timestamp", now.strftime("%Y-%m-%d %H:%M:%S"))
 
+    # Written next to a backup's JSON file and named after it: ledger.db rows in SQLite mode,
+    # the profiles/ segment files when data.json is only their index
+    BACKUP_SIDECARS = (".ledger.db", ".profiles")
+
     def create_backup(self, extra_channel=None):
         if not os.path.exists(self.filename):
             return
@@ -596,48 +1064,127 @@ class DataManager(QObject):
         local_backup_path = os.path.join(backup_dir, backup_filename)
         
         try:
-            shutil.copy2(self.filename, local_backup_path)
-            
-            backups = sorted([os.path.join(backup_dir, f) for f in os.listdir(backup_dir) if f.startswith("data_backup_") and os.path.isfile(os.path.join(backup_dir, f))])
-            if len(backups) > 10:
-                for b in backups[:-10]:
-                    try:
-                        os.remove(b)
-                    except OSError as e:
-                        logging.warning(f"Failed to remove old backup {b}: {e}")
+            # A save in between would pair this data.json with newer segments
+            with self._data_lock:
+                shutil.copy2(self.filename, local_backup_path)
+                self._write_backup_sidecars(local_backup_path)
+            # Records only hold references; backups share one pool of the image files
+            self.image_store.copy_to(os.path.join(backup_dir, "blobs"))
+            self._prune_backups(backup_dir)
         except Exception as e:
             print(f"Local backup failed: {e}")
             logging.error(f"Local backup failed: {e}")
+            return
 
         # 2. Extra Channel Backup (Dual Storage)
         if extra_channel and os.path.exists(extra_channel) and os.path.isdir(extra_channel):
             try:
                 extra_backup_path = os.path.join(extra_channel, backup_filename)
-                shutil.copy2(self.filename, extra_backup_path)
+                for path in self._backup_files(local_backup_path):
+                    target = os.path.join(extra_channel, os.path.basename(path))
+                    if os.path.isdir(path):
+                        shutil.rmtree(target, ignore_errors=True)
+                        shutil.copytree(path, target)
+                    else:
+                        shutil.copy2(path, target)
+                self.image_store.copy_to(os.path.join(extra_channel, "blobs"))
                 
                 # Cleanup in extra channel (optional, maybe keep more?)
                 # Let's keep last 10 there too to avoid clutter
-                extra_backups = sorted([os.path.join(extra_channel, f) for f in os.listdir(extra_channel) if f.startswith("data_backup_") and os.path.isfile(os.path.join(extra_channel, f))])
-                if len(extra_backups) > 10:
-                    for b in extra_backups[:-10]:
-                        try:
-                            os.remove(b)
-                        except OSError as e:
-                            logging.warning(f"Failed to remove extra backup {b}: {e}")
+                self._prune_backups(extra_channel)
                 print(f"Backup saved to extra channel: {extra_backup_path}")
             except Exception as e:
                 print(f"Extra channel backup failed: {e}")
                 logging.error(f"Extra channel backup failed: {e}")
 
+    def _write_backup_sidecars(self, backup_path):
+        """Writes what data.json alone does not hold next to a backup copy of it."""
+        stem = os.path.splitext(backup_path)[0]
+        if self.store:
+            self.store.backup_to(stem + ".ledger.db")
+        if self.segments:
+            # A backup taken within the same second replaces the earlier one
+            shutil.rmtree(stem + ".profiles", ignore_errors=True)
+            shutil.copytree(self.segments.root, stem + ".profiles", ignore=shutil.ignore_patterns("*.tmp"))
+
+    def _backup_files(self, backup_path):
+        """A backup's JSON file followed by its existing sidecars."""
+        stem = os.path.splitext(backup_path)[0]
+        return [backup_path] + [stem + suffix for suffix in self.BACKUP_SIDECARS if os.path.exists(stem + suffix)]
+
+    def _prune_backups(self, directory, keep=10):
+        backups = sorted(f for f in os.listdir(directory) if f.startswith("data_backup_") and f.endswith(".json"))
+        for name in backups[:-keep]:
+            for path in self._backup_files(os.path.join(directory, name)):
+                try:
+                    if os.path.isdir(path):
+                        shutil.rmtree(path)
+                    else:
+                        os.remove(path)
+                except OSError as e:
+                    logging.warning(f"Failed to remove old backup {path}: {e}")
+
     def restore_from_backup(self, backup_path):
         try:
              shutil.copy2(backup_path, self.filename)
+             # Journal entries belong to the replaced data, not to the backup
+             self.journal.truncate(self.journal.last_seq)
              self.data = self.load_data()
+             self._restore_segments(os.path.splitext(backup_path)[0] + ".profiles")
+             self._normalize_transaction_lists()
+             self._restore_store(os.path.splitext(backup_path)[0] + ".ledger.db")
+             # Images of a backup made on another machine (or before blobs/ was lost)
+             ImageStore(os.path.join(os.path.dirname(backup_path), "blobs")).copy_to(self.image_store.root)
+             self.invalidate_aggregates()
              return True
         except Exception as e:
              print(f"Restore failed: {e}")
              return False
 
+    def _restore_segments(self, segments_backup):
+        """Brings profile segments to the state of a restored backup, whose data.json may be their index."""
+        if self.segments:
+            if os.path.isdir(segments_backup):
+                root = self.segments.root
+                shutil.rmtree(root, ignore_errors=True)
+                shutil.copytree(segments_backup, root)
+            # Otherwise the backup holds every profile inline; the next save splits them again
+            self._reload_segments()
+            self.ensure_active_profile()
+            self._materialize(self.data["active_profile_id"])
+            self._evict_inactive()
+        elif os.path.isdir(segments_backup):
+            # Made while segments were on: bring the backed-up records inline
+            backup = ProfileSegments(segments_backup)
+            profiles = self.data["profiles"]
+            for i, entry in enumerate(profiles):
+                if profile_segments.is_stub(entry):
+                    try:
+                        profile, _ = backup.read(entry["id"])
+                    except (OSError, ValueError, KeyError) as e:
+                        logging.error(f"Backed-up segment {entry['id']} is unreadable, restoring it empty: {e}")
+                        profile = {}
+                    profile.update(profile_segments.header(entry))
+                    profiles[i] = profile
+            self._save_data_sync()
+
+    def _restore_store(self, db_backup):
+        """Brings transactions and trade items to the state of a restored backup."""
+        if self.store:
+            if os.path.exists(db_backup):
+                self.store.restore_from(db_backup)
+            else:
+                # Backup from before SQLite: its JSON lists are the whole history
+                self.store.clear()
+            self.store.migrate_from_json(self.data)
+            self._set_storage_location("sqlite")
+            self._save_data_sync()
+        elif os.path.exists(db_backup):
+            self._export_store(db_backup)
+        else:
+            self._set_storage_location("json")
+            self._save_data_sync()
+
     def ensure_active_profile(self):
         """Ensure there is at least one profile and one is active."""
         if not self.data["profiles"]:
@@ -656,7 +1203,7 @@ class DataManager(QObject):
     def migrate_profiles(self):
         """Ensure all profiles have the new structure."""
         changed = False
-        for profile in self.data["profiles"]:
+        for profile in self._loaded_profiles():
             # Initialize settings
             if "settings" not in profile:
                 profile["settings"] = {
@@ -756,7 +1303,7 @@ class DataManager(QObject):
         if "global" not in self.data:
             self.data["global"] = {}
         self.data["global"][key] = value
-        self.save_data()
+        self.save_data(changes=[self._op_set(["global", key], value)])
 
     # --- Secure Storage (Fernet Encryption) ---
 
@@ -821,19 +1368,24 @@ class DataManager(QObject):
             if "settings" not in profile:
                 profile["settings"] = {}
             profile["settings"][key] = value
+            changes = [self._op_set(self._profile_path(profile, "settings", key), value)]
             
             # Special case: if starting_amount is updated via settings
             if key == "starting_amount":
                 profile["starting_amount"] = float(value)
+                changes.append(self._op_set(self._profile_path(profile, "starting_amount"), profile["starting_amount"]))
                 
-            self.save_data()
+            self.save_data(changes=changes)
 
     # --- Profile Helpers ---
 
     def get_active_profile(self):
         active_id = self.data.get("active_profile_id")
         if not active_id: return None
-        return next((p for p in self.data["profiles"] if p["id"] == active_id), None)
+        profile = next((p for p in self.data["profiles"] if p["id"] == active_id), None)
+        if profile is not None and self.segments and profile_segments.is_stub(profile):
+            profile = self._materialize(active_id)
+        return profile
 
     def get_all_profiles(self):
         return self.data.get("profiles", [])
@@ -873,6 +1425,10 @@ class DataManager(QObject):
 
     def delete_profile(self, profile_id):
         self.data["profiles"] = [p for p in self.data["profiles"] if p["id"] != profile_id]
+        if self.store:
+            self.store.delete_profile(profile_id)
+        if self.segments:
+            self.segments.delete(profile_id)
         if self.data["active_profile_id"] == profile_id:
             self.data["active_profile_id"] = None
         self.ensure_active_profile() 
@@ -883,14 +1439,20 @@ class DataManager(QObject):
             if profile["id"] == profile_id:
                 profile["name"] = name
                 profile["starting_amount"] = float(starting_amount)
-                self.save_data()
+                self.save_data(changes=[
+                    self._op_set(self._profile_path(profile, "name"), name),
+                    self._op_set(self._profile_path(profile, "starting_amount"), profile["starting_amount"])
+                ])
                 return True
         return False
 
     def set_active_profile(self, profile_id):
         if any(p["id"] == profile_id for p in self.data["profiles"]):
             self.data["active_profile_id"] = profile_id
-            self.save_data()
+            if self.segments:
+                # Recently used profiles stay parsed, so switching back is instant
+                self._materialize(profile_id)
+            self.save_data(changes=[self._op_set(["active_profile_id"], profile_id)])
             return True
         return False
 
@@ -918,7 +1480,8 @@ class DataManager(QObject):
         profile = self.get_active_profile()
         if not profile: return False
         
-        if "memo_sections" not in profile:
+        created = "memo_sections" not in profile
+        if created:
             profile["memo_sections"] = []
             
         new_section = {
@@ -928,7 +1491,11 @@ class DataManager(QObject):
             "items": []
         }
         profile["memo_sections"].append(new_section)
-        self.save_data()
+        path = self._profile_path(profile, "memo_sections")
+        if created:
+            self.save_data(changes=[self._op_set(path, profile["memo_sections"])])
+        else:
+            self.save_data(changes=self._ops_reposition(path, profile["memo_sections"], [new_section["id"]]))
         return True
 
     def delete_memo_section(self, section_id):
@@ -939,7 +1506,7 @@ class DataManager(QObject):
         profile["memo_sections"] = [s for s in profile["memo_sections"] if s["id"] != section_id]
         
         if len(profile["memo_sections"]) < original_len:
-            self.save_data()
+            self.save_data(changes=[self._op_remove(self._profile_path(profile, "memo_sections"), section_id)])
             return True
         return False
 
@@ -958,7 +1525,8 @@ class DataManager(QObject):
                     "image_path": image_path
                 }
                 section["items"].append(item_data)
-                self.save_data()
+                path = self._profile_path(profile, "memo_sections", section_id, "items")
+                self.save_data(changes=self._ops_reposition(path, section["items"], [item_data["id"]]))
                 logging.info(f"Memo item added successfully, id={item_data['id']}")
                 return True
         logging.error(f"Section {section_id} not found")
@@ -977,7 +1545,8 @@ class DataManager(QObject):
                     if item["id"] == item_id:
                         item["values"] = values
                         item["image_path"] = image_path
-                        self.save_data()
+                        path = self._profile_path(profile, "memo_sections", section_id, "items", item_id)
+                        self.save_data(changes=[self._op_set(path, item)])
                         logging.info("Memo item updated successfully")
                         return True
         logging.error(f"Item {item_id} not found in section {section_id}")
@@ -992,7 +1561,8 @@ class DataManager(QObject):
                 original_len = len(section["items"])
                 section["items"] = [i for i in section["items"] if i["id"] != item_id]
                 if len(section["items"]) < original_len:
-                    self.save_data()
+                    path = self._profile_path(profile, "memo_sections", section_id, "items")
+                    self.save_data(changes=[self._op_remove(path, item_id)])
                     return True
         return False
 
@@ -1003,7 +1573,8 @@ class DataManager(QObject):
         for section in profile.get("memo_sections", []):
             if section["id"] == section_id:
                 section["title"] = new_title
-                self.save_data()
+                path = self._profile_path(profile, "memo_sections", section_id, "title")
+                self.save_data(changes=[self._op_set(path, new_title)])
                 return True
         return False
 
@@ -1021,7 +1592,8 @@ class DataManager(QObject):
         profile = self.get_active_profile()
         if not profile: return False
         
-        if "timers" not in profile:
+        created = "timers" not in profile
+        if created:
             profile["timers"] = []
             
         now = datetime.now().timestamp()
@@ -1037,7 +1609,11 @@ class DataManager(QObject):
             "paused_remaining": 0
         }
         profile["timers"].append(new_timer)
-        self.save_data()
+        path = self._profile_path(profile, "timers")
+        if created:
+            self.save_data(changes=[self._op_set(path, profile["timers"])])
+        else:
+            self.save_data(changes=self._ops_reposition(path, profile["timers"], [new_timer["id"]]))
         return True
 
     def delete_timer(self, timer_id):
@@ -1048,7 +1624,7 @@ class DataManager(QObject):
         profile["timers"] = [t for t in profile["timers"] if t["id"] != timer_id]
         
         if len(profile["timers"]) < original_len:
-            self.save_data()
+            self.save_data(changes=[self._op_remove(self._profile_path(profile, "timers"), timer_id)])
             return True
         return False
 
@@ -1065,14 +1641,14 @@ class DataManager(QObject):
                         remaining = timer["end_time"] - now
                         timer["paused_remaining"] = max(0, remaining)
                         timer["is_running"] = False
-                        self.save_data()
+                        self.save_data(changes=[self._op_set(self._profile_path(profile, "timers", timer_id), timer)])
                         return True
                         
                 elif action == "resume":
                     if not timer["is_running"]:
                         timer["end_time"] = now + timer["paused_remaining"]
                         timer["is_running"] = True
-                        self.save_data()
+                        self.save_data(changes=[self._op_set(self._profile_path(profile, "timers", timer_id), timer)])
                         return True
         return False
 
@@ -1089,7 +1665,8 @@ class DataManager(QObject):
             logging.error(f"Cannot add trade item: No active profile. Category: {category}")
             return False
             
-        if category not in profile:
+        created = category not in profile
+        if created:
             profile[category] = {"inventory": [], "sold_history": []}
             
         item = {
@@ -1102,10 +1679,20 @@ class DataManager(QObject):
             "date_added": datetime.now().strftime("%d.%m.%Y %H:%M:%S")
         }
         
-        profile[category]["inventory"].append(item)
+        if self.store:
+            self.store.put_trade_item(profile["id"], category, item)
+        else:
+            profile[category]["inventory"].append(item)
+        self._apply_category_delta(profile, category, (0, 0, 0), self._trade_item_totals(item, sold=False))
         logging.info(f"Added trade item: {name} to {category}. Price: {buy_price}")
         
-        self.save_data()
+        if created:
+            self.save_data(changes=[self._op_set(self._profile_path(profile, category), profile[category])])
+        elif self.store:
+            self._notify_data_changed()
+        else:
+            path = self._profile_path(profile, category, "inventory")
+            self.save_data(changes=self._ops_reposition(path, profile[category]["inventory"], [item["id"]]))
         return True
 
     def sell_trade_item(self, category, item_id, sell_price, date_sold=None):
@@ -1113,17 +1700,35 @@ class DataManager(QObject):
         profile = self.get_active_profile()
         if not profile or category not in profile: return False
         
+        if self.store:
+            item = self.store.get_trade_item(profile["id"], category, item_id)
+            if not item: return False
+            before = self._trade_item_totals(item, sold=False)
+            item["sell_price"] = float(sell_price)
+            item["date_sold"] = date_sold or datetime.now().strftime("%d.%m.%Y %H:%M:%S")
+            # Same row id, so the upsert moves it from inventory to sold history
+            self.store.put_trade_item(profile["id"], category, item, sold=True)
+            self._apply_category_delta(profile, category, before, self._trade_item_totals(item, sold=True))
+            logging.info(f"Sold trade item: {item['name']} from {category} for {sell_price}")
+            self._notify_data_changed()
+            return True
+        
         inventory = profile[category].get("inventory", [])
         for i, item in enumerate(inventory):
             if item["id"] == item_id:
+                before = self._trade_item_totals(item, sold=False)
                 item["sell_price"] = float(sell_price)
                 item["date_sold"] = date_sold or datetime.now().strftime("%d.%m.%Y %H:%M:%S")
                 
                 profile[category]["sold_history"].append(item)
                 inventory.pop(i)
+                self._apply_category_delta(profile, category, before, self._trade_item_totals(item, sold=True))
                 
                 logging.info(f"Sold trade item: {item['name']} from {category} for {sell_price}")
-                self.save_data()
+                sold_path = self._profile_path(profile, category, "sold_history")
+                changes = [self._op_remove(self._profile_path(profile, category, "inventory"), item_id)]
+                changes += self._ops_reposition(sold_path, profile[category]["sold_history"], [item_id])
+                self.save_data(changes=changes)
                 return True
         return False
 
@@ -1132,21 +1737,34 @@ class DataManager(QObject):
         profile = self.get_active_profile()
         if not profile or category not in profile: return False
         
+        if self.store:
+            item = self.store.get_trade_item(profile["id"], category, item_id, sold=is_sold)
+            if item and self.store.delete_trade_item(profile["id"], category, item_id, sold=is_sold):
+                self._apply_category_delta(profile, category, self._trade_item_totals(item, sold=is_sold), (0, 0, 0))
+                logging.info(f"Deleted trade item {item_id} from {category}")
+                self._notify_data_changed()
+                return True
+            return False
+        
         list_key = "sold_history" if is_sold else "inventory"
         target_list = profile[category].get(list_key, [])
         
-        original_len = len(target_list)
+        removed = [item for item in target_list if item["id"] == item_id]
         profile[category][list_key] = [item for item in target_list if item["id"] != item_id]
         
-        if len(profile[category][list_key]) < original_len:
+        if removed:
+            for item in removed:
+                self._apply_category_delta(profile, category, self._trade_item_totals(item, sold=is_sold), (0, 0, 0))
             logging.info(f"Deleted trade item {item_id} from {category} ({list_key})")
-            self.save_data()
+            self.save_data(changes=[self._op_remove(self._profile_path(profile, category, list_key), item_id)])
             return True
         return False
 
     def get_trade_inventory(self, category):
         profile = self.get_active_profile()
         if not profile: return []
+        if self.store:
+            return self.store.get_trade_items(profile["id"], category, sold=False)
         items = profile.get(category, {}).get("inventory", [])
         
         try:
@@ -1158,6 +1776,8 @@ class DataManager(QObject):
     def get_trade_sold(self, category):
         profile = self.get_active_profile()
         if not profile: return []
+        if self.store:
+            return self.store.get_trade_items(profile["id"], category, sold=True)
         items = profile.get(category, {}).get("sold_history", [])
         
         try:
@@ -1193,7 +1813,7 @@ class DataManager(QObject):
         profile = self.get_active_profile()
         if not profile: return
         profile["capital_planning"] = data
-        self.save_data()
+        self.save_data(changes=[self._op_set(self._profile_path(profile, "capital_planning"), data)])
 
     def get_fishing_equipment(self):
         profile = self.get_active_profile()
@@ -1207,7 +1827,7 @@ class DataManager(QObject):
         if "fishing" not in profile:
             profile["fishing"] = {}
         profile["fishing"]["equipment"] = equipment_data
-        self.save_data()
+        self.save_data(changes=[self._op_set(self._profile_path(profile, "fishing", "equipment"), equipment_data)])
 
     def get_achievements(self):
         """Returns a list of unlocked achievement IDs for the active profile."""
@@ -1223,7 +1843,7 @@ class DataManager(QObject):
         
         if achievement_id not in profile["achievements"]:
             profile["achievements"].append(achievement_id)
-            self.save_data()
+            self.save_data(changes=[self._op_set(self._profile_path(profile, "achievements"), profile["achievements"])])
             return True
         return False
 
@@ -1249,17 +1869,21 @@ class DataManager(QObject):
             date_str = datetime.now().strftime("%d.%m.%Y")
 
         main_id = str(uuid.uuid4())
-        now_ts = time.time() # Use high-precision timestamp for sorting
+        # High-precision timestamp for sorting; rapid adds must not interleave with ad cost rows (ts - 0.001)
+        now_ts = max(time.time(), self._last_tx_ts + 0.002)
+        self._last_tx_ts = now_ts
         
         transaction = {
             "id": main_id,
             "date": date_str,
             "amount": float(amount),
+            "amount_minor": Money.to_minor(amount),
             "comment": comment,
             "item_name": item_name,
             "image_path": image_path,
             "ad_cost": float(ad_cost) if ad_cost else 0.0,
-            "timestamp": now_ts
+            "timestamp": now_ts,
+            "date_ord": parse_date_ordinal(date_str)
         }
 
         transactions_to_add = [transaction]
@@ -1270,45 +1894,52 @@ class DataManager(QObject):
                 "id": str(uuid.uuid4()),
                 "date": date_str,
                 "amount": -float(ad_cost),
+                "amount_minor": Money.to_minor(-float(ad_cost)),
                 "comment": f"Объявление: {item_name}",
                 "item_name": item_name,
                 "image_path": None,
                 "parent_id": main_id, # Link to main transaction
                 "is_ad_cost": True,
-                "timestamp": now_ts - 0.001 # Slightly older so it appears below main
+                "timestamp": now_ts - 0.001, # Slightly older so it appears below main
+                "date_ord": transaction["date_ord"]
             }
             transactions_to_add.append(ad_transaction)
 
+        snapshot = self._snapshot_tx_family(profile, category, main_id)
+        if len(transactions_to_add) > 1:
+            self._index_ad_cost(profile, category, main_id, transactions_to_add[1]["id"])
+
+        if self.store:
+            self.store.add_transactions(profile["id"], category, transactions_to_add)
+            self._apply_tx_family_delta(profile, category, snapshot)
+            self._notify_data_changed()
+            return transaction
+
         if category in ["car_rental", "mining", "farm_bp", "fishing"]:
+            container_path = self._profile_path(profile, category)
+            created = category not in profile or "transactions" not in profile[category]
             if category not in profile:
                 profile[category] = {"transactions": [], "starting_amount": 0.0}
             if "transactions" not in profile[category]:
                 profile[category]["transactions"] = []
-                
-            for t in transactions_to_add:
-                profile[category]["transactions"].append(t)
-            
-            # Sort by date DESC, then by timestamp DESC (to keep newest at top if same date)
-            try:
-                profile[category]["transactions"].sort(
-                    key=lambda x: (datetime.strptime(x["date"], "%d.%m.%Y"), x.get("timestamp", 0)), 
-                    reverse=True
-                )
-            except ValueError:
-                 profile[category]["transactions"].sort(key=lambda x: x["date"], reverse=True)
+            target_list = profile[category]["transactions"]
         else:
+            container_path = self._profile_path(profile)
+            created = "transactions" not in profile
             if "transactions" not in profile: profile["transactions"] = []
-            for t in transactions_to_add:
-                profile["transactions"].append(t)
-            try:
-                profile["transactions"].sort(
-                    key=lambda x: (datetime.strptime(x["date"], "%d.%m.%Y"), x.get("timestamp", 0)), 
-                    reverse=True
-                )
-            except ValueError:
-                profile["transactions"].sort(key=lambda x: x["date"], reverse=True)
+            target_list = profile["transactions"]
 
-        self.save_data()
+        # Lists are kept sorted by date DESC, then by timestamp DESC (newest at top if same date)
+        for t in transactions_to_add:
+            self._insert_sorted(target_list, t)
+
+        path = container_path + ["transactions"]
+        if created:
+            changes = [self._op_set(path, target_list)]
+        else:
+            changes = self._ops_reposition(path, target_list, [t["id"] for t in transactions_to_add])
+        self._apply_tx_family_delta(profile, category, snapshot)
+        self.save_data(changes=changes)
         return transaction
 
     def delete_transaction(self, category, transaction_id):
@@ -1316,11 +1947,24 @@ class DataManager(QObject):
         if not profile:
             return False
         
+        snapshot = self._snapshot_tx_family(profile, category, transaction_id)
+        
+        if self.store:
+            deleted = self.store.get_transaction(profile["id"], transaction_id)
+            if self.store.delete_transaction(profile["id"], category, transaction_id):
+                self._unindex_ad_cost(profile, category, deleted)
+                self._apply_tx_family_delta(profile, category, snapshot)
+                self._notify_data_changed()
+                return True
+            return False
+        
         target_list = None
         if category in ["car_rental", "mining", "farm_bp", "fishing"]:
             target_list = profile.get(category, {}).get("transactions", [])
+            path = self._profile_path(profile, category, "transactions")
         else:
             target_list = profile.get("transactions", [])
+            path = self._profile_path(profile, "transactions")
 
         # Find the transaction to see if it has a linked ad cost or is a linked ad cost
         main_tx = next((t for t in target_list if t["id"] == transaction_id), None)
@@ -1342,7 +1986,9 @@ class DataManager(QObject):
                 profile[category]["transactions"] = new_list
             else:
                 profile["transactions"] = new_list
-            self.save_data()
+            self._unindex_ad_cost(profile, category, main_tx)
+            self._apply_tx_family_delta(profile, category, snapshot)
+            self.save_data(changes=[self._op_remove(path, tx_id) for tx_id in ids_to_delete])
             return True
         return False
 
@@ -1350,37 +1996,57 @@ class DataManager(QObject):
         profile = self.get_active_profile()
         if not profile: return False
         
+        snapshot = self._snapshot_tx_family(profile, category, transaction_id)
+        
+        if self.store:
+            updated = self._update_store_transaction(profile, category, transaction_id, amount, comment, date_str, item_name, image_path, ad_cost)
+            if updated:
+                self._apply_tx_family_delta(profile, category, snapshot)
+                self._notify_data_changed()
+            return updated
+        
         target_list = None
         if category in ["car_rental", "mining", "farm_bp", "fishing"]:
             target_list = profile.get(category, {}).get("transactions", [])
+            path = self._profile_path(profile, category, "transactions")
         else:
             target_list = profile.get("transactions", [])
+            path = self._profile_path(profile, "transactions")
             
         for t in target_list:
             if t["id"] == transaction_id:
                 t["amount"] = float(amount)
+                t["amount_minor"] = Money.to_minor(amount)
                 t["comment"] = comment
                 t["date"] = date_str
+                t["date_ord"] = parse_date_ordinal(date_str)
                 t["item_name"] = item_name
                 t["image_path"] = image_path
                 t["ad_cost"] = float(ad_cost) if ad_cost else 0.0
                 
                 # Update or create/delete linked ad cost transaction
                 ad_tx = next((tx for tx in target_list if tx.get("parent_id") == transaction_id), None)
+                changed_ids = [transaction_id]
+                changes = []
                 
                 if float(ad_cost) > 0:
                     if ad_tx:
                         # Update existing
                         ad_tx["amount"] = -float(ad_cost)
+                        ad_tx["amount_minor"] = Money.to_minor(ad_tx["amount"])
                         ad_tx["date"] = date_str
+                        ad_tx["date_ord"] = t["date_ord"]
                         ad_tx["item_name"] = item_name
                         ad_tx["comment"] = f"Объявление: {item_name}"
+                        changed_ids.append(ad_tx["id"])
                     else:
                         # Create new
                         new_ad_tx = {
                             "id": str(uuid.uuid4()),
                             "date": date_str,
+                            "date_ord": t["date_ord"],
                             "amount": -float(ad_cost),
+                            "amount_minor": Money.to_minor(-float(ad_cost)),
                             "comment": f"Объявление: {item_name}",
                             "item_name": item_name,
                             "image_path": None,
@@ -1388,30 +2054,150 @@ class DataManager(QObject):
                             "is_ad_cost": True
                         }
                         target_list.append(new_ad_tx)
+                        changed_ids.append(new_ad_tx["id"])
+                        self._index_ad_cost(profile, category, transaction_id, new_ad_tx["id"])
                 else:
                     # Delete existing if ad_cost is now 0
                     if ad_tx:
                         target_list.remove(ad_tx)
-
-                try:
-                    target_list.sort(
-                        key=lambda x: (datetime.strptime(x["date"], "%d.%m.%Y"), x.get("timestamp", 0)), 
-                        reverse=True
-                    )
-                except ValueError:
-                    target_list.sort(key=lambda x: x["date"], reverse=True)
+                        changes.append(self._op_remove(path, ad_tx["id"]))
+                        self._index_ad_cost(profile, category, transaction_id)
+
+                # Only the edited rows can be out of place: take them out and re-insert
+                moved = [x for x in target_list if x["id"] in changed_ids]
+                target_list[:] = [x for x in target_list if x["id"] not in changed_ids]
+                for x in moved:
+                    self._insert_sorted(target_list, x)
                     
-                self.save_data()
+                changes += self._ops_reposition(path, target_list, changed_ids)
+                self._apply_tx_family_delta(profile, category, snapshot)
+                self.save_data(changes=changes)
                 return True
         return False
 
+    def _update_store_transaction(self, profile, category, transaction_id, amount, comment, date_str, item_name, image_path, ad_cost):
+        pid = profile["id"]
+        t = self.store.get_transaction(pid, transaction_id)
+        if not t: return False
+        
+        t["amount"] = float(amount)
+        t["amount_minor"] = Money.to_minor(amount)
+        t["comment"] = comment
+        t["date"] = date_str
+        t["date_ord"] = parse_date_ordinal(date_str)
+        t["item_name"] = item_name
+        t["image_path"] = image_path
+        t["ad_cost"] = float(ad_cost) if ad_cost else 0.0
+        to_save = [t]
+        
+        ad_tx = self.store.get_ad_child(pid, transaction_id)
+        if float(ad_cost) > 0:
+            if not ad_tx:
+                ad_tx = {
+                    "id": str(uuid.uuid4()),
+                    "parent_id": transaction_id,
+                    "image_path": None,
+                    "is_ad_cost": True
+                }
+            ad_tx["amount"] = -float(ad_cost)
+            ad_tx["amount_minor"] = Money.to_minor(ad_tx["amount"])
+            ad_tx["date"] = date_str
+            ad_tx["date_ord"] = t["date_ord"]
+            ad_tx["item_name"] = item_name
+            ad_tx["comment"] = f"Объявление: {item_name}"
+            to_save.append(ad_tx)
+            self._index_ad_cost(profile, category, transaction_id, ad_tx["id"])
+        elif ad_tx:
+            self.store.delete_transaction_ids(pid, [ad_tx["id"]])
+            self._index_ad_cost(profile, category, transaction_id)
+        
+        self.store.add_transactions(pid, category, to_save)
+        return True
+
     def get_transactions(self, category):
         profile = self.get_active_profile()
         if not profile: return []
+        if self.store:
+            return self.store.get_transactions(profile["id"], category)
         if category in ["car_rental", "mining", "farm_bp", "fishing"]:
             return profile.get(category, {}).get("transactions", [])
         return profile.get("transactions", [])
 
+    # --- Date Range Queries ---
+
+    def query_transactions(self, category, start=None, end=None, limit=None, offset=0):
+        """
+        Transactions dated within [start, end] (inclusive date objects, None = unbounded),
+        newest first, paged by offset/limit. Rows with unparsable dates are only
+        returned when both bounds are None.
+        """
+        profile = self.get_active_profile()
+        if not profile: return []
+        if self.store:
+            return self.store.query_transactions(profile["id"], category, *self._ordinal_bounds(start, end), limit, offset)
+        transactions = self.get_transactions(category)
+        lo, hi = self._date_window(transactions, start, end)
+        lo += offset
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return transactions[lo:hi]
+
+    def sum_range(self, category, start=None, end=None, with_ad_costs=False):
+        """
+        (income, expenses) of the transactions in [start, end], without building the row list.
+        with_ad_costs also counts ad_cost fields of rows that have no separate ad cost row.
+        """
+        profile = self.get_active_profile()
+        if not profile: return (0.0, 0.0)
+        columns = self._get_columns(profile, category)
+        income, expenses = columns.totals(*self._ordinal_bounds(start, end), with_ad_costs)
+        return (Money(income).to_major(), Money(expenses).to_major())
+
+    def daily_totals(self, category, start, end, with_ad_costs=True):
+        """Per-day (incomes, expenses) lists for [start, end], one entry per calendar day."""
+        profile = self.get_active_profile()
+        days = max((end - start).days + 1, 0)
+        if not profile: return ([0.0] * days, [0.0] * days)
+        incomes, expenses = self._get_columns(profile, category).daily(start.toordinal(), end.toordinal(), with_ad_costs)
+        return ([v / 100 for v in incomes], [v / 100 for v in expenses])
+
+    def _get_columns(self, profile, category):
+        key = (profile["id"], self._ledger_key(category))
+        columns = self._columns.get(key)
+        if columns is None:
+            if self.store:
+                rows = self.store.ledger_columns(profile["id"], category)
+            else:
+                ad_parents = self._get_ad_cost_index(profile, category)
+                rows = [
+                    (
+                        tx_date_ord(t),
+                        tx_amount_minor(t),
+                        0 if t["id"] in ad_parents else max(Money.to_minor(t.get("ad_cost", 0) or 0), 0),
+                    )
+                    for t in self._ledger_list(profile, category)
+                ]
+            columns = self._columns[key] = LedgerColumns(rows)
+        return columns
+
+    @staticmethod
+    def _ordinal_bounds(start, end):
+        return (start.toordinal() if start else None, end.toordinal() if end else None)
+
+    @staticmethod
+    def _date_window(transactions, start, end):
+        """[lo, hi) slice of a newest-first list for the date bounds, found by binary search."""
+        date_key = lambda t: -tx_date_ord(t)
+        lo = 0 if end is None else bisect.bisect_left(transactions, -end.toordinal(), key=date_key)
+        if start is not None:
+            hi = bisect.bisect_right(transactions, -start.toordinal(), key=date_key)
+        elif end is not None:
+            # Rows with unparsable dates (date_ord 0) sit at the end; keep them out of bounded windows
+            hi = bisect.bisect_left(transactions, 0, key=date_key)
+        else:
+            hi = len(transactions)
+        return lo, hi
+
     def update_category_starting_amount(self, category, amount):
         profile = self.get_active_profile()
         if not profile: return
@@ -1426,86 +2212,22 @@ class DataManager(QObject):
             return profile[category].get("starting_amount", 0.0)
         return 0.0
 
-    @lru_cache(maxsize=128)
     def get_category_stats(self, category):
         profile = self.get_active_profile()
         if not profile: return None
 
-        if category in ["clothes", "clothes_new", "cars_trade", "fishing"]:
-            if category not in profile:
-                return {"income": 0, "expenses": 0, "current_balance": 0, "pure_profit": 0}
-            
-            if category == "fishing":
-                # Fishing uses transactions list
-                transactions = profile.get(category, {}).get("transactions", [])
-                income = Money(0)
-                expenses = Money(0)
-                for t in transactions:
-                    amt = Money.from_major(t["amount"])
-                    if amt.amount > 0: income += amt
-                    else: expenses += abs(amt)
-            else:
-                inventory = profile[category].get("inventory", [])
-                sold = profile[category].get("sold_history", [])
-                
-                income = Money(0)
-                for item in sold:
-                    income += Money.from_major(item.get("sell_price", 0))
-                
-                expenses = Money(0)
-                for item in inventory:
-                    expenses += Money.from_major(item.get("buy_price", 0))
-                    # Add cost of appearance to expenses
-                    expenses += Money.from_major(item.get("cost_of_appearance", 0))
-                for item in sold:
-                    expenses += Money.from_major(item.get("buy_price", 0))
-                    # Add cost of appearance to expenses
-                    expenses += Money.from_major(item.get("cost_of_appearance", 0))
-            
-            pure_profit = income - expenses
-            
-            # Use cached or manual calculation to avoid recursion
-            liquid_cash = Money.from_major(profile.get("starting_amount", 0.0))
-            # ... we need a way to get liquid cash without calling get_total_capital_balance
-            # Let's just return the pure profit and let the UI handle the global balance display
-            
-            return {
-                "income": income.to_major(),
-                "expenses": expenses.to_major(),
-                "pure_profit": pure_profit.to_major()
-            }
-            
-        elif category in ["car_rental", "mining", "farm_bp"]:
-            transactions = profile.get(category, {}).get("transactions", [])
-            
-            income = Money(0)
-            expenses = Money(0)
-            for t in transactions:
-                amt = Money.from_major(t["amount"])
-                if amt.amount > 0: income += amt
-                else: expenses += abs(amt)
-                
-                # Only add ad_cost from the field if it's NOT already a separate transaction
-                # (separate transactions have is_ad_cost=True and are already counted in expenses)
-                # But wait, the main transaction still has the ad_cost field. 
-                # If we have a separate transaction, we should ignore the field.
-                # If we don't have a separate transaction (old data), we should use the field.
-                
-                has_separate_ad_tx = any(tx.get("parent_id") == t["id"] for tx in transactions)
-                if not has_separate_ad_tx:
-                    ad_cost = Money.from_major(t.get("ad_cost", 0.0))
-                    expenses += ad_cost
-            
-            pure_profit = income - expenses
-            
-            return {
-                "income": income.to_major(),
-                "expenses": expenses.to_major(),
-                "pure_profit": pure_profit.to_major()
-            }
-        return None
+        if category in ["clothes", "clothes_new", "cars_trade", "fishing"] and category not in profile:
+            return {"income": 0, "expenses": 0, "current_balance": 0, "pure_profit": 0}
+        if category not in AGGREGATED_CATEGORIES:
+            return None
+
+        income, expenses, _ = self._get_category_totals(profile, category)
+        return {
+            "income": Money(income).to_major(),
+            "expenses": Money(expenses).to_major(),
+            "pure_profit": Money(income - expenses).to_major()
+        }
 
-    @lru_cache(maxsize=32)
     def get_total_capital_balance(self):
         """Calculates total liquid cash and total net worth across all modules."""
         profile = self.get_active_profile()
@@ -1514,45 +2236,225 @@ class DataManager(QObject):
 
         # Base starting amount from profile
         starting_amount = profile.get("starting_amount", 0.0)
-        liquid_cash = Money.from_major(starting_amount)
-        net_worth = Money(liquid_cash.amount)
-
-        # Debug log for calculation
-        logging.info(f"Balance calc: starting_amount={starting_amount}")
+        liquid_cash = Money.to_minor(starting_amount)
+        net_worth = liquid_cash
 
         # Categories with simple transactions (Income/Expenses)
         # Requirement: BP should NOT be counted as money in the top panel
         for cat in ["car_rental", "mining", "fishing"]:
-            stats = self.get_category_stats(cat)
-            if stats:
-                profit = Money.from_major(stats.get("pure_profit", 0.0))
-                liquid_cash += profit
-                net_worth += profit
+            income, expenses, _ = self._get_category_totals(profile, cat)
+            liquid_cash += income - expenses
+            net_worth += income - expenses
 
         # Categories with Inventory (Purchase-Sale)
         for cat in ["clothes", "clothes_new", "cars_trade"]:
-            stats = self.get_category_stats(cat)
-            if stats:
-                profit = Money.from_major(stats.get("pure_profit", 0.0))
-                liquid_cash += profit
-                
-                # Net worth includes the value of items currently in inventory
-                inventory = profile.get(cat, {}).get("inventory", [])
-                inventory_value = Money(0)
-                for item in inventory:
-                    inventory_value += Money.from_major(item.get("buy_price", 0))
-                
-                net_worth += inventory_value
+            income, expenses, inventory_value = self._get_category_totals(profile, cat)
+            liquid_cash += income - expenses
+            # Net worth includes the value of items currently in inventory
+            net_worth += inventory_value
 
         return {
-            "liquid_cash": liquid_cash.to_major(),
-            "net_worth": net_worth.to_major()
+            "liquid_cash": Money(liquid_cash).to_major(),
+            "net_worth": Money(net_worth).to_major()
         }
 
+    # --- Running Category Aggregates ---
+
+    def _get_category_totals(self, profile, category):
+        """(income, expenses, inventory_value) in minor units, maintained incrementally."""
+        key = (profile["id"], category)
+        totals = self._aggregates.get(key)
+        if totals is None:
+            totals = self._compute_category_totals(profile, category)
+            self._aggregates[key] = totals
+        return totals
+
+    def _apply_category_delta(self, profile, category, before, after):
+        key = (profile["id"], category)
+        totals = self._aggregates.get(key)
+        if totals is None:
+            # Not computed yet; the first read does a full pass anyway
+            return
+        self._aggregates[key] = tuple(t - b + a for t, b, a in zip(totals, before, after))
+
+    def invalidate_aggregates(self):
+        """Drops running totals, the ad cost index and ledger columns; all are rebuilt on next access."""
+        self._aggregates.clear()
+        self._ad_cost_index.clear()
+        self._columns.clear()
+
+    def verify_aggregates(self):
+        """
+        Consistency check: recomputes every cached aggregate from scratch.
+        Returns a list of (profile_id, category, cached, recomputed) mismatches.
+        """
+        mismatches = []
+        profiles = {p["id"]: p for p in self._loaded_profiles()}
+        for (profile_id, category), cached in list(self._aggregates.items()):
+            profile = profiles.get(profile_id)
+            if not profile:
+                continue
+            expected = self._compute_category_totals(profile, category)
+            if tuple(cached) != tuple(expected):
+                mismatches.append((profile_id, category, cached, expected))
+        return mismatches
+
+    def _compute_category_totals(self, profile, category):
+        """Full recompute of a category's totals over all of its records."""
+        if category in ["clothes", "clothes_new", "cars_trade"]:
+            if self.store:
+                return tuple(self.store.trade_totals(profile["id"], category))
+            section = profile.get(category, {})
+            income = expenses = inventory_value = 0
+            for item in section.get("inventory", []):
+                i, e, v = self._trade_item_totals(item, sold=False)
+                expenses += e
+                inventory_value += v
+            for item in section.get("sold_history", []):
+                i, e, v = self._trade_item_totals(item, sold=True)
+                income += i
+                expenses += e
+            return (income, expenses, inventory_value)
+
+        if self.store:
+            income, expenses = self.store.category_totals(profile["id"], category, with_ad_costs=category != "fishing")
+            return (income, expenses, 0)
+
+        transactions = profile.get(category, {}).get("transactions", [])
+        ad_parents = self._get_ad_cost_index(profile, category)
+        income, expenses, _ = self._family_totals(category, transactions, ad_parents)
+        return (income, expenses, 0)
+
+    @staticmethod
+    def _family_totals(category, transactions, ad_parents=None):
+        """
+        Totals contributed by a group of transactions that contains every ad cost
+        row of its members (a main transaction with its children, or a whole list).
+        """
+        if ad_parents is None:
+            ad_parents = {t["parent_id"] for t in transactions if t.get("parent_id")}
+        income = expenses = 0
+        for t in transactions:
+            amount = tx_amount_minor(t)
+            if amount > 0: income += amount
+            else: expenses -= amount
+            
+            # Only add ad_cost from the field if it's NOT already a separate transaction
+            # (separate transactions have is_ad_cost=True and are already counted in expenses)
+            if category != "fishing" and t["id"] not in ad_parents:
+                expenses += Money.to_minor(t.get("ad_cost", 0.0))
+        return (income, expenses, 0)
+
+    @staticmethod
+    def _trade_item_totals(item, sold):
+        buy = Money.to_minor(item.get("buy_price", 0))
+        # Cost of appearance counts as an expense too
+        coa = Money.to_minor(item.get("cost_of_appearance", 0))
+        if sold:
+            return (Money.to_minor(item.get("sell_price", 0)), buy + coa, 0)
+        return (0, buy + coa, buy)
+
+    # --- Ad Cost Index ---
+
+    def get_ad_cost_index(self, category):
+        """
+        Maps main transaction id -> id of its separate ad cost transaction
+        for the active profile. Main rows listed here must not add their
+        ad_cost field again. Do not modify the returned dict.
+        """
+        profile = self.get_active_profile()
+        if not profile: return {}
+        return self._get_ad_cost_index(profile, category)
+
+    def _get_ad_cost_index(self, profile, category):
+        key = (profile["id"], self._ledger_key(category))
+        index = self._ad_cost_index.get(key)
+        if index is None:
+            if self.store:
+                index = self.store.ad_cost_links(profile["id"], category)
+            else:
+                index = {
+                    t["parent_id"]: t["id"]
+                    for t in self._ledger_list(profile, category) if t.get("parent_id")
+                }
+            self._ad_cost_index[key] = index
+        return index
+
+    def _index_ad_cost(self, profile, category, parent_id, child_id=None):
+        """Links (or with child_id=None unlinks) an ad cost row in a built index."""
+        index = self._ad_cost_index.get((profile["id"], self._ledger_key(category)))
+        if index is None:
+            return
+        if child_id:
+            index[parent_id] = child_id
+        else:
+            index.pop(parent_id, None)
+
+    def _unindex_ad_cost(self, profile, category, deleted):
+        """Updates the index after `deleted` (and its ad cost row, if any) was removed."""
+        if not deleted:
+            return
+        self._index_ad_cost(profile, category, deleted["id"])
+        if deleted.get("parent_id"):
+            self._index_ad_cost(profile, category, deleted["parent_id"])
+
+    @staticmethod
+    def _ledger_key(category):
+        return category if category in ["car_rental", "mining", "farm_bp", "fishing"] else ""
+
+    def _ledger_list(self, profile, category):
+        if category in ["car_rental", "mining", "farm_bp", "fishing"]:
+            return profile.get(category, {}).get("transactions", [])
+        return profile.get("transactions", [])
+
+    def _snapshot_tx_family(self, profile, category, transaction_id):
+        """
+        Captures the totals of the transaction family (main row + ad cost rows) that
+        contains transaction_id, before a mutation. Returns None if not tracked.
+        """
+        if category not in ["car_rental", "mining", "farm_bp", "fishing"]:
+            return None
+        if (profile["id"], category) not in self._aggregates:
+            return None
+        if self.store:
+            transaction = self.store.get_transaction(profile["id"], transaction_id)
+        else:
+            transaction = next((t for t in self.get_transactions(category) if t["id"] == transaction_id), None)
+        root_id = (transaction.get("parent_id") or transaction_id) if transaction else transaction_id
+        return root_id, self._tx_family_totals(profile, category, root_id)
+
+    def _apply_tx_family_delta(self, profile, category, snapshot):
+        """Folds the change of a family captured by _snapshot_tx_family into the running totals."""
+        # Columns are cheap to rebuild compared to shifting sorted arrays in place
+        self._columns.pop((profile["id"], self._ledger_key(category)), None)
+        if snapshot is None:
+            return
+        root_id, before = snapshot
+        self._apply_category_delta(profile, category, before, self._tx_family_totals(profile, category, root_id))
+
+    def _tx_family_totals(self, profile, category, root_id):
+        if self.store:
+            family = self.store.get_family(profile["id"], root_id)
+        else:
+            family = [t for t in self.get_transactions(category) if t["id"] == root_id or t.get("parent_id") == root_id]
+        return self._family_totals(category, family)
+
+    def get_full_profile(self, profile):
+        """Returns the profile with all records, including those kept in the storage engine."""
+        if self.segments and profile_segments.is_stub(profile):
+            profile = self._materialize(profile["id"]) or profile
+        if self.store:
+            return self.store.hydrate_profile(profile)
+        return profile
+
+    def get_portable_profile(self, profile):
+        """Full profile with stored images inlined as Base64, for exports read on other machines."""
+        return self.image_store.inline_refs(self.get_full_profile(profile))
+
     def export_profile(self, profile_id):
         for profile in self.data["profiles"]:
             if profile["id"] == profile_id:
-                json_str = json.dumps(profile, ensure_ascii=False)
+                json_str = json.dumps(self.get_portable_profile(profile), ensure_ascii=False)
                 compressed = gzip.compress(json_str.encode('utf-8'))
                 b64 = base64.b64encode(compressed).decode('utf-8')
                 return b64
@@ -1596,7 +2498,8 @@ class DataManager(QObject):
 
         history.insert(0, history_item)
         profile[category]["filter_history"] = history[:10]
-        self.save_data()
+        path = self._profile_path(profile, category, "filter_history")
+        self.save_data(changes=[self._op_set(path, profile[category]["filter_history"])])
 
     def get_filter_history(self, category):
         profile = self.get_active_profile()
@@ -1611,7 +2514,7 @@ class DataManager(QObject):
             for timer in profile["timers"]:
                 if timer["id"] == timer_id:
                     timer.update(updates)
-                    self.save_data()
+                    self.save_data(changes=[self._op_set(self._profile_path(profile, "timers", timer_id), timer)])
                     return True
         return False
 
@@ -1623,12 +2526,25 @@ class DataManager(QObject):
         
         # 1. Calculate from transactions
         transactions = []
-        if category in ["car_rental", "mining", "farm_bp", "fishing"] and category in profile:
-             transactions = profile[category].get("transactions", [])
+        if category in ["car_rental", "mining", "farm_bp", "fishing"] and category in profile and self.store:
+             # Summed by the database instead of decoding every stored row
+             for name, count, income, expenses, profit in self.store.item_totals(profile["id"], category):
+                 stats[name] = {
+                     "count": count,
+                     "income": Money(income).to_major(),
+                     "expenses": Money(expenses).to_major(),
+                     "profit": Money(profit).to_major(),
+                 }
+        elif category in ["car_rental", "mining", "farm_bp", "fishing"] and category in profile:
+             transactions = self.get_transactions(category)
         elif category in ["clothes", "clothes_new", "cars_trade"] and category in profile:
              # Trade categories: calculate from inventory and sold_history
-             inventory = profile[category].get("inventory", [])
-             sold = profile[category].get("sold_history", [])
+             if self.store:
+                 inventory = self.store.get_trade_items(profile["id"], category, sold=False)
+                 sold = self.store.get_trade_items(profile["id"], category, sold=True)
+             else:
+                 inventory = profile[category].get("inventory", [])
+                 sold = profile[category].get("sold_history", [])
              
              for item in inventory:
                  name = item.get("name", "Неизвестно")
@@ -1661,8 +2577,9 @@ class DataManager(QObject):
                  stats[name]["expenses"] += buy_price + coa_price
                  stats[name]["profit"] += (sell_price - buy_price - coa_price)
         else:
-             transactions = profile.get("transactions", [])
+             transactions = self.get_transactions(category)
         
+        ad_parents = self._get_ad_cost_index(profile, category) if transactions else {}
         for t in transactions:
             name = t.get("item_name", "")
             if not name:
@@ -1688,8 +2605,7 @@ class DataManager(QObject):
 
             # Add ad cost to expenses and subtract from profit
             # Only if not already a separate transaction
-            has_separate_ad_tx = any(tx.get("parent_id") == t["id"] for tx in transactions)
-            if not has_separate_ad_tx:
+            if t["id"] not in ad_parents:
                 ad_cost = t.get("ad_cost", 0.0)
                 if ad_cost > 0:
                     stats[name]["expenses"] += ad_cost
@@ -1718,7 +2634,8 @@ class DataManager(QObject):
             profile["item_stats_offsets"][category][item_name] = {}
             
         profile["item_stats_offsets"][category][item_name]["count"] = offset
-        self.save_data()
+        path = self._profile_path(profile, "item_stats_offsets", category, item_name, "count")
+        self.save_data(changes=[self._op_set(path, offset)])
 
     def add_clothes_item(self, name, buy_price, note, photo_path):
         return self.add_trade_item("clothes", name, buy_price, note, photo_path)
@@ -1738,8 +2655,11 @@ class DataManager(QObject):
         count = 0
         if "profiles" not in import_data:
             return 0
+        self.image_store.extract_inline(import_data)
             
         current_profile_ids = {p["id"]: p for p in self.data["profiles"]}
+        # Existing profiles that received rows; with the store, their stored lists are merged there
+        merged_profiles = []
         
         for p_in in import_data["profiles"]:
             p_id = p_in.get("id")
@@ -1752,30 +2672,31 @@ class DataManager(QObject):
                 continue
                 
             # Profile exists, merge data
-            p_curr = current_profile_ids[p_id]
+            p_curr = self._materialize(p_id) if self.segments else current_profile_ids[p_id]
+            merged_profiles.append(p_curr)
             
             # Merge Cars
             if "car_rental" in p_in:
                 if "car_rental" not in p_curr: p_curr["car_rental"] = {}
                 count += self._merge_lists(p_curr["car_rental"], p_in["car_rental"], "cars")
-                count += self._merge_lists(p_curr["car_rental"], p_in["car_rental"], "transactions")
+                count += self._merge_stored_list(p_curr["car_rental"], p_in["car_rental"], "transactions")
 
             # Merge Mining
             if "mining" in p_in:
                 if "mining" not in p_curr: p_curr["mining"] = {}
                 count += self._merge_lists(p_curr["mining"], p_in["mining"], "equipment")
-                count += self._merge_lists(p_curr["mining"], p_in["mining"], "transactions")
+                count += self._merge_stored_list(p_curr["mining"], p_in["mining"], "transactions")
                 
             # Merge Farm BP
             if "farm_bp" in p_in:
                 if "farm_bp" not in p_curr: p_curr["farm_bp"] = {}
-                count += self._merge_lists(p_curr["farm_bp"], p_in["farm_bp"], "transactions")
+                count += self._merge_stored_list(p_curr["farm_bp"], p_in["farm_bp"], "transactions")
                 
             # Merge Clothes
             if "clothes" in p_in:
                 if "clothes" not in p_curr: p_curr["clothes"] = {}
-                count += self._merge_lists(p_curr["clothes"], p_in["clothes"], "inventory")
-                count += self._merge_lists(p_curr["clothes"], p_in["clothes"], "sold_history")
+                count += self._merge_stored_list(p_curr["clothes"], p_in["clothes"], "inventory")
+                count += self._merge_stored_list(p_curr["clothes"], p_in["clothes"], "sold_history")
             
             # Merge Memos (sections and items)
             if "memo_sections" in p_in:
@@ -1797,9 +2718,22 @@ class DataManager(QObject):
                 # Timers list is direct
                 count += self._merge_direct_list(p_curr["timers"], p_in["timers"])
 
+        # Imported profiles may predate the current structure; merged rows were appended at the end
+        self.run_migrations(force=True)
+        if self.store:
+            # Move imported transactions and trade items into the storage engine. Rows whose
+            # id is already stored are kept as they are; only those actually added are counted.
+            count += self.store.migrate_from_json({"profiles": merged_profiles}, replace=False)
+            self.store.migrate_from_json(self.data, replace=False)
+            self._notify_data_changed()
         self.save_data()
         return count
 
+    def _merge_stored_list(self, target_dict, source_dict, key):
+        """_merge_lists for a list the storage engine holds; the store counts those rows instead."""
+        added = self._merge_lists(target_dict, source_dict, key)
+        return 0 if self.store else added
+
     def _merge_lists(self, target_dict, source_dict, key):
         if key not in source_dict: return 0
         if key not in target_dict: target_dict[key] = []
@@ -13,6 +13,7 @@ from PyQt6.QtSvg import QSvgRenderer
 import sys
 import os
 import logging
+import time
 import traceback
 
 # Ensure the root directory is in sys.path for imports from root
@@ -91,6 +92,7 @@ from gui.styles import StyleManager
 from gui.animations import AnimationManager
 from gui.update_manager import UpdateManager
 from gui.performance import PerformanceMonitor
+from gui.tab_warmup import TabWarmupScheduler
 
 class NavButton(QPushButton):
     def __init__(self, text, icon_char, index, parent=None):
@@ -193,7 +195,6 @@ class MainWindow(ResizeMixin, QMainWindow):
         self.setMinimumSize(900, 720)
         
         self.auth_manager = auth_manager
-        self._tabs_preloading_done = False
         
         # Initialize Notification Manager early
         self.notification_manager = NotificationManager()
@@ -238,6 +239,7 @@ class MainWindow(ResizeMixin, QMainWindow):
 
         # Connect Profile Button
         self.title_bar.profile_btn.clicked.connect(self.open_profiles_dialog)
+        self.data_manager.migration_progress.connect(self._on_migration_progress)
         
         # Icon Map for Navigation
         self.icon_map = {
@@ -564,9 +566,19 @@ class MainWindow(ResizeMixin, QMainWindow):
                 self.data_manager.set_setting("last_screen_index", current_index)
             except Exception as e:
                 logging.warning(f"Could not save screen index: {e}")
+            
+            if hasattr(self, 'tab_warmup'):
+                self.tab_warmup.stop()
+                self.data_manager.set_setting("tab_visit_counts", self._tab_visits)
         except:
             pass
 
+        # Make sure journaled changes hit the disk before the forced exit below
+        try:
+            self.data_manager.flush()
+        except Exception as e:
+            logging.error(f"Failed to flush data on close: {e}")
+
         # Cleanup components
         try:
             if hasattr(self, 'tray_icon') and self.tray_icon:
@@ -730,18 +742,10 @@ class MainWindow(ResizeMixin, QMainWindow):
         self.tabs.setCurrentIndex(startup_index)
         self._load_tab(startup_index)
         
-        # Preload adjacent tabs immediately after (for instant switching)
-        adjacent_indices = []
-        if startup_index > 0:
-            adjacent_indices.append(startup_index - 1)
-        if startup_index < len(self.tab_configs) - 1:
-            adjacent_indices.append(startup_index + 1)
-        
-        for idx in adjacent_indices:
-            QTimer.singleShot(100, lambda i=idx: self._load_tab(i))
-        
-        # Background preload of all remaining tabs
-        QTimer.singleShot(500, self._preload_all_tabs)
+        # Remaining tabs are built one per idle slice, most visited first
+        self._tab_visits = dict(self.data_manager.get_setting("tab_visit_counts", {}) or {})
+        self.tab_warmup = TabWarmupScheduler(lambda i: self._load_tab(i, background=True), parent=self)
+        self.tab_warmup.start(self._warmup_order(startup_index), delay_ms=500)
         
         for btn in self.nav_group.buttons():
             if btn.property("page_index") == startup_index:
@@ -756,12 +760,22 @@ class MainWindow(ResizeMixin, QMainWindow):
         self.nav_buttons_layout.addWidget(btn)
         self.nav_group.addButton(btn, index)
 
-    def _load_tab(self, index):
+    def _warmup_order(self, startup_index):
+        """Unloaded, visible tabs by visit count, ties broken by distance to the startup tab."""
+        hidden_tabs = self.data_manager.get_setting("hidden_tabs", [])
+        candidates = [
+            i for i, config in enumerate(self.tab_configs)
+            if i != startup_index and (config[3] not in hidden_tabs or config[3] == "settings")
+        ]
+        return sorted(candidates, key=lambda i: (-self._tab_visits.get(self.tab_configs[i][3], 0), abs(i - startup_index), i))
+
+    def _load_tab(self, index, background=False):
         """
         Loads a tab instance by its index in tab_configs.
         
         Args:
             index (int): The index of the tab to load.
+            background (bool): Built by the warmup scheduler (no wait cursor, no nested event processing).
             
         This method creates the actual widget instance and replaces the placeholder 
         in the QStackedWidget at the specified index. This maintains a 1:1 mapping 
@@ -774,10 +788,12 @@ class MainWindow(ResizeMixin, QMainWindow):
             return
         
         tab_class_name, name, icon_name, key = self.tab_configs[index]
+        started = time.perf_counter()
         try:
-            # Show a brief loading indicator or just process events to keep UI alive
-            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
-            QApplication.processEvents()
+            if not background:
+                # Show a brief loading indicator or just process events to keep UI alive
+                QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+                QApplication.processEvents()
             
             tab = None
             if tab_class_name == "GenericTab":
@@ -828,19 +844,13 @@ class MainWindow(ResizeMixin, QMainWindow):
                 theme = self.data_manager.get_setting("theme", "dark")
                 if hasattr(tab, "apply_theme"):
                     tab.apply_theme(theme)
+                
+                self.perf_monitor.record_tab_load(name, time.perf_counter() - started, background)
         except Exception as e:
             logging.error(f"Failed to load tab {name}: {e}\n{traceback.format_exc()}")
         finally:
-            QApplication.restoreOverrideCursor()
-
-    def _preload_all_tabs(self):
-        if self._tabs_preloading_done:
-            return
-        self._tabs_preloading_done = True
-        
-        for i in range(len(self.tab_configs)):
-            if i not in self._tabs_loaded:
-                self._load_tab(i)
+            if not background:
+                QApplication.restoreOverrideCursor()
 
     def update_tabs_visibility(self):
         hidden_tabs = self.data_manager.get_setting("hidden_tabs", [])
@@ -855,9 +865,18 @@ class MainWindow(ResizeMixin, QMainWindow):
 
     def on_nav_clicked(self, btn):
         index = self.nav_group.id(btn)
+        previous = self.tabs.currentIndex()
+        if previous != index and 0 <= previous < len(self.tab_configs):
+            # Async reads the tab we are leaving still waits for would only update hidden widgets
+            self.async_dm.cancel_group(self.tab_configs[previous][3])
+        self.tab_warmup.discard(index)
         self._load_tab(index)
         self.tabs.setCurrentIndex(index)
         
+        if index < len(self.tab_configs):
+            key = self.tab_configs[index][3]
+            self._tab_visits[key] = self._tab_visits.get(key, 0) + 1
+        
         tab_name = self.tab_configs[index][1] if index < len(self.tab_configs) else "Unknown"
         logging.info(f"Navigation: Switched to tab {tab_name} (index {index})")
         
@@ -978,9 +997,6 @@ class MainWindow(ResizeMixin, QMainWindow):
             self.title_bar.active_profile_label.setVisible(True)
             logging.info("UI Refresh: Default profile 'Ter' displayed")
         
-        if hasattr(self.data_manager.get_total_capital_balance, "cache_clear"):
-            self.data_manager.get_total_capital_balance.cache_clear()
-        
         self.update_balance_display()
         
         current_widget = self.tabs.currentWidget()
@@ -1007,6 +1023,15 @@ class MainWindow(ResizeMixin, QMainWindow):
         except Exception as e:
             logging.error(f"Error processing balance: {e}")
 
+    def _on_migration_progress(self, migration_id, done, total):
+        label = self.title_bar.migration_label
+        label.setText(f"Обновление данных {done}/{total}")
+        label.setToolTip(migration_id)
+        label.setVisible(done < total)
+        if done == total:
+            # Tabs built before the migrations finished still show the old values
+            self.refresh_data()
+
     def _on_hotkey_triggered(self, action):
         """Handle global hotkey events (F7/F8)."""
         if action == "mem_cleanup": # F7: Instant Background Mem Cleanup
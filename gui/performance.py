@@ -21,6 +21,7 @@ class PerformanceMonitor(QObject):
         super().__init__(parent)
         self.process = psutil.Process() if psutil else None
         self.startup_time = 0
+        self.tab_costs = {} # tab name -> (seconds, built in background)
         self.last_heartbeat = time.time()
         self._hang_threshold = 5.0 # seconds
         
@@ -51,6 +52,12 @@ class PerformanceMonitor(QObject):
         self.startup_time = time.time() - self._start_mark
         logging.info(f"Startup Performance (LCP): {self.startup_time:.2f}s")
         
+    def record_tab_load(self, name, seconds, background=False):
+        """Construction cost of one tab, on demand or during idle warmup."""
+        self.tab_costs[name] = (seconds, background)
+        source = "warmup" if background else "on demand"
+        logging.info(f"Tab '{name}' built in {seconds * 1000:.1f} ms ({source})")
+        
     def update_metrics(self):
         if not self.process:
             return
@@ -63,7 +70,8 @@ class PerformanceMonitor(QObject):
                 "memory_mb": mem_info.rss / (1024 * 1024),
                 "cpu_percent": cpu_percent,
                 "startup_time": self.startup_time,
-                "threads": len(self.process.threads())
+                "threads": len(self.process.threads()),
+                "tab_costs": dict(self.tab_costs)
             }
             self.metrics_updated.emit(metrics)
         except Exception as e:
@@ -0,0 +1,81 @@
+import time
+import logging
+from PyQt6.QtCore import QObject, QTimer, QEvent
+from PyQt6.QtWidgets import QApplication
+
+
+class TabWarmupScheduler(QObject):
+    """
+    Builds not-yet-loaded tabs in the background, one per idle slice.
+
+    A tab constructor cannot be split, so the budget is enforced between slices:
+    after a build that took longer than `slice_budget_ms`, the next slice waits
+    proportionally longer, keeping the GUI thread mostly free for the user. Any
+    keyboard or mouse input postpones the next slice by `input_quiet_ms`.
+    Tabs are warmed in the given priority order (most visited first).
+    """
+
+    def __init__(self, build_fn, slice_budget_ms=8, min_gap_ms=50, input_quiet_ms=400, parent=None):
+        super().__init__(parent)
+        self.build_fn = build_fn
+        self.slice_budget_ms = slice_budget_ms
+        self.min_gap_ms = min_gap_ms
+        self.input_quiet_ms = input_quiet_ms
+        self._queue = []
+        self._last_input = 0.0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._run_slice)
+
+    def start(self, indices, delay_ms=0):
+        self._queue = list(indices)
+        app = QApplication.instance()
+        if app:
+            app.installEventFilter(self)
+        self._timer.start(delay_ms)
+
+    def stop(self):
+        self._queue = []
+        self._timer.stop()
+        app = QApplication.instance()
+        if app:
+            app.removeEventFilter(self)
+
+    def discard(self, index):
+        """Drops a tab that was built on demand."""
+        if index in self._queue:
+            self._queue.remove(index)
+
+    def pending(self):
+        return list(self._queue)
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Type.KeyPress, QEvent.Type.MouseButtonPress, QEvent.Type.Wheel):
+            self._last_input = time.monotonic()
+        return False
+
+    def _run_slice(self):
+        if not self._queue:
+            self.stop()
+            return
+
+        # The user is doing something: come back when input has been quiet for a while
+        quiet_for_ms = (time.monotonic() - self._last_input) * 1000
+        if quiet_for_ms < self.input_quiet_ms:
+            self._timer.start(int(self.input_quiet_ms - quiet_for_ms) + 1)
+            return
+
+        index = self._queue.pop(0)
+        started = time.perf_counter()
+        try:
+            self.build_fn(index)
+        except Exception as e:
+            logging.error(f"Tab warmup failed for index {index}: {e}")
+        cost_ms = (time.perf_counter() - started) * 1000
+
+        if not self._queue:
+            self.stop()
+            return
+        # Over-budget builds buy a proportionally longer pause before the next one
+        gap = self.min_gap_ms * max(1.0, cost_ms / self.slice_budget_ms)
+        self._timer.start(int(min(gap, 2000)))
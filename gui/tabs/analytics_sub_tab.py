@@ -11,11 +11,12 @@ matplotlib.use('QtAgg')
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
 import logging
 import openpyxl
 
 from gui.styles import StyleManager
+from utils import parse_date_ordinal
 
 class AnalyticsSubTab(QWidget):
     def __init__(self, category_key, category_name, data_manager, parent_analytics_tab=None):
@@ -150,7 +151,22 @@ class AnalyticsSubTab(QWidget):
             # Convert to datetime
             return datetime.combine(start, datetime.min.time()), datetime.combine(end, datetime.max.time())
 
-    def _get_all_transactions(self):
+    # Ledger categories (income/expense transactions) and their labels
+    STANDARD_CATEGORIES = {
+        "car_rental": "Аренда",
+        "mining": "Добыча",
+        "farm_bp": "Ферма",
+        "fishing": "Рыбалка"
+    }
+
+    def _get_all_transactions(self, start=None, end=None):
+        """Trade rows plus ledger rows; ledger rows are limited to [start, end] when given."""
+        return self._get_trade_transactions() + self._get_ledger_transactions(start, end)
+
+    def _selected_ledger_categories(self):
+        return [cat for cat in self.STANDARD_CATEGORIES if self.category_key in ("all", cat)]
+
+    def _get_trade_transactions(self):
         transactions = []
         
         # 1. Clothes (Legacy and New)
@@ -231,24 +247,24 @@ class AnalyticsSubTab(QWidget):
                 except (ValueError, TypeError):
                     continue
         
+        return transactions
+
+    def _get_ledger_transactions(self, start=None, end=None):
+        transactions = []
+        
         # 2. Standard Categories (Income/Expense)
-        standard_cats = {
-            "car_rental": "Аренда",
-            "mining": "Добыча",
-            "farm_bp": "Ферма",
-            "fishing": "Рыбалка"
-        }
-        
-        for cat, label in standard_cats.items():
-            if self.category_key != "all" and self.category_key != cat:
-                continue
-                
-            raw_tx = self.data_manager.get_transactions(cat)
+        for cat in self._selected_ledger_categories():
+            label = self.STANDARD_CATEGORIES[cat]
+            # Ad cost rows share their parent's date, so the window keeps families together
+            raw_tx = self.data_manager.query_transactions(cat, start, end)
+            ad_parents = self.data_manager.get_ad_cost_index(cat)
             for t in raw_tx:
                 # If it's a separate ad cost transaction, include it normally
                 if t.get("is_ad_cost"):
                     transactions.append({
                         "date": t.get("date", ""),
+                        "date_ord": t.get("date_ord"),
+                        "ledger": True,
                         "amount": float(t.get("amount", 0)),
                         "description": f"[{label}] " + (t.get("comment", "") or "Расход на объявление"),
                         "raw_date_fmt": "%d.%m.%Y"
@@ -257,18 +273,21 @@ class AnalyticsSubTab(QWidget):
 
                 transactions.append({
                     "date": t.get("date", ""),
+                    "date_ord": t.get("date_ord"),
+                    "ledger": True,
                     "amount": float(t.get("amount", 0)),
                     "description": f"[{label}] " + (t.get("comment", "") or t.get("item_name", "") or "Операция"),
                     "raw_date_fmt": "%d.%m.%Y"
                 })
                 
                 # Handle Ad Cost from the field ONLY if no separate transaction exists (old data)
-                has_separate_ad_tx = any(tx.get("parent_id") == t["id"] for tx in raw_tx)
-                if not has_separate_ad_tx:
+                if t["id"] not in ad_parents:
                     ad_cost = float(t.get("ad_cost", 0))
                     if ad_cost > 0:
                         transactions.append({
                             "date": t.get("date", ""),
+                            "date_ord": t.get("date_ord"),
+                            "ledger": True,
                             "amount": -ad_cost,
                             "description": f"[{label}] Расход на объявление: {t.get('item_name', '')}",
                             "raw_date_fmt": "%d.%m.%Y"
@@ -280,39 +299,30 @@ class AnalyticsSubTab(QWidget):
         try:
             start_date, end_date = self.get_date_range()
             
-            all_transactions = self._get_all_transactions()
+            all_transactions = self._get_all_transactions(start_date.date(), end_date.date())
             self.logger.info(f"Analytics: Found {len(all_transactions)} total transactions for {self.category_key}")
             
-            # Filter by date
+            # Filter by date (ordinals: ledger rows carry date_ord, others use the cached parser)
             filtered_tx = []
+            start_ord, end_ord = start_date.date().toordinal(), end_date.date().toordinal()
             for t in all_transactions:
                 try:
                     date_str = t.get("date", "")
                     if not date_str:
                         continue
                         
-                    # Some dates might have time, strip it
-                    date_only = date_str.split(" ")[0]
-                    
-                    # Try common formats for parsing
-                    t_date = None
-                    for fmt in ["%d.%m.%Y", "%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y"]:
-                        try:
-                            t_date = datetime.strptime(date_only, fmt).date()
-                            break
-                        except ValueError:
-                            continue
-                    
-                    if not t_date:
+                    ordinal = t.get("date_ord") or parse_date_ordinal(date_str)
+                    if not ordinal:
                         self.logger.warning(f"Failed to parse date: {date_str}")
                         continue
 
                     # Store normalized date for display and comparison
-                    t['normalized_date'] = t_date
-                    t['date'] = t_date.strftime("%d.%m.%Y") # Standardize for chart/table
+                    t['date_ord'] = ordinal
+                    t['normalized_date'] = date.fromordinal(ordinal)
+                    t['date'] = t['normalized_date'].strftime("%d.%m.%Y") # Standardize for chart/table
 
                     # Compare dates (start_date and end_date are datetime objects from get_date_range)
-                    if start_date.date() <= t_date <= end_date.date():
+                    if start_ord <= ordinal <= end_ord:
                         filtered_tx.append(t)
                 except (ValueError, TypeError) as e:
                     self.logger.warning(f"Error processing transaction {t}: {e}")
@@ -325,8 +335,7 @@ class AnalyticsSubTab(QWidget):
             return
 
         # 2. Calculate Stats
-        income = sum(t['amount'] for t in filtered_tx if t['amount'] > 0)
-        expense = sum(abs(t['amount']) for t in filtered_tx if t['amount'] < 0)
+        income, expense = self._period_totals(start_date.date(), end_date.date(), all_transactions)
         balance = income - expense
         
         # Additional metrics for Fishing
@@ -341,14 +350,7 @@ class AnalyticsSubTab(QWidget):
         prev_start = start_date - delta
         prev_end = start_date - timedelta(days=1)
         
-        prev_tx = []
-        for t in all_transactions:
-             if 'normalized_date' in t:
-                if prev_start.date() <= t['normalized_date'] <= prev_end.date():
-                    prev_tx.append(t)
-             
-        prev_income = sum(t['amount'] for t in prev_tx if t['amount'] > 0)
-        prev_expense = sum(abs(t['amount']) for t in prev_tx if t['amount'] < 0)
+        prev_income, prev_expense = self._period_totals(prev_start.date(), prev_end.date(), all_transactions)
         
         income_growth = ((income - prev_income) / prev_income * 100) if prev_income else 0
         expense_growth = ((expense - prev_expense) / prev_expense * 100) if prev_expense else 0
@@ -367,6 +369,29 @@ class AnalyticsSubTab(QWidget):
         self.hide_no_data_message()
         self.update_table(filtered_tx)
 
+    def _period_totals(self, start, end, transactions):
+        """
+        (income, expense) for [start, end]: ledger categories are reduced over DataManager's
+        date columns, trade rows (few) are taken from transactions.
+        """
+        income = expense = 0.0
+        for cat in self._selected_ledger_categories():
+            cat_income, cat_expense = self.data_manager.sum_range(cat, start, end, with_ad_costs=True)
+            income += cat_income
+            expense += cat_expense
+
+        start_ord, end_ord = start.toordinal(), end.toordinal()
+        for t in transactions:
+            if t.get('ledger'):
+                continue
+            ordinal = t.get('date_ord') or parse_date_ordinal(t.get('date', ''))
+            if ordinal and start_ord <= ordinal <= end_ord:
+                if t['amount'] > 0:
+                    income += t['amount']
+                else:
+                    expense += abs(t['amount'])
+        return income, expense
+
     def show_no_data_message(self):
         if not hasattr(self, 'no_data_lbl'):
             self.no_data_lbl = QLabel("Нет данных за выбранный период")
@@ -458,33 +483,28 @@ class AnalyticsSubTab(QWidget):
         fig.patch.set_facecolor('#2b2b2b') # Dark bg
         ax.set_facecolor('#2b2b2b')
         
-        # Group by date
-        dates = []
-        incomes = []
-        expenses = []
-        
-        # Create a dict of dates in range
-        data_map = {}
-        curr = start_date
-        while curr <= end_date:
-            d_str = curr.strftime("%d.%m")
-            data_map[d_str] = {"inc": 0, "exp": 0}
-            curr += timedelta(days=1)
-            
+        # Group by date: ledger categories come bucketed per day, trade rows are added on top
+        first_day, last_day = start_date.date(), end_date.date()
+        days = (last_day - first_day).days + 1
+        inc_vals = [0.0] * days
+        exp_vals = [0.0] * days
+        for cat in self._selected_ledger_categories():
+            cat_inc, cat_exp = self.data_manager.daily_totals(cat, first_day, last_day)
+            inc_vals = [a + b for a, b in zip(inc_vals, cat_inc)]
+            exp_vals = [a + b for a, b in zip(exp_vals, cat_exp)]
+            
+        first_ord = first_day.toordinal()
         for t in transactions:
-            try:
-                # Use standardized date from refresh_data
-                d = datetime.strptime(t['date'], "%d.%m.%Y").strftime("%d.%m")
-                if d in data_map:
-                    if t['amount'] > 0:
-                        data_map[d]["inc"] += t['amount']
-                    else:
-                        data_map[d]["exp"] += abs(t['amount'])
-            except: pass
-            
-        keys = sorted(data_map.keys())
-        inc_vals = [data_map[k]["inc"] for k in keys]
-        exp_vals = [data_map[k]["exp"] for k in keys]
+            # Use normalized ordinal from refresh_data
+            day = t['date_ord'] - first_ord
+            if t.get('ledger') or not 0 <= day < days:
+                continue
+            if t['amount'] > 0:
+                inc_vals[day] += t['amount']
+            else:
+                exp_vals[day] += abs(t['amount'])
+            
+        keys = [(first_day + timedelta(days=i)).strftime("%d.%m") for i in range(days)]
         
         x = range(len(keys))
         ax.bar(x, inc_vals, width=0.4, label='Доход', color='#2ecc71', align='center')
@@ -510,7 +530,7 @@ class AnalyticsSubTab(QWidget):
         self.table.setRowCount(0)
         # Sort by date desc
         try:
-            sorted_tx = sorted(transactions, key=lambda x: datetime.strptime(x['date'], "%d.%m.%Y"), reverse=True)
+            sorted_tx = sorted(transactions, key=lambda x: x['date_ord'], reverse=True)
         except:
             sorted_tx = transactions
             
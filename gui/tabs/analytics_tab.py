@@ -49,28 +49,13 @@ class AnalyticsTab(QWidget):
     def get_global_weekly_balance(self):
         """Calculates total balance for the current week (Mon-Sun) across all categories."""
         # Use the logic from the overview tab to avoid duplication
-        transactions = self.tab_overview._get_all_transactions()
-        
-        today = datetime.now()
+        today = datetime.now().date()
         start_date = today - timedelta(days=today.weekday()) # Monday
-        start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
         end_date = start_date + timedelta(days=6) # Sunday (was 4)
-        end_date = end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
-        
-        total_balance = 0
         
-        for t in transactions:
-            try:
-                fmt = t.get("raw_date_fmt", "%d.%m.%Y")
-                if "-" in t['date']: fmt = "%Y-%m-%d"
-                elif "." in t['date']: fmt = "%d.%m.%Y"
-                
-                t_date = datetime.strptime(t['date'], fmt)
-                if start_date <= t_date <= end_date:
-                    total_balance += t['amount']
-            except: continue
-            
-        return total_balance
+        overview = self.tab_overview
+        income, expense = overview._period_totals(start_date, end_date, overview._get_trade_transactions())
+        return income - expense
 
     def refresh_data(self):
         """Refreshes data in the current sub-tab and marks others for update."""
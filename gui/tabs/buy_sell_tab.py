@@ -440,8 +440,8 @@ class TradeItemWidget(QWidget):
                 return
             pixmap = QPixmap(file_path)
             if not pixmap.isNull():
-                base64_str = self.data_manager.save_pixmap_image(pixmap)
-                self.set_preview_image(base64_str)
+                image_ref = self.data_manager.save_pixmap_image(pixmap)
+                self.set_preview_image(image_ref)
 
     def handle_dropped_image(self, file_path):
         if not file_path: return
@@ -451,8 +451,8 @@ class TradeItemWidget(QWidget):
             return
         pixmap = QPixmap(file_path)
         if not pixmap.isNull():
-            base64_str = self.data_manager.save_pixmap_image(pixmap)
-            self.set_preview_image(base64_str)
+            image_ref = self.data_manager.save_pixmap_image(pixmap)
+            self.set_preview_image(image_ref)
 
     def paste_image(self):
         clipboard = QApplication.clipboard()
@@ -626,11 +626,12 @@ class TradeItemWidget(QWidget):
             img_path = item.get("photo_path") or item.get("image_path")
             
             if img_path:
-                pix = self.data_manager.load_pixmap(img_path, (60, 60))
-                if not pix.isNull():
-                    icon_lbl.setPixmap(pix)
-                else:
-                    icon_lbl.setText("🖼️") # Fallback icon
+                def set_icon(pix, icon_lbl=icon_lbl):
+                    if not pix.isNull():
+                        icon_lbl.setPixmap(pix)
+                    else:
+                        icon_lbl.setText("🖼️") # Fallback icon
+                self.data_manager.load_pixmap_async(img_path, (60, 60), set_icon)
             else:
                 icon_lbl.setText("📦") # Default icon
                 
@@ -12,6 +12,7 @@ from PyQt6.QtGui import QColor, QIcon
 import logging
 
 from gui.custom_dialogs import StyledDialogBase
+from utils import parse_date_ordinal
 
 class AchievementsDialog(StyledDialogBase):
     def __init__(self, parent, achievements, unlocked_ids):
@@ -1058,9 +1059,10 @@ class CapitalPlanningTab(QWidget):
         self.refresh_data()
 
     def calculate_avg_daily_profit(self):
-        # Analyze last 30 days
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=30)
+        # Analyze last 30 days (days after now - 30d, up to today)
+        end_date = datetime.now().date()
+        start_date = end_date - timedelta(days=29)
+        start_ord, end_ord = start_date.toordinal(), end_date.toordinal()
         
         total_profit = 0
         
@@ -1068,30 +1070,16 @@ class CapitalPlanningTab(QWidget):
         sold = self.data_manager.get_clothes_sold()
         for item in sold:
             try:
-                s_date_str = item.get("sell_date", "")
-                if not s_date_str: continue
-                # Handle formats
-                if "." in s_date_str: s_date = datetime.strptime(s_date_str, "%d.%m.%Y")
-                else: s_date = datetime.strptime(s_date_str, "%Y-%m-%d")
-                
-                if start_date <= s_date <= end_date:
+                s_date_ord = parse_date_ordinal(item.get("sell_date", ""))
+                if start_ord <= s_date_ord <= end_ord:
                     profit = float(item.get("sell_price", 0)) - float(item.get("buy_price", 0))
                     total_profit += profit
             except: pass
             
-        # Other categories (Car, Mining)
-        # We need to scan transactions for income/expense
+        # Other categories (Car, Mining): summed over the date window only
         for cat in ["car_rental", "mining"]:
-            txs = self.data_manager.get_transactions(cat)
-            for t in txs:
-                try:
-                    t_date_str = t.get("date", "")
-                    if "." in t_date_str: t_date = datetime.strptime(t_date_str, "%d.%m.%Y")
-                    else: t_date = datetime.strptime(t_date_str, "%Y-%m-%d")
-                    
-                    if start_date <= t_date <= end_date:
-                        total_profit += float(t.get("amount", 0))
-                except: pass
+            income, expenses = self.data_manager.sum_range(cat, start_date, end_date)
+            total_profit += income - expenses
                 
         return total_profit / 30
 
@@ -358,8 +358,8 @@ class ClothesTab(QWidget):
             # Convert to Base64 immediately for portability
             pixmap = QPixmap(file_path)
             if not pixmap.isNull():
-                base64_str = self.data_manager.save_pixmap_image(pixmap) # Now returns Base64
-                self.set_preview_image(base64_str)
+                image_ref = self.data_manager.save_pixmap_image(pixmap)
+                self.set_preview_image(image_ref)
             else:
                 QMessageBox.warning(self, "Ошибка", "Не удалось загрузить выбранное изображение (QPixmap isNull).")
 
@@ -375,8 +375,8 @@ class ClothesTab(QWidget):
             
         pixmap = QPixmap(file_path)
         if not pixmap.isNull():
-            base64_str = self.data_manager.save_pixmap_image(pixmap)
-            self.set_preview_image(base64_str)
+            image_ref = self.data_manager.save_pixmap_image(pixmap)
+            self.set_preview_image(image_ref)
         else:
             QMessageBox.warning(self, "Ошибка", "Не удалось загрузить перетащенное изображение.\nВозможно, формат не поддерживается.")
 
@@ -571,13 +571,15 @@ class ClothesTab(QWidget):
             img_lbl.setStyleSheet(f"background-color: {img_bg}; border-radius: 5px;")
             img_lbl.setScaledContents(True)
             if item.get("photo_path"):
-                pixmap = self.data_manager.load_pixmap(item["photo_path"], max_size=(200, 200)) # Optimize for thumbnail
-                if not pixmap.isNull():
-                    img_lbl.setPixmap(pixmap)
-                else:
-                    img_lbl.setText("Нет фото")
-                    img_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                    img_lbl.setStyleSheet(f"background-color: {img_bg}; border-radius: 5px; color: {note_color};")
+                # Thumbnail is decoded in the background and set when ready
+                def set_thumbnail(pixmap, img_lbl=img_lbl):
+                    if not pixmap.isNull():
+                        img_lbl.setPixmap(pixmap)
+                    else:
+                        img_lbl.setText("Нет фото")
+                        img_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
+                        img_lbl.setStyleSheet(f"background-color: {img_bg}; border-radius: 5px; color: {note_color};")
+                self.data_manager.load_pixmap_async(item["photo_path"], (200, 200), set_thumbnail)
             else:
                 img_lbl.setText("Нет фото")
                 img_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
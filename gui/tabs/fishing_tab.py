@@ -12,7 +12,7 @@ from PyQt6.QtCore import Qt, QTimer, QSize, QRect, QPoint, pyqtSignal, QProperty
 from PyQt6.QtGui import QColor, QPainter, QAction, QKeySequence, QIcon, QFontMetrics, QBrush, QPen, QMouseEvent, QFont
 from gui.styles import StyleManager
 from gui.animations import AnimationManager
-from gui.tabs.generic_tab import GenericTab
+from gui.tabs.generic_tab import GenericTab, TransactionTableModel
 from gui.widgets.calculator_widget import CalculatorWidget
 
 class ComparisonOverlay(QDialog):
@@ -538,12 +538,12 @@ class FishingFinancialWidget(GenericTab):
         
         # Table styling (High contrast, larger font)
         self.table.setStyleSheet(self.table.styleSheet() + f"""
-            QTableWidget {{
+            QTableView {{
                 font-size: 17px;
                 background-color: {t['bg_main']};
                 gridline-color: {t['border']};
             }}
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: 10px;
                 border-bottom: 1px solid {t['border']};
             }}
@@ -570,43 +570,24 @@ class FishingFinancialWidget(GenericTab):
         self.stat_balance.title_label.setText("Общий баланс")
 
     def refresh_data(self):
-        # Ensure transactions are sorted newest first
-        transactions = self.data_manager.get_transactions(self.category)
-        try:
-            transactions.sort(
-                key=lambda x: (datetime.strptime(x.get("date", "01.01.2000"), "%d.%m.%Y"), x.get("timestamp", 0)), 
-                reverse=True
-            )
-        except:
-            pass
-            
+        # DataManager keeps transactions sorted newest first
         super().refresh_data()
         t = StyleManager.get_theme(self.current_theme)
         if hasattr(self, 'stat_profit') and self.stat_profit.value_label:
             self.stat_profit.value_label.setStyleSheet(f"font-size: 22px; font-weight: bold; color: {t['success']};")
 
+    def transaction_filter(self):
         search_text = self.search_input.text().lower()
-        gear_filter = self.current_gear_filter
-            
-        for row in range(self.table.rowCount()):
-            match_search = not search_text
-            if not match_search:
-                for col in range(self.table.columnCount() - 1):
-                    item = self.table.item(row, col)
-                    if item and search_text in item.text().lower():
-                        match_search = True
-                        break
-            
-            match_gear = gear_filter == "Все Снасти"
-            if not match_gear:
-                item_name_col = 1
-                item = self.table.item(row, item_name_col)
-                if item:
-                    text = item.text().lower()
-                    if gear_filter.lower() in text:
-                        match_gear = True
-            
-            self.table.setRowHidden(row, not (match_search and match_gear))
+        gear_filter = self.current_gear_filter.lower()
+        if not search_text and gear_filter == "все снасти":
+            return None
+        
+        def matches(trans):
+            texts = [TransactionTableModel.display_text(trans, col).lower() for col in range(4)]
+            match_search = not search_text or any(search_text in text for text in texts)
+            match_gear = gear_filter == "все снасти" or gear_filter in texts[1]
+            return match_search and match_gear
+        return matches
 
     def show_item_stats(self):
         from gui.item_stats_dialog import ItemStatsDialog
@@ -1319,10 +1300,14 @@ class FishCard(QFrame):
         # In a real app, we'd load from path. Here we use placeholders or resource paths.
         path = self.fish_data.get("photo_path")
         if path:
-            pix = self.data_manager.load_pixmap(path, (164, 110))
-            if not pix.isNull():
-                self.img_lbl.setPixmap(pix)
-                return
+            self.data_manager.load_pixmap_async(path, (164, 110), self._set_image)
+            return
+        self._set_image(None)
+
+    def _set_image(self, pix):
+        if pix is not None and not pix.isNull():
+            self.img_lbl.setPixmap(pix)
+            return
         self.img_lbl.setText("🖼")
         self.img_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
@@ -1,13 +1,183 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QFrame, QComboBox,
+    QTableView, QStyledItemDelegate, QHeaderView, QAbstractItemView, QFrame, QComboBox,
     QDateEdit, QMessageBox, QFileDialog
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QDate, QTimer
-from PyQt6.QtGui import QColor, QFont
+from PyQt6.QtCore import Qt, pyqtSignal, QDate, QTimer, QAbstractTableModel, QModelIndex, QEvent, QRect
+from PyQt6.QtGui import QColor, QFont, QPainter
 from datetime import datetime, timedelta
 from gui.styles import StyleManager
 
+class TransactionTableModel(QAbstractTableModel):
+    """
+    Transaction history for one category and period.
+    Rows are pulled from DataManager.query_transactions page by page as the view scrolls.
+    """
+    PAGE_SIZE = 200
+    ACTIONS_COLUMN = 4
+
+    def __init__(self, data_manager, category, parent=None):
+        super().__init__(parent)
+        self.data_manager = data_manager
+        self.category = category
+        self._headers = ["Сумма", "Товар/Авто", "Примечание", "Дата", "Действия"]
+        self._rows = []
+        self._period = None
+        self._row_filter = None
+        self._offset = 0
+        self._exhausted = True
+        self._theme = StyleManager.get_theme()
+
+    def set_theme(self, theme):
+        self._theme = theme
+        if self._rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._rows) - 1, 0))
+
+    def set_period(self, period, row_filter=None):
+        """Resets the model to a (start, end) window; None shows nothing. row_filter(t) -> bool narrows rows."""
+        self.beginResetModel()
+        self._rows = []
+        self._period = period
+        self._row_filter = row_filter
+        self._offset = 0
+        self._exhausted = period is None
+        self.endResetModel()
+        self.fetchMore()
+
+    def transaction_at(self, row):
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted: return
+        
+        # With a row filter a page can match nothing, so keep reading until something shows up
+        batch = []
+        while not batch and not self._exhausted:
+            page = self.data_manager.query_transactions(self.category, *self._period, limit=self.PAGE_SIZE, offset=self._offset)
+            self._offset += len(page)
+            self._exhausted = len(page) < self.PAGE_SIZE
+            batch = [t for t in page if self._row_filter(t)] if self._row_filter else page
+        
+        if batch:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(batch) - 1)
+            self._rows.extend(batch)
+            self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self._headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._headers[section]
+        return None
+
+    @staticmethod
+    def display_text(trans, col):
+        if col == 0: return f"${trans['amount']:,.0f}"
+        if col == 1:
+            item_name = trans.get("item_name", "")
+            if trans.get("image_path"):
+                item_name += " 📷"
+            return item_name
+        if col == 2: return trans.get("comment", "")
+        if col == 3: return trans.get("date", "")
+        return ""
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        trans = self._rows[index.row()]
+        col = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.display_text(trans, col)
+        
+        if role == Qt.ItemDataRole.UserRole:
+            return trans["id"]
+            
+        if role == Qt.ItemDataRole.ForegroundRole and col == 0:
+            return QColor(self._theme['success'] if trans['amount'] > 0 else self._theme['danger'])
+            
+        return None
+
+class TransactionActionsDelegate(QStyledItemDelegate):
+    """Paints the edit/delete glyphs of the actions column instead of a widget per row."""
+    edit_requested = pyqtSignal(int)
+    delete_requested = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._theme = StyleManager.get_theme()
+        self._hover = None # (row, 0 = edit / 1 = delete)
+
+    def set_theme(self, theme):
+        self._theme = theme
+
+    @staticmethod
+    def _button_rects(rect):
+        size = min(rect.height() - 10, 32)
+        spacing = 5
+        left = rect.center().x() - size - spacing // 2
+        top = rect.center().y() - size // 2 + 1
+        return QRect(left, top, size, size), QRect(left + size + spacing, top, size, size)
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        font = QFont(option.font)
+        font.setPointSize(14)
+        font.setBold(True)
+        painter.setFont(font)
+        
+        for i, (rect, glyph, color_key) in enumerate(zip(self._button_rects(option.rect), ("✎", "✕"), ("accent", "danger"))):
+            color = QColor(self._theme[color_key])
+            if self._hover == (index.row(), i):
+                hover_bg = QColor(color)
+                hover_bg.setAlpha(0x1A)
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(hover_bg)
+                painter.drawRoundedRect(rect, 4, 4)
+            painter.setPen(color)
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, glyph)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.Type.MouseMove, QEvent.Type.MouseButtonRelease):
+            return False
+        
+        pos = event.position().toPoint()
+        hit = next((i for i, rect in enumerate(self._button_rects(option.rect)) if rect.contains(pos)), None)
+        
+        if event.type() == QEvent.Type.MouseMove:
+            hover = (index.row(), hit) if hit is not None else None
+            if hover != self._hover:
+                self._hover = hover
+                view = self.parent()
+                if view: view.viewport().update()
+            return False
+        
+        if hit is None or event.button() != Qt.MouseButton.LeftButton:
+            return False
+        if hit == 0:
+            self.edit_requested.emit(index.row())
+        else:
+            self.delete_requested.emit(index.data(Qt.ItemDataRole.UserRole))
+        return True
+
+    def clear_hover(self):
+        self._hover = None
+
 class GenericTab(QWidget):
     def __init__(self, data_manager, category, main_window):
         super().__init__()
@@ -126,8 +296,10 @@ class GenericTab(QWidget):
             card.layout().itemAt(0).widget().setStyleSheet(f"color: {card_title}; font-size: 12px;")
 
         # 3. Table
+        self.table_model.set_theme(t)
+        self.actions_delegate.set_theme(t)
         self.table.setStyleSheet(f"""
-            QTableWidget {{
+            QTableView {{
                 background-color: {table_bg};
                 gridline-color: {table_grid};
                 border: none;
@@ -413,10 +585,16 @@ class GenericTab(QWidget):
         return frame
 
     def setup_table(self):
-        self.table = QTableWidget()
+        self.table = QTableView()
         self.table.setFont(QFont("Segoe UI", 12))
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["Сумма", "Товар/Авто", "Примечание", "Дата", "Действия"])
+        self.table_model = TransactionTableModel(self.data_manager, self.category, self)
+        self.table.setModel(self.table_model)
+        
+        self.actions_delegate = TransactionActionsDelegate(self.table)
+        self.actions_delegate.edit_requested.connect(lambda row: self.on_table_double_click(row, 0))
+        self.actions_delegate.delete_requested.connect(self.delete_transaction)
+        self.table.setItemDelegateForColumn(TransactionTableModel.ACTIONS_COLUMN, self.actions_delegate)
+        self.table.setMouseTracking(True)
         
         header = self.table.horizontalHeader()
         header.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
@@ -434,7 +612,7 @@ class GenericTab(QWidget):
         
         # Styles applied in apply_theme
 
-        self.table.cellDoubleClicked.connect(self.on_table_double_click)
+        self.table.doubleClicked.connect(lambda index: self.on_table_double_click(index.row(), index.column()))
         self.layout.addWidget(self.table)
 
     def setup_footer(self):
@@ -509,62 +687,26 @@ class GenericTab(QWidget):
 
         # Filter Logic
         filter_mode = self.filter_combo.currentText()
-        filtered_transactions = []
-        transactions = self.data_manager.get_transactions(self.category)
-        
-        # Ensure transactions are sorted newest first for display
-        try:
-            transactions.sort(
-                key=lambda x: (datetime.strptime(x.get("date", "01.01.2000"), "%d.%m.%Y"), x.get("timestamp", 0)), 
-                reverse=True
-            )
-        except:
-            pass
-
         today = datetime.now().date()
         
-        for t_trans in transactions:
-            t_date = None
-            date_str = t_trans.get("date", "")
-            
-            try:
-                # Try new format first
-                t_date = datetime.strptime(date_str, "%d.%m.%Y").date()
-            except ValueError:
-                try:
-                    # Try old format
-                    t_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                except ValueError:
-                    # Date is missing or invalid
-                    if filter_mode == "За все время":
-                        filtered_transactions.append(t_trans)
-                    continue
-                
-            include = False
-            if filter_mode == "За все время":
-                include = True
-            elif filter_mode == "За сегодня":
-                if t_date == today:
-                    include = True
-            elif filter_mode == "За неделю":
-                start_week = today - timedelta(days=today.weekday())
-                if start_week <= t_date <= today:
-                    include = True
-            elif filter_mode == "За месяц":
-                if t_date.year == today.year and t_date.month == today.month:
-                    include = True
-            elif filter_mode == "Выбрать период":
-                start_date = self.date_start.date().toPyDate()
-                end_date = self.date_end.date().toPyDate()
-                if start_date <= t_date <= end_date:
-                    include = True
-            
-            if include:
-                filtered_transactions.append(t_trans)
-
+        # DataManager keeps transactions sorted by date, so a period is a binary-searched window
+        # ("За все время" is unbounded and also includes rows with missing or invalid dates)
+        period = None
+        if filter_mode == "За все время":
+            period = (None, None)
+        elif filter_mode == "За сегодня":
+            period = (today, today)
+        elif filter_mode == "За неделю":
+            period = (today - timedelta(days=today.weekday()), today)
+        elif filter_mode == "За месяц":
+            month_start = today.replace(day=1)
+            next_month = (month_start + timedelta(days=32)).replace(day=1)
+            period = (month_start, next_month - timedelta(days=1))
+        elif filter_mode == "Выбрать период":
+            period = (self.date_start.date().toPyDate(), self.date_end.date().toPyDate())
+        
         # Calculate Filtered Stats
-        income = sum(t_trans["amount"] for t_trans in filtered_transactions if t_trans["amount"] > 0)
-        expenses = sum(abs(t_trans["amount"]) for t_trans in filtered_transactions if t_trans["amount"] < 0)
+        income, expenses = self.data_manager.sum_range(self.category, *period) if period else (0, 0)
         profit = income - expenses
         
         self.stat_income.value_label.setText(f"+${income:,.0f}")
@@ -575,88 +717,13 @@ class GenericTab(QWidget):
         self.stat_profit.value_label.setText(f"{profit_sign}${profit:,.0f}")
         self.stat_profit.value_label.setStyleSheet(f"color: {profit_color}; font-size: 18px; font-weight: bold; margin-top: 5px;")
 
-        # Update Table
-        self.table.setRowCount(len(filtered_transactions))
-        for row, t_trans in enumerate(filtered_transactions):
-            amount_item = QTableWidgetItem(f"${t_trans['amount']:,.0f}")
-            # Store ID for editing
-            amount_item.setData(Qt.ItemDataRole.UserRole, t_trans["id"])
-            
-            if t_trans['amount'] > 0:
-                amount_item.setForeground(QColor(t['success']))
-            else:
-                amount_item.setForeground(QColor(t['danger']))
-            
-            self.table.setItem(row, 0, amount_item)
-            item_name = t_trans.get("item_name", "")
-            if t_trans.get("image_path"):
-                item_name += " 📷"
-            self.table.setItem(row, 1, QTableWidgetItem(item_name))
-            self.table.setItem(row, 2, QTableWidgetItem(t_trans.get("comment", "")))
-            self.table.setItem(row, 3, QTableWidgetItem(t_trans.get("date", "")))
-            
-            # Edit Button
-            edit_btn = QPushButton("✎")
-            edit_btn.setToolTip("Редактировать")
-            edit_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            edit_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: transparent;
-                    color: {t['accent']};
-                    border: none;
-                    font-size: 18px;
-                    padding: 4px;
-                    border-radius: 4px;
-                    font-weight: bold;
-                }}
-                QPushButton:hover {{
-                    background-color: {t['accent']}1A;
-                    color: {t['accent']};
-                }}
-                QPushButton:pressed {{
-                    background-color: {t['accent']}33;
-                    color: {t['accent']};
-                }}
-            """)
-            edit_btn.clicked.connect(lambda checked, r=row: self.on_table_double_click(r, 0))
-
-            # Delete Button
-            del_btn = QPushButton("✕")
-            del_btn.setToolTip("Удалить")
-            del_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            del_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: transparent;
-                    color: {t['danger']};
-                    border: none;
-                    font-size: 18px;
-                    padding: 4px;
-                    border-radius: 4px;
-                    font-weight: bold;
-                }}
-                QPushButton:hover {{
-                    background-color: {t['danger']}1A;
-                    color: {t['danger']};
-                }}
-                QPushButton:pressed {{
-                    background-color: {t['danger']}33;
-                    color: {t['danger']};
-                }}
-            """)
-            del_btn.clicked.connect(lambda checked, tid=t_trans["id"]: self.delete_transaction(tid))
-            
-            # Ensure background consistency for the cell
-            self.table.setItem(row, 4, QTableWidgetItem(""))
-            
-            cell_widget = QWidget()
-            cell_widget.setStyleSheet("background-color: transparent;")
-            layout = QHBoxLayout(cell_widget)
-            layout.setContentsMargins(0, 0, 0, 0)
-            layout.setSpacing(5)
-            layout.addWidget(edit_btn)
-            layout.addWidget(del_btn)
-            layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setCellWidget(row, 4, cell_widget)
+        # Update Table (the model loads rows page by page as the view scrolls)
+        self.actions_delegate.clear_hover()
+        self.table_model.set_period(period, self.transaction_filter())
+
+    def transaction_filter(self):
+        """Optional predicate for rows shown in the table; None shows the whole period."""
+        return None
 
     def delete_transaction(self, transaction_id):
         if self.data_manager.delete_transaction(self.category, transaction_id):
@@ -677,16 +744,8 @@ class GenericTab(QWidget):
             QMessageBox.critical(self, "Ошибка", error_msg)
 
     def on_table_double_click(self, row, column):
-        # Get transaction ID from the first column item
-        item = self.table.item(row, 0)
-        if not item: return
-        
-        transaction_id = item.data(Qt.ItemDataRole.UserRole)
-        if not transaction_id: return
-        
-        # Find transaction data
-        transactions = self.data_manager.get_transactions(self.category)
-        transaction = next((t for t in transactions if t["id"] == transaction_id), None)
+        if column == TransactionTableModel.ACTIONS_COLUMN: return
+        transaction = self.table_model.transaction_at(row)
         
         if transaction:
             from gui.transaction_dialog import TransactionDialog
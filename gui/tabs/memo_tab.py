@@ -480,11 +480,10 @@ class MemoSection(QFrame):
             photo_item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
             
             if image_path:
-                pix = self.data_manager.load_pixmap(image_path)
+                # Icon-sized thumbnail (served from the thumbnail cache, not the full photo)
+                icon_pix = self.data_manager.load_pixmap(image_path, (50, 50))
                 
-                if not pix.isNull():
-                    # Scale to icon size
-                    icon_pix = pix.scaled(50, 50, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+                if not icon_pix.isNull():
                     photo_item.setData(Qt.ItemDataRole.DecorationRole, icon_pix)
                     photo_item.setToolTip("Нажмите для просмотра")
                         
@@ -1102,7 +1101,7 @@ class MemoEditDialog(StyledDialogBase):
             pixmap = QPixmap(mime_data.imageData())
             if not pixmap.isNull():
                 dm = self.parent_tab.data_manager
-                self.image_path = dm.save_image_to_base64(pixmap)
+                self.image_path = dm.save_image_to_store(pixmap)
                 self.load_preview()
                 return
 
@@ -1114,7 +1113,7 @@ class MemoEditDialog(StyledDialogBase):
                         pixmap = QPixmap(file_path)
                         if not pixmap.isNull():
                             dm = self.parent_tab.data_manager
-                            self.image_path = dm.save_image_to_base64(pixmap)
+                            self.image_path = dm.save_image_to_store(pixmap)
                             self.load_preview()
                         return
 
@@ -1137,12 +1136,12 @@ class MemoEditDialog(StyledDialogBase):
         # Process image
         final_image_path = self.image_path
         
-        # If it's a local file path (not base64 and not relative in appdata), convert to base64
+        # If it's a local file path (not a stored image and not relative in appdata), store it
         if final_image_path and not final_image_path.startswith("data:image") and os.path.isabs(final_image_path):
-             # Convert to base64
+             # Copy into the image store
              dm = self.parent_tab.data_manager
              pix = QPixmap(final_image_path)
              if not pix.isNull():
-                 final_image_path = dm.save_image_to_base64(pix)
+                 final_image_path = dm.save_image_to_store(pix)
         
         return values, final_image_path
\ No newline at end of file
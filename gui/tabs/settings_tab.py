@@ -2281,7 +2281,7 @@ class SettingsTab(QWidget):
                 raise PermissionError("Нет прав на запись в выбранную папку.")
 
             with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(profile, f, indent=4, ensure_ascii=False)
+                json.dump(self.data_manager.get_portable_profile(profile), f, indent=4, ensure_ascii=False)
             QMessageBox.information(self, "Успех", "Профиль успешно экспортирован.")
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить файл:\n{str(e)}")
@@ -2309,6 +2309,9 @@ class SettingsTab(QWidget):
             if not isinstance(data, dict) or not all(key in data for key in required_keys):
                 raise ValueError("Некорректный формат файла профиля. Отсутствуют обязательные поля (id, name).")
 
+            # Exported images arrive inline; keep only references in data.json
+            self.data_manager.image_store.extract_inline(data)
+
             # Check for duplicate ID
             profiles = self.data_manager.get_all_profiles()
             existing = next((p for p in profiles if p["id"] == data["id"]), None)
@@ -67,6 +67,13 @@ class CustomTitleBar(QWidget):
         self.chat_btn.setVisible(False) # Hidden by default
         self.layout.addWidget(self.chat_btn)
 
+        # Deferred data migrations (shown by MainWindow while they run)
+        self.migration_label = QLabel("")
+        self.migration_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.migration_label.setStyleSheet("color: #95a5a6; margin-right: 10px;")
+        self.migration_label.setVisible(False)
+        self.layout.addWidget(self.migration_label)
+
         # Active Profile Label
         self.active_profile_label = QLabel("")
         self.active_profile_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -7,7 +7,6 @@ import subprocess
 import shutil
 import glob
 import time
-import psutil
 import gc
 from datetime import datetime
 from PyQt6.QtWidgets import (
@@ -16,6 +15,8 @@ from PyQt6.QtWidgets import (
     QComboBox
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QThread
+from import_profiler import lazy_module
+psutil = lazy_module("psutil") # Loaded on first use, keeps it off the startup path
 
 # --- WinAPI Helpers for Memory Cleaning (Windows Only) ---
 kernel32 = None
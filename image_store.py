@@ -0,0 +1,128 @@
+import os
+import shutil
+import base64
+import hashlib
+import logging
+import binascii
+
+# Records store images as "sha256:<hex digest>" instead of inline Base64
+REF_PREFIX = "sha256:"
+DATA_URI_PREFIX = "data:image"
+
+
+def is_ref(value):
+    return isinstance(value, str) and value.startswith(REF_PREFIX)
+
+
+def is_data_uri(value):
+    return isinstance(value, str) and value.startswith(DATA_URI_PREFIX)
+
+
+class ImageStore:
+    """
+    Content-addressed image files under <data dir>/blobs.
+
+    An image is stored once as blobs/<first 2 hex chars>/<sha256>.png, so the same
+    picture attached to several records is kept a single time.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, ref):
+        """File path for a reference (the file may not exist)."""
+        digest = ref[len(REF_PREFIX):]
+        return os.path.join(self.root, digest[:2], f"{digest}.png")
+
+    def exists(self, ref):
+        return os.path.exists(self.path(ref))
+
+    def put(self, data):
+        """Stores image bytes and returns their reference."""
+        ref = REF_PREFIX + hashlib.sha256(data).hexdigest()
+        target = self.path(ref)
+        if os.path.exists(target):
+            return ref
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temp_file = f"{target}.{os.getpid()}.tmp"
+        with open(temp_file, "wb") as f:
+            f.write(data)
+        os.replace(temp_file, target)
+        return ref
+
+    def get(self, ref):
+        """Image bytes for a reference, or None when missing."""
+        try:
+            with open(self.path(ref), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put_data_uri(self, uri):
+        """Stores a "data:image/...;base64," string; returns the reference or None if it is malformed."""
+        try:
+            _, payload = uri.split(",", 1)
+            return self.put(base64.b64decode(payload))
+        except (ValueError, binascii.Error) as e:
+            logging.warning(f"Skipping malformed inline image: {e}")
+            return None
+
+    def to_data_uri(self, ref):
+        """Inline form of a reference (for exports that must be self-contained)."""
+        data = self.get(ref)
+        if data is None:
+            return None
+        return "data:image/png;base64," + base64.b64encode(data).decode()
+
+    def copy_to(self, root):
+        """
+        Copies the blobs missing under another root there (e.g. a backup folder), as hard
+        links where the file system allows; blobs never change once written. Returns the count.
+        """
+        copied = 0
+        if not os.path.isdir(self.root):
+            return 0
+        for prefix in os.listdir(self.root):
+            source_dir = os.path.join(self.root, prefix)
+            if not os.path.isdir(source_dir):
+                continue
+            target_dir = os.path.join(root, prefix)
+            for name in os.listdir(source_dir):
+                if not name.endswith(".png"):
+                    continue
+                target = os.path.join(target_dir, name)
+                if os.path.exists(target):
+                    continue
+                os.makedirs(target_dir, exist_ok=True)
+                try:
+                    os.link(os.path.join(source_dir, name), target)
+                except OSError:
+                    shutil.copy2(os.path.join(source_dir, name), target)
+                copied += 1
+        return copied
+
+    # --- Bulk conversion ---
+
+    def extract_inline(self, node):
+        """Replaces inline Base64 images anywhere in node with references, in place. Returns the count."""
+        count = 0
+        items = node.items() if isinstance(node, dict) else enumerate(node) if isinstance(node, list) else ()
+        for key, value in list(items):
+            if is_data_uri(value):
+                ref = self.put_data_uri(value)
+                if ref:
+                    node[key] = ref
+                    count += 1
+            elif isinstance(value, (dict, list)):
+                count += self.extract_inline(value)
+        return count
+
+    def inline_refs(self, node):
+        """Deep copy of node with references replaced by Base64 data URIs (missing blobs are kept as is)."""
+        if isinstance(node, dict):
+            return {key: self.inline_refs(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [self.inline_refs(value) for value in node]
+        if is_ref(node):
+            return self.to_data_uri(node) or node
+        return node
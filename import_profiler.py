@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+import builtins
+import logging
+import importlib.util
+
+# Start with `--profile-imports` or PROFILE_IMPORTS=1 to log per-module import cost
+PROFILE_FLAG = "--profile-imports"
+PROFILE_ENV = "PROFILE_IMPORTS"
+
+
+def enabled(argv=None):
+    argv = sys.argv if argv is None else argv
+    return PROFILE_FLAG in argv or bool(os.environ.get(PROFILE_ENV))
+
+
+def lazy_module(name):
+    """
+    Returns module `name`, executing it only on first attribute access.
+    Modules that are already imported are returned as is.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class ImportProfiler:
+    """
+    Records the first-import cost of every module, like `python -X importtime`.
+    Self time excludes nested imports; cumulative time includes them.
+    """
+
+    def __init__(self):
+        self.records = [] # (module name, self seconds, cumulative seconds, depth)
+        self._stack = []
+        self._original_import = None
+        self._reported = 0
+
+    def start(self):
+        if self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+
+    def stop(self):
+        if self._original_import is None:
+            return
+        builtins.__import__ = self._original_import
+        self._original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        # Relative and already imported modules cost nothing worth recording
+        if level or name in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0) # time spent in nested imports
+        started = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.records.append((name, elapsed - nested, elapsed, len(self._stack)))
+
+    @staticmethod
+    def total(records):
+        return sum(cumulative for _, _, cumulative, depth in records if depth == 0)
+
+    @staticmethod
+    def top(records, count=25):
+        return sorted(records, key=lambda r: r[1], reverse=True)[:count]
+
+    def report(self, count=25):
+        """Logs the most expensive imports since the previous report; returns their total in seconds."""
+        records = self.records[self._reported:]
+        self._reported = len(self.records)
+        total = self.total(records)
+        logging.info(f"Import profile: {len(records)} modules, {total * 1000:.1f} ms total")
+        logging.info("import time:   self [us] | cumulative | imported package")
+        for name, self_time, cumulative, depth in self.top(records, count):
+            logging.info(f"import time: {self_time * 1e6:>10.0f} | {cumulative * 1e6:>10.0f} | {'  ' * depth}{name}")
+        return total
+
+
+profiler = ImportProfiler()
@@ -0,0 +1,63 @@
+import json
+import hashlib
+
+# Fastest available JSON library: orjson, then msgspec, then the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+elif msgspec is not None:
+    BACKEND = "msgspec"
+else:
+    BACKEND = "json"
+
+# Raised by loads() for malformed input, whatever the backend
+DecodeError = (ValueError, msgspec.DecodeError) if msgspec is not None else ValueError
+
+
+def dumps(obj):
+    """Compact UTF-8 encoded JSON bytes (non-ASCII characters are kept as is)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers wider than 64 bits: let the standard library handle them
+            pass
+    elif msgspec is not None:
+        try:
+            return msgspec.json.encode(obj)
+        except (TypeError, OverflowError):
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(raw):
+    """Parses JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    if msgspec is not None:
+        return msgspec.json.decode(raw)
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        raw = bytes(raw).decode("utf-8-sig")
+    return json.loads(raw)
+
+
+def load_file(path):
+    """Returns (data, raw_bytes) of a JSON file."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    # Files written by other tools may start with a UTF-8 BOM
+    return loads(raw[3:] if raw.startswith(b"\xef\xbb\xbf") else raw), raw
+
+
+def digest(raw):
+    """SHA-256 of already serialized bytes, used to detect external file changes."""
+    return hashlib.sha256(raw).hexdigest()
@@ -7,11 +7,15 @@ import threading
 import logging
 import traceback
 
+import import_profiler
+if import_profiler.enabled():
+    import_profiler.profiler.start()
+
 from PyQt6.QtWidgets import QApplication, QSystemTrayIcon, QMenu
 from PyQt6.QtGui import QIcon, QAction
 from PyQt6.QtCore import Qt
 
-from gui.main_window import MainWindow
+# gui.main_window (every tab, SQLAlchemy, plugins) is imported after login
 from auth.login_window import LoginWindow
 from gui.styles import StyleManager
 from data_manager import DataManager
@@ -43,7 +47,7 @@ def request_admin():
 
 def setup_logging():
     # Production Logging: Only errors and critical info
-    log_level = logging.ERROR if not os.environ.get('DEBUG_MODE') else logging.INFO
+    log_level = logging.ERROR if not (os.environ.get('DEBUG_MODE') or import_profiler.enabled()) else logging.INFO
     
     app_data = os.getenv('LOCALAPPDATA') or os.path.expanduser('~')
     log_dir = os.path.join(app_data, "MoneyTracker", "logs")
@@ -113,6 +117,9 @@ def main():
     # Setup logging early for debugging
     setup_logging()
     cleanup_update_files()
+    
+    if import_profiler.enabled():
+        import_profiler.profiler.report()
 
     # Set App User Model ID (Windows taskbar icon fix)
     try:
@@ -129,7 +136,7 @@ def main():
     # DATA MANAGER (Initialize early for startup checks)
     # -------------------------------
     try:
-        data_manager = DataManager()
+        data_manager = DataManager(journaled=True, defer_migrations=True)
         logging.info("DataManager initialized early for startup checks")
     except Exception as e:
         logging.error(f"DataManager early initialization error: {e}")
@@ -281,7 +288,7 @@ def main():
     # -------------------------------
     if not data_manager:
         try:
-            data_manager = DataManager()
+            data_manager = DataManager(journaled=True, defer_migrations=True)
             logging.info("DataManager initialized (fallback)")
         except Exception as e:
             logging.error(f"DataManager fallback initialization error: {e}")
@@ -315,6 +322,11 @@ def main():
         # -------------------------------
         logging.info("Login successful, initializing main window...")
         try:
+            from gui.main_window import MainWindow
+            if import_profiler.enabled():
+                import_profiler.profiler.stop()
+                import_profiler.profiler.report()
+            
             # MAIN WINDOW
             window = MainWindow(
                 auth_manager=auth_window.auth_manager,
@@ -0,0 +1,117 @@
+import os
+import mmap
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+import json_codec
+
+# Profile fields kept in the data.json index; everything else lives in the profile's segment
+HEADER_KEYS = ("id", "name", "created_at", "starting_amount")
+STUB_MARKER = "_segment"
+
+
+def is_stub(profile):
+    return profile.get(STUB_MARKER) is True
+
+
+def header(profile):
+    return {key: profile[key] for key in HEADER_KEYS if key in profile}
+
+
+def stub(profile):
+    """Index entry standing in for a profile whose records are in its segment."""
+    entry = header(profile)
+    entry[STUB_MARKER] = True
+    return entry
+
+
+class ProfileSegments:
+    """
+    One JSON file per profile under root, plus the ids of the most recently used profiles.
+
+    data.json keeps only a stub per profile (see HEADER_KEYS); the header in the index is
+    authoritative. Segments are parsed straight from a read-only memory map. touch() keeps
+    an LRU of loaded profiles and returns the ids that fell out of it.
+    """
+
+    def __init__(self, root, max_loaded=3):
+        self.root = root
+        self.max_loaded = max_loaded
+        self._recent = OrderedDict()
+        self._digests = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, profile_id):
+        return os.path.join(self.root, f"{profile_id}.json")
+
+    def exists(self, profile_id):
+        return os.path.exists(self.path(profile_id))
+
+    def read(self, profile_id):
+        """Returns (profile, applied migration ids) from the profile's segment."""
+        with open(self.path(profile_id), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError(f"Empty profile segment {profile_id}")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                # orjson/msgspec parse the mapping in place; the stdlib parser needs bytes
+                raw = view[:] if json_codec.BACKEND == "json" else memoryview(view)
+                try:
+                    document = json_codec.loads(raw)
+                finally:
+                    if isinstance(raw, memoryview):
+                        raw.release()
+                # Same bytes write() would produce for an unchanged profile
+                self._digests[profile_id] = hashlib.sha256(view).hexdigest()
+        return document["profile"], document.get("migrations", [])
+
+    def write(self, profile, migrations):
+        """Atomically writes a loaded profile; unchanged content is not rewritten. Returns True if written."""
+        profile_id = profile["id"]
+        payload = json_codec.dumps({"migrations": list(migrations), "profile": profile})
+        digest = hashlib.sha256(payload).hexdigest()
+        if self._digests.get(profile_id) == digest and self.exists(profile_id):
+            return False
+        target = self.path(profile_id)
+        temp_file = f"{target}.{threading.get_ident()}.tmp"
+        with open(temp_file, "wb") as f:
+            f.write(payload)
+        os.replace(temp_file, target)
+        self._digests[profile_id] = digest
+        return True
+
+    def delete(self, profile_id):
+        self.forget(profile_id)
+        self._digests.pop(profile_id, None)
+        try:
+            os.remove(self.path(profile_id))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning(f"Could not delete profile segment {profile_id}: {e}")
+
+    def touch(self, profile_id):
+        """Marks a profile as just used; returns ids of loaded profiles to evict."""
+        with self._lock:
+            self._recent.pop(profile_id, None)
+            self._recent[profile_id] = True
+            evicted = []
+            while len(self._recent) > self.max_loaded:
+                evicted_id, _ = self._recent.popitem(last=False)
+                evicted.append(evicted_id)
+            return evicted
+
+    def reset(self):
+        """Forgets which profiles are loaded and what was written (the index was replaced)."""
+        with self._lock:
+            self._recent.clear()
+        self._digests.clear()
+
+    def forget(self, profile_id):
+        with self._lock:
+            self._recent.pop(profile_id, None)
+
+    def loaded_ids(self):
+        with self._lock:
+            return list(self._recent)
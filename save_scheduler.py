@@ -0,0 +1,160 @@
+import time
+import logging
+import threading
+import atexit
+
+
+class SaveScheduler:
+    """
+    Coalesces save requests into as few full writes as possible.
+
+    request() only marks the data dirty. A single persistent writer thread waits
+    until no new request arrived for `delay` seconds (but never longer than
+    `max_delay` after the first one) and then calls save_fn once for the whole
+    burst. flush() writes synchronously if anything is pending.
+    """
+
+    def __init__(self, save_fn, delay=0.3, max_delay=2.0, name="DataSaveWriter"):
+        self.save_fn = save_fn
+        self.delay = delay
+        self.max_delay = max_delay
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._stopped = False
+        self._atexit_registered = False
+
+        self._pending = 0
+        # Requests ever made; lets a write that succeeded forget only those it covered
+        self._requests = 0
+        self._first_request = 0.0
+        self._last_request = 0.0
+
+        self.writes = 0
+        self.coalesced = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self._total_latency = 0.0
+
+    # --- Scheduling ---
+
+    def request(self):
+        """Marks data dirty; the writer saves once the burst settles."""
+        with self._lock:
+            now = time.monotonic()
+            if not self._pending:
+                self._first_request = now
+            self._pending += 1
+            self._requests += 1
+            self._last_request = now
+            self._ensure_writer()
+        self._wakeup.set()
+
+    def _ensure_writer(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._writer_loop, name=self.name, daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self._flush_at_exit)
+                self._atexit_registered = True
+
+    def _due_in(self):
+        """Seconds until the pending burst should be written (None when idle)."""
+        with self._lock:
+            if not self._pending:
+                return None
+            due = min(self._last_request + self.delay, self._first_request + self.max_delay)
+            return max(0.0, due - time.monotonic())
+
+    def _writer_loop(self):
+        while not self._stopped:
+            wait = self._due_in()
+            if wait is None:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            if wait > 0:
+                # A new request restarts the debounce window
+                self._wakeup.wait(wait)
+                self._wakeup.clear()
+                continue
+            try:
+                self.flush()
+            except Exception as e:
+                logging.error(f"Scheduled save failed: {e}")
+                # The request stays pending; retry after a pause instead of spinning on a failing disk
+                self._wakeup.wait(self.max_delay)
+                self._wakeup.clear()
+
+    def flush(self):
+        """Writes now if a save is pending. Returns True when a write happened."""
+        with self._write_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = 0
+            if not pending:
+                return False
+
+            started = time.perf_counter()
+            try:
+                self.save_fn()
+            except Exception:
+                # Keep the data dirty so the next flush retries
+                with self._lock:
+                    if not self._pending:
+                        self._first_request = time.monotonic()
+                    self._pending += pending
+                raise
+            latency = time.perf_counter() - started
+
+            with self._lock:
+                self.writes += 1
+                self.coalesced += pending - 1
+                self.last_latency = latency
+                self.max_latency = max(self.max_latency, latency)
+                self._total_latency += latency
+            return True
+
+    def mark(self):
+        """Position in the request stream; pass it to discard_pending once a write covering it succeeded."""
+        with self._lock:
+            return self._requests
+
+    def discard_pending(self, mark=None):
+        """Forgets pending requests made before mark (all of them without one); for a full write that covered them."""
+        with self._lock:
+            self._pending = 0 if mark is None else min(self._pending, self._requests - mark)
+
+    def _flush_at_exit(self):
+        # Raising here would only print a traceback at interpreter exit
+        try:
+            self.flush()
+        except OSError as e:
+            logging.error(f"Save at exit failed: {e}")
+
+    def stop(self):
+        """Writes anything pending and stops the writer thread."""
+        self._stopped = True
+        self._wakeup.set()
+        if self._atexit_registered:
+            atexit.unregister(self._flush_at_exit)
+            self._atexit_registered = False
+        self.flush()
+
+    # --- Metrics ---
+
+    def stats(self):
+        """Queue depth (requests not yet written) and write latency figures in seconds."""
+        with self._lock:
+            return {
+                "queue_depth": self._pending,
+                "writes": self.writes,
+                "coalesced": self.coalesced,
+                "last_latency": self.last_latency,
+                "max_latency": self.max_latency,
+                "avg_latency": self._total_latency / self.writes if self.writes else 0.0,
+            }
@@ -0,0 +1,413 @@
+import json
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from utils import Money, parse_date_ordinal
+
+TRANSACTION_CATEGORIES = ["car_rental", "mining", "farm_bp", "fishing"]
+TRADE_CATEGORIES = ["clothes", "clothes_new", "cars_trade"]
+# Profile-level "transactions" list (anything that is not a known category)
+ROOT_CATEGORY = ""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger (
+    id TEXT PRIMARY KEY,
+    profile_id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    date_ord INTEGER NOT NULL,
+    ts REAL NOT NULL DEFAULT 0,
+    amount_minor INTEGER NOT NULL DEFAULT 0,
+    ad_cost_minor INTEGER NOT NULL DEFAULT 0,
+    parent_id TEXT,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ledger_order ON ledger(profile_id, category, date_ord DESC, ts DESC);
+CREATE INDEX IF NOT EXISTS idx_ledger_parent ON ledger(parent_id);
+
+CREATE TABLE IF NOT EXISTS trade_items (
+    id TEXT PRIMARY KEY,
+    profile_id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    sold INTEGER NOT NULL DEFAULT 0,
+    sort_ts REAL NOT NULL DEFAULT 0,
+    buy_minor INTEGER NOT NULL DEFAULT 0,
+    coa_minor INTEGER NOT NULL DEFAULT 0,
+    sell_minor INTEGER NOT NULL DEFAULT 0,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_trade_order ON trade_items(profile_id, category, sold, sort_ts DESC);
+"""
+
+
+def _date_ord(date_str):
+    return parse_date_ordinal(date_str) if isinstance(date_str, str) else 0
+
+
+def _trade_ts(date_str):
+    try:
+        return datetime.strptime(date_str, "%d.%m.%Y %H:%M:%S").timestamp()
+    except (ValueError, TypeError):
+        return datetime(2000, 1, 1).timestamp()
+
+
+def _minor(value):
+    return Money.to_minor(value or 0)
+
+
+class SQLiteStorage:
+    """
+    SQLite storage engine for the bulk collections of a profile:
+    category transactions and trade inventory/sold history.
+
+    DataManager delegates its transaction and trade methods here when it is
+    created with storage="sqlite". Rows keep the original record as JSON in
+    `doc`, plus indexed columns for ordering and aggregation.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    @staticmethod
+    def category_key(category):
+        return category if category in TRANSACTION_CATEGORIES else ROOT_CATEGORY
+
+    # --- Migration ---
+
+    def migrate_from_json(self, data, replace=True):
+        """
+        One-shot migration of JSON profiles into SQLite.
+        Moves transactions and trade lists out of `data` (they are removed from the dicts).
+        With replace=False rows whose id is already stored are skipped instead of overwritten.
+        Returns the number of records written.
+        """
+        moved = 0
+        with self._lock, self.conn:
+            for profile in data.get("profiles", []):
+                pid = profile["id"]
+                for cat in TRANSACTION_CATEGORIES:
+                    section = profile.get(cat)
+                    if isinstance(section, dict) and section.get("transactions"):
+                        moved += self._insert_ledger_rows(pid, cat, section["transactions"], replace)
+                        section["transactions"] = []
+                if profile.get("transactions"):
+                    moved += self._insert_ledger_rows(pid, ROOT_CATEGORY, profile["transactions"], replace)
+                    profile["transactions"] = []
+                for cat in TRADE_CATEGORIES:
+                    section = profile.get(cat)
+                    if not isinstance(section, dict):
+                        continue
+                    for list_key, sold in (("inventory", False), ("sold_history", True)):
+                        items = section.get(list_key)
+                        if items:
+                            for item in items:
+                                if "id" in item:
+                                    moved += self._upsert_trade(pid, cat, item, sold, replace)
+                            section[list_key] = []
+        if moved:
+            logging.info(f"Migrated {moved} records from JSON into {self.db_path}")
+        return moved
+
+    def export_to_json(self, profile):
+        """
+        Reverse of migrate_from_json for one profile: appends its stored records to the
+        profile's lists (skipping ids already there). Returns the number of records added.
+        """
+        added = 0
+        pid = profile["id"]
+        lists = [(profile.setdefault(cat, {}), "transactions", self.get_transactions(pid, cat)) for cat in TRANSACTION_CATEGORIES]
+        lists.append((profile, "transactions", self.get_transactions(pid, ROOT_CATEGORY)))
+        for cat in TRADE_CATEGORIES:
+            section = profile.setdefault(cat, {})
+            lists.append((section, "inventory", self.get_trade_items(pid, cat, sold=False)))
+            lists.append((section, "sold_history", self.get_trade_items(pid, cat, sold=True)))
+        for owner, key, rows in lists:
+            if not rows:
+                continue
+            target = owner.setdefault(key, [])
+            existing = {item.get("id") for item in target if isinstance(item, dict)}
+            new_rows = [row for row in rows if row.get("id") not in existing]
+            target.extend(new_rows)
+            added += len(new_rows)
+        return added
+
+    def clear(self):
+        """Deletes every stored record."""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM ledger")
+            self.conn.execute("DELETE FROM trade_items")
+
+    # --- Backup ---
+
+    def backup_to(self, path):
+        """Writes a consistent copy of the database to path (SQLite online backup)."""
+        with self._lock:
+            target = sqlite3.connect(path)
+            try:
+                self.conn.backup(target)
+            finally:
+                target.close()
+
+    def restore_from(self, path):
+        """Replaces the database content with the copy at path (made by backup_to)."""
+        with self._lock:
+            source = sqlite3.connect(path)
+            try:
+                source.backup(self.conn)
+            finally:
+                source.close()
+            self.conn.executescript(_SCHEMA)
+            self.conn.commit()
+
+    def extract_inline_images(self, image_store):
+        """Moves Base64 images still embedded in stored records into image_store. Returns the count."""
+        moved = 0
+        with self._lock, self.conn:
+            for table in ("ledger", "trade_items"):
+                rows = self.conn.execute(f"SELECT id, doc FROM {table} WHERE doc LIKE '%\"data:image%'").fetchall()
+                for row_id, doc in rows:
+                    record = json.loads(doc)
+                    count = image_store.extract_inline(record)
+                    if count:
+                        self.conn.execute(f"UPDATE {table} SET doc = ? WHERE id = ?", (json.dumps(record, ensure_ascii=False), row_id))
+                        moved += count
+        if moved:
+            logging.info(f"Moved {moved} inline images from {self.db_path} into {image_store.root}")
+        return moved
+
+    def _insert_ledger_rows(self, profile_id, category, transactions, replace=True):
+        count = 0
+        for t in transactions:
+            if "id" in t:
+                count += self._upsert_ledger(profile_id, category, t, replace)
+        return count
+
+    def delete_profile(self, profile_id):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM ledger WHERE profile_id = ?", (profile_id,))
+            self.conn.execute("DELETE FROM trade_items WHERE profile_id = ?", (profile_id,))
+
+    def hydrate_profile(self, profile):
+        """Returns a copy of the profile with its lists filled back from SQLite (for export)."""
+        full = json.loads(json.dumps(profile))
+        pid = profile["id"]
+        for cat in TRANSACTION_CATEGORIES:
+            full.setdefault(cat, {})["transactions"] = self.get_transactions(pid, cat)
+        full["transactions"] = self.get_transactions(pid, ROOT_CATEGORY)
+        for cat in TRADE_CATEGORIES:
+            section = full.setdefault(cat, {})
+            section["inventory"] = self.get_trade_items(pid, cat, sold=False)
+            section["sold_history"] = self.get_trade_items(pid, cat, sold=True)
+        return full
+
+    # --- Transactions ---
+
+    def _upsert_ledger(self, profile_id, category, t, replace=True):
+        """Writes one ledger row; returns 1, or 0 when replace is off and the id is taken."""
+        cur = self.conn.execute(
+            f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO ledger (id, profile_id, category, date_ord, ts, amount_minor, ad_cost_minor, parent_id, doc) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                t["id"], profile_id, self.category_key(category),
+                _date_ord(t.get("date")), t.get("timestamp", 0) or 0,
+                _minor(t.get("amount")), _minor(t.get("ad_cost")),
+                t.get("parent_id"), json.dumps(t, ensure_ascii=False)
+            )
+        )
+        return cur.rowcount
+
+    def add_transactions(self, profile_id, category, transactions):
+        with self._lock, self.conn:
+            for t in transactions:
+                self._upsert_ledger(profile_id, category, t)
+
+    def get_transactions(self, profile_id, category):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT doc FROM ledger WHERE profile_id = ? AND category = ? ORDER BY date_ord DESC, ts DESC, rowid",
+                (profile_id, self.category_key(category))
+            ).fetchall()
+        return [json.loads(doc) for (doc,) in rows]
+
+    def _window(self, profile_id, category, start_ord, end_ord):
+        """WHERE clause and params for a ledger date window (None = unbounded)."""
+        clause = "profile_id = ? AND category = ?"
+        params = [profile_id, self.category_key(category)]
+        if start_ord is not None:
+            # Bounded windows skip rows with unparsable dates (date_ord = 0)
+            clause += " AND date_ord >= ?"
+            params.append(max(start_ord, 1))
+        if end_ord is not None:
+            clause += " AND date_ord <= ? AND date_ord > 0"
+            params.append(end_ord)
+        return clause, params
+
+    def query_transactions(self, profile_id, category, start_ord=None, end_ord=None, limit=None, offset=0):
+        clause, params = self._window(profile_id, category, start_ord, end_ord)
+        sql = f"SELECT doc FROM ledger WHERE {clause} ORDER BY date_ord DESC, ts DESC, rowid"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params += [-1 if limit is None else limit, offset]
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [json.loads(doc) for (doc,) in rows]
+
+    def ledger_columns(self, profile_id, category):
+        """(date_ord, amount_minor, ad_cost_minor) rows; ad costs of rows with an ad cost child are 0."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT date_ord, amount_minor, CASE WHEN l.ad_cost_minor > 0 AND NOT EXISTS "
+                "(SELECT 1 FROM ledger c WHERE c.parent_id = l.id) THEN l.ad_cost_minor ELSE 0 END "
+                "FROM ledger l WHERE profile_id = ? AND category = ? ORDER BY date_ord",
+                (profile_id, self.category_key(category))
+            ).fetchall()
+
+    def get_transaction(self, profile_id, transaction_id):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT doc FROM ledger WHERE profile_id = ? AND id = ?", (profile_id, transaction_id)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_ad_child(self, profile_id, transaction_id):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT doc FROM ledger WHERE profile_id = ? AND parent_id = ? LIMIT 1", (profile_id, transaction_id)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def ad_cost_links(self, profile_id, category):
+        """Returns {main transaction id: ad cost transaction id} for a category."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT parent_id, id FROM ledger WHERE profile_id = ? AND category = ? AND parent_id IS NOT NULL",
+                (profile_id, self.category_key(category))
+            ).fetchall()
+        return dict(rows)
+
+    def get_family(self, profile_id, root_id):
+        """A main transaction together with its linked ad cost rows."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT doc FROM ledger WHERE profile_id = ? AND (id = ? OR parent_id = ?)",
+                (profile_id, root_id, root_id)
+            ).fetchall()
+        return [json.loads(doc) for (doc,) in rows]
+
+    def delete_transaction(self, profile_id, category, transaction_id):
+        """Deletes a transaction together with its linked ad cost rows."""
+        with self._lock, self.conn:
+            cur = self.conn.execute(
+                "DELETE FROM ledger WHERE profile_id = ? AND category = ? AND (id = ? OR parent_id = ?)",
+                (profile_id, self.category_key(category), transaction_id, transaction_id)
+            )
+            return cur.rowcount > 0
+
+    def delete_transaction_ids(self, profile_id, ids):
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "DELETE FROM ledger WHERE profile_id = ? AND id = ?", [(profile_id, i) for i in ids]
+            )
+
+    def category_totals(self, profile_id, category, with_ad_costs=True):
+        """Returns (income_minor, expenses_minor) for a transaction category."""
+        ad_expr = (
+            "COALESCE(SUM(CASE WHEN NOT EXISTS (SELECT 1 FROM ledger c WHERE c.parent_id = l.id) "
+            "THEN l.ad_cost_minor ELSE 0 END), 0)"
+            if with_ad_costs else "0"
+        )
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT COALESCE(SUM(CASE WHEN amount_minor > 0 THEN amount_minor ELSE 0 END), 0), "
+                "COALESCE(SUM(CASE WHEN amount_minor <= 0 THEN -amount_minor ELSE 0 END), 0), "
+                f"{ad_expr} FROM ledger l WHERE profile_id = ? AND category = ?",
+                (profile_id, self.category_key(category))
+            ).fetchone()
+        income, expenses, ad_costs = row
+        return income, expenses + ad_costs
+
+    def item_totals(self, profile_id, category):
+        """
+        (name, deals, income_minor, expenses_minor, profit_minor) per item name, summed in SQL.
+        Unnamed rows are grouped as "Доходы"/"Расходы" by sign; ad costs count for rows without an ad cost row.
+        """
+        with self._lock:
+            return self.conn.execute(
+                "SELECT CASE WHEN COALESCE(json_extract(doc, '$.item_name'), '') = '' "
+                "THEN CASE WHEN amount_minor < 0 THEN 'Расходы' ELSE 'Доходы' END "
+                "ELSE json_extract(doc, '$.item_name') END AS name, "
+                "SUM(amount_minor > 0), "
+                "SUM(CASE WHEN amount_minor > 0 THEN amount_minor ELSE 0 END), "
+                "SUM(CASE WHEN amount_minor <= 0 THEN -amount_minor ELSE 0 END) + SUM(ad), "
+                "SUM(amount_minor) - SUM(ad) "
+                "FROM (SELECT doc, amount_minor, CASE WHEN l.ad_cost_minor > 0 AND NOT EXISTS "
+                "(SELECT 1 FROM ledger c WHERE c.parent_id = l.id) THEN l.ad_cost_minor ELSE 0 END AS ad "
+                "FROM ledger l WHERE profile_id = ? AND category = ?) GROUP BY name",
+                (profile_id, self.category_key(category))
+            ).fetchall()
+
+    # --- Trade items ---
+
+    def _upsert_trade(self, profile_id, category, item, sold, replace=True):
+        """Writes one trade row; returns 1, or 0 when replace is off and the id is taken."""
+        sort_date = item.get("date_sold", item.get("date_added")) if sold else item.get("date_added")
+        cur = self.conn.execute(
+            f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO trade_items (id, profile_id, category, sold, sort_ts, buy_minor, coa_minor, sell_minor, doc) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                item["id"], profile_id, category, 1 if sold else 0, _trade_ts(sort_date),
+                _minor(item.get("buy_price")), _minor(item.get("cost_of_appearance")),
+                _minor(item.get("sell_price")), json.dumps(item, ensure_ascii=False)
+            )
+        )
+        return cur.rowcount
+
+    def put_trade_item(self, profile_id, category, item, sold=False):
+        with self._lock, self.conn:
+            self._upsert_trade(profile_id, category, item, sold)
+
+    def get_trade_items(self, profile_id, category, sold=False):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT doc FROM trade_items WHERE profile_id = ? AND category = ? AND sold = ? ORDER BY sort_ts DESC, rowid",
+                (profile_id, category, 1 if sold else 0)
+            ).fetchall()
+        return [json.loads(doc) for (doc,) in rows]
+
+    def get_trade_item(self, profile_id, category, item_id, sold=False):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT doc FROM trade_items WHERE profile_id = ? AND category = ? AND id = ? AND sold = ?",
+                (profile_id, category, item_id, 1 if sold else 0)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete_trade_item(self, profile_id, category, item_id, sold=False):
+        with self._lock, self.conn:
+            cur = self.conn.execute(
+                "DELETE FROM trade_items WHERE profile_id = ? AND category = ? AND id = ? AND sold = ?",
+                (profile_id, category, item_id, 1 if sold else 0)
+            )
+            return cur.rowcount > 0
+
+    def trade_totals(self, profile_id, category):
+        """Returns (income_minor, expenses_minor, inventory_value_minor) for a trade category."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT COALESCE(SUM(CASE WHEN sold = 1 THEN sell_minor ELSE 0 END), 0), "
+                "COALESCE(SUM(buy_minor + coa_minor), 0), "
+                "COALESCE(SUM(CASE WHEN sold = 0 THEN buy_minor ELSE 0 END), 0) "
+                "FROM trade_items WHERE profile_id = ? AND category = ?",
+                (profile_id, category)
+            ).fetchone()
+        return row
@@ -0,0 +1,268 @@
+"""
+Cold-start and steady-state benchmarks for DataManager on synthetic profiles.
+
+pytest-benchmark (not collected by default; sizes via BENCH_SIZES, add 1000000 for the 1M run):
+    BENCH_SIZES=1000,10000 python -m pytest tests/benchmark_core.py --benchmark-json=bench.json
+
+Standalone, writes one JSON document per run for comparing versions:
+    python tests/benchmark_core.py --sizes 1000,10000,100000 --output bench_1.0.4.json
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import logging
+from datetime import date
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+from PyQt6.QtWidgets import QApplication
+import json_codec
+from data_manager import DataManager
+from version import VERSION
+
+# Ensure QApplication exists
+app = QApplication.instance() or QApplication([])
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("CoreBenchmark")
+
+CATEGORIES = ["car_rental", "mining", "farm_bp", "fishing"]
+TRADE_CATEGORIES = ["clothes", "clothes_new", "cars_trade"]
+DEFAULT_SIZES = "1000,10000,100000"
+
+
+def build_profile(n_transactions, seed=42):
+    """One migrated profile: n transactions, n/10 trade items and n/100 memo items."""
+    rng = random.Random(seed)
+    profile = {
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "name": f"Benchmark {n_transactions}",
+        "created_at": "01.01.2026",
+        "starting_amount": 10000.0,
+        "settings": {"theme": "dark", "listing_cost": 0.0, "version": VERSION},
+        "capital_planning": {"target_amount": 0.0, "target_date": None, "history": [], "settings": {"simplified_mode": False}},
+        "achievements": [],
+        "transactions": [],
+        "memo": {"uk": [], "ak": []},
+    }
+    for cat in CATEGORIES:
+        profile[cat] = {"transactions": []}
+
+    base_ord = date(2026, 1, 1).toordinal()
+    for i in range(n_transactions):
+        day_ord = base_ord + rng.randint(0, 364)
+        amount = round(rng.uniform(-5000, 5000), 2)
+        profile[CATEGORIES[i % len(CATEGORIES)]]["transactions"].append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "amount": amount,
+            "comment": f"Операция {i}",
+            "item_name": f"Предмет {rng.randint(1, 500)}",
+            "date": date.fromordinal(day_ord).strftime("%d.%m.%Y"),
+            "date_ord": day_ord,
+            "image_path": None,
+            "ad_cost": 0.0,
+        })
+    for cat in CATEGORIES:
+        profile[cat]["transactions"].sort(key=lambda t: t["date_ord"], reverse=True)
+
+    for cat in TRADE_CATEGORIES:
+        profile[cat] = {"inventory": [], "sold_history": []}
+    for i in range(n_transactions // 10):
+        buy = round(rng.uniform(100, 5000), 2)
+        item = {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "name": f"Товар {rng.randint(1, 300)}",
+            "buy_price": buy,
+            "date_added": "01.01.2026 12:00",
+        }
+        cat = TRADE_CATEGORIES[i % len(TRADE_CATEGORIES)]
+        if i % 2:
+            item.update(sell_price=round(buy * rng.uniform(0.8, 1.6), 2), date_sold="02.01.2026 12:00")
+            profile[cat]["sold_history"].append(item)
+        else:
+            profile[cat]["inventory"].append(item)
+
+    profile["memo_sections"] = [{
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "title": "Заметки",
+        "headers": ["Название", "Цена"],
+        "items": [
+            {"id": str(uuid.UUID(int=rng.getrandbits(128))), "values": [f"Запись {i}", str(i)], "image_path": None}
+            for i in range(max(1, n_transactions // 100))
+        ],
+    }]
+    return profile
+
+
+def write_data_file(directory, n_transactions):
+    profile = build_profile(n_transactions)
+    data = {"profiles": [profile], "active_profile_id": profile["id"], "global": {}}
+    path = os.path.join(directory, "data.json")
+    with open(path, "wb") as f:
+        f.write(json_codec.dumps(data))
+    return path
+
+
+def rss_mb():
+    return psutil.Process().memory_info().rss / (1024 * 1024) if psutil else None
+
+
+def open_manager(path):
+    return DataManager(filename=path, journaled=True, save_delay=0)
+
+
+# Steady-state operations on a constructed manager; each returns nothing and must be repeatable
+def op_add_transaction(dm):
+    dm.add_transaction("car_rental", 1250.0, "benchmark", date_str="15.06.2026")
+
+
+def op_category_stats(dm):
+    dm.invalidate_aggregates()
+    dm.get_category_stats("car_rental")
+
+
+def op_item_stats(dm):
+    dm.get_item_stats("clothes")
+
+
+def op_save(dm):
+    dm._save_data_sync()
+
+
+OPERATIONS = {
+    "migrate_profiles": lambda dm: dm.migrate_profiles(),
+    "migrate_dates_to_russian_format": lambda dm: dm.migrate_dates_to_russian_format(),
+    "migrate_clothes_data": lambda dm: dm.migrate_clothes_data(),
+    "add_transaction": op_add_transaction,
+    "get_category_stats": op_category_stats,
+    "get_item_stats": op_item_stats,
+    "save": op_save,
+}
+
+
+def measure(size, rounds=3):
+    """Seconds (median of rounds) per metric for one profile size, plus RSS after construction."""
+    temp_dir = tempfile.mkdtemp(prefix=f"mt_bench_{size}_")
+    try:
+        path = write_data_file(temp_dir, size)
+        results = {"size": size, "file_mb": os.path.getsize(path) / (1024 * 1024)}
+
+        rss_before = rss_mb()
+        timings = []
+        dm = None
+        for _ in range(rounds):
+            if dm:
+                # Stops the save and journal writer threads of the previous round
+                dm.close()
+            started = time.perf_counter()
+            dm = open_manager(path)
+            timings.append(time.perf_counter() - started)
+        results["construct"] = sorted(timings)[len(timings) // 2]
+        rss_after = rss_mb()
+        if rss_after is not None:
+            results["rss_mb"] = rss_after
+            results["rss_delta_mb"] = rss_after - rss_before
+
+        for name, op in OPERATIONS.items():
+            timings = []
+            for _ in range(rounds):
+                started = time.perf_counter()
+                op(dm)
+                timings.append(time.perf_counter() - started)
+            results[name] = sorted(timings)[len(timings) // 2]
+
+        dm.flush()
+        dm.close()
+        return results
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def run(sizes, rounds=3):
+    return {
+        "app_version": VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "json_backend": json_codec.BACKEND,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": [measure(size, rounds) for size in sizes],
+    }
+
+
+def parse_sizes(value):
+    return [int(s) for s in value.split(",") if s.strip()]
+
+
+# --- pytest-benchmark suite ---
+try:
+    import pytest
+except ImportError:
+    pytest = None
+try:
+    import pytest_benchmark
+except ImportError:
+    pytest_benchmark = None
+
+if pytest is not None:
+    SIZES = parse_sizes(os.environ.get("BENCH_SIZES", DEFAULT_SIZES))
+
+    if pytest_benchmark is None:
+        @pytest.fixture
+        def benchmark():
+            pytest.skip("pytest-benchmark is not installed")
+
+    @pytest.fixture(scope="module", params=SIZES, ids=lambda size: f"{size}tx")
+    def data_file(request, tmp_path_factory):
+        return write_data_file(str(tmp_path_factory.mktemp(f"bench_{request.param}")), request.param)
+
+    @pytest.fixture(scope="module")
+    def manager(data_file):
+        dm = open_manager(data_file)
+        yield dm
+        dm.flush()
+        dm.save_scheduler.stop()
+
+    def test_construct(benchmark, data_file):
+        managers = []
+
+        def construct():
+            managers.append(open_manager(data_file))
+
+        benchmark.pedantic(construct, rounds=3, iterations=1)
+        benchmark.extra_info["rss_mb"] = rss_mb()
+        for dm in managers:
+            dm.save_scheduler.stop()
+
+    @pytest.mark.parametrize("operation", list(OPERATIONS))
+    def test_operation(benchmark, manager, operation):
+        benchmark.pedantic(OPERATIONS[operation], args=(manager,), rounds=5, iterations=1, warmup_rounds=1)
+        benchmark.extra_info["rss_mb"] = rss_mb()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DataManager cold-start and steady-state benchmarks")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma separated transaction counts (e.g. 1000,10000,100000,1000000)")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--output", help="Write JSON results to this file (default: stdout)")
+    args = parser.parse_args()
+
+    report = run(parse_sizes(args.sizes), args.rounds)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        logger.warning(f"Results written to {args.output}")
+    else:
+        print(text)
@@ -0,0 +1,98 @@
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import hashlib
+import tempfile
+import logging
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json_codec
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("JsonCodecBenchmark")
+
+CATEGORIES = ["car_rental", "mining", "farm_bp", "fishing"]
+
+
+def build_synthetic_data(target_mb=50):
+    """A data.json-shaped dict of roughly target_mb megabytes."""
+    rng = random.Random(42)
+    profile = {"id": str(uuid.uuid4()), "name": "Benchmark", "starting_amount": 0.0}
+    for cat in CATEGORIES:
+        profile[cat] = {"transactions": [], "starting_amount": 0.0}
+
+    # One transaction serializes to ~220 bytes
+    count = target_mb * 1024 * 1024 // 220
+    for i in range(count):
+        day = rng.randint(1, 28)
+        month = rng.randint(1, 12)
+        profile[CATEGORIES[i % len(CATEGORIES)]]["transactions"].append({
+            "id": str(uuid.uuid4()),
+            "amount": round(rng.uniform(-5000, 5000), 2),
+            "comment": f"Операция {i}",
+            "item_name": f"Предмет {rng.randint(1, 500)}",
+            "date": f"{day:02d}.{month:02d}.2026",
+            "date_ord": 739617 + rng.randint(0, 364),
+            "timestamp": 1767225600 + i,
+            "ad_cost": 0.0,
+        })
+    return {"profiles": [profile], "active_profile_id": profile["id"]}
+
+
+def timed(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(target_mb=50):
+    data = build_synthetic_data(target_mb)
+    path = os.path.join(tempfile.mkdtemp(), "data.json")
+
+    def save_stdlib():
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def load_stdlib():
+        with open(path, "r", encoding="utf-8") as f:
+            json.load(f)
+
+    def hash_stdlib():
+        # What ResourceLoader used to do: a second, sorted serialization
+        hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+    payload = json_codec.dumps(data)
+
+    def save_codec():
+        with open(path, "wb") as f:
+            f.write(json_codec.dumps(data))
+
+    def load_codec():
+        json_codec.load_file(path)
+
+    def hash_codec():
+        json_codec.digest(payload)
+
+    save_stdlib()
+    logger.info(f"Synthetic file: {os.path.getsize(path) / 1024 / 1024:.1f} MB, codec backend: {json_codec.BACKEND}")
+
+    results = {}
+    for name, old, new in [("save", save_stdlib, save_codec), ("load", load_stdlib, load_codec), ("hash", hash_stdlib, hash_codec)]:
+        results[name] = (timed(old), timed(new))
+        logger.info(f"{name:>5}: stdlib {results[name][0] * 1000:8.1f} ms | {json_codec.BACKEND} {results[name][1] * 1000:8.1f} ms")
+
+    os.remove(path)
+    return results
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -64,7 +64,7 @@ def stress_test_datamanager(num_threads=10, operations_per_thread=50):
                 # In a real scenario, we'd use add_transaction method if available
                 # But looking at previous code, specific methods might exist.
                 # Let's try to just update a setting to be safe and simple
-                dm.update_setting(f"stress_key_{thread_id}_{i}", "test_value", save=True)
+                dm.set_setting(f"stress_key_{thread_id}_{i}", "test_value")
                 
                 # Simulate read
                 _ = dm.get_setting(f"stress_key_{thread_id}_{i}")
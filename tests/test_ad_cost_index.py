@@ -0,0 +1,95 @@
+import unittest
+import os
+import shutil
+import tempfile
+from data_manager import DataManager
+
+
+def make_transactions(count):
+    """Synthetic rental ledger: every third income row has a separate ad cost row."""
+    transactions = []
+    for i in range(count):
+        tx_id = f"tx-{i}"
+        transactions.append({
+            "id": tx_id, "date": "01.02.2026", "amount": 100.0 + i % 7,
+            "item_name": f"Car {i % 50}", "ad_cost": 10.0 if i % 3 else 0.0, "timestamp": i
+        })
+        if i % 3 == 1:
+            transactions.append({
+                "id": f"ad-{i}", "date": "01.02.2026", "amount": -10.0, "item_name": f"Car {i % 50}",
+                "parent_id": tx_id, "is_ad_cost": True, "timestamp": i - 0.001
+            })
+    return transactions
+
+
+class CountingDict(dict):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.lookups = 0
+
+    def __getitem__(self, key):
+        self.lookups += 1
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.lookups += 1
+        return super().get(key, default)
+
+
+class TestAdCostIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.dm = DataManager(os.path.join(self.tmp_dir, "data.json"))
+        self.dm.data = {"profiles": [], "active_profile_id": None}
+        self.dm.create_profile("Index Profile", 0.0)
+
+    def tearDown(self):
+        self.dm.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _load(self, count):
+        self.dm.get_active_profile()["car_rental"]["transactions"] = make_transactions(count)
+        self.dm.invalidate_aggregates()
+
+    def _rebuilt_index(self, category):
+        return {t["parent_id"]: t["id"] for t in self.dm.get_transactions(category) if t.get("parent_id")}
+
+    def test_index_follows_mutations(self):
+        self.dm.get_ad_cost_index("mining")
+        a = self.dm.add_transaction("mining", 200.0, "Ore", item_name="Ore", ad_cost=20.0)
+        b = self.dm.add_transaction("mining", 300.0, "Ore", item_name="Ore")
+        self.dm.update_transaction("mining", b["id"], 300.0, "Ore", b["date"], "Ore", ad_cost=5.0)
+        self.dm.update_transaction("mining", a["id"], 200.0, "Ore", a["date"], "Ore", ad_cost=0.0)
+        self.assertEqual(self.dm.get_ad_cost_index("mining"), self._rebuilt_index("mining"))
+        self.assertEqual(set(self.dm.get_ad_cost_index("mining")), {b["id"]})
+
+        self.dm.delete_transaction("mining", self.dm.get_ad_cost_index("mining")[b["id"]])
+        self.assertEqual(self.dm.get_ad_cost_index("mining"), {})
+
+    def test_stats_with_index(self):
+        self._load(30)
+        stats = self.dm.get_category_stats("car_rental")
+        # 20 rows carry ad_cost=10; 10 of them have a separate -10 row, the rest add the field
+        self.assertEqual(stats["expenses"], 200.0)
+        item_expenses = sum(s["expenses"] for s in self.dm.get_item_stats("car_rental").values())
+        self.assertEqual(item_expenses, 200.0)
+
+    def _count_lookups(self, count):
+        """Field reads on the transaction rows while computing category and item stats."""
+        self._load(count)
+        profile = self.dm.get_active_profile()
+        rows = profile["car_rental"]["transactions"] = [CountingDict(t) for t in profile["car_rental"]["transactions"]]
+        self.dm.invalidate_aggregates()
+        self.dm.get_category_stats("car_rental")
+        self.dm.get_item_stats("car_rental")
+        return sum(row.lookups for row in rows)
+
+    def test_linear_scaling(self):
+        small = self._count_lookups(2_000)
+        large = self._count_lookups(4_000)
+        # Twice the rows: linear work doubles, the old per-row scan for ad cost rows quadrupled
+        self.assertLessEqual(large, small * 2.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import threading
+import time
+from PyQt6.QtWidgets import QApplication
+from async_data_manager import AsyncDataManager
+
+# Ensure QApplication exists
+app = QApplication.instance() or QApplication([])
+
+
+class SlowDataManager:
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.balance_started = threading.Event()
+
+    def get_total_capital_balance(self):
+        self.calls.append("balance")
+        self.balance_started.set()
+        self.release.wait(2)
+        return {"liquid_cash": 100.0}
+
+    def get_category_stats(self, category):
+        self.calls.append(category)
+        self.release.wait(2)
+        return {"category": category}
+
+
+class TestAsyncDataManager(unittest.TestCase):
+    def setUp(self):
+        self.dm = SlowDataManager()
+        self.async_dm = AsyncDataManager(self.dm, max_workers=1)
+
+    def tearDown(self):
+        self.dm.release.set()
+        self.async_dm.wait_for_done(2000)
+
+    def _drain(self, timeout=2.0):
+        self.dm.release.set()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            app.processEvents()
+            if not self.async_dm._tasks:
+                return
+            time.sleep(0.01)
+
+    def test_identical_calls_share_one_execution(self):
+        results = []
+        for _ in range(5):
+            self.async_dm.get_total_capital_balance(results.append)
+        self._drain()
+        self.assertEqual(self.dm.calls, ["balance"])
+        self.assertEqual(results, [{"liquid_cash": 100.0}] * 5)
+        stats = self.async_dm.stats()
+        self.assertEqual((stats["submitted"], stats["deduplicated"], stats["completed"]), (5, 4, 1))
+
+    def test_cancelled_queued_read_never_runs(self):
+        results = []
+        self.async_dm.get_total_capital_balance(results.append)
+        self.assertTrue(self.dm.balance_started.wait(2))
+        # The single worker is busy, so this one is still queued
+        stale = self.async_dm.get_category_stats(results.append, "mining", group="mining_tab")
+        self.assertEqual(self.async_dm.stats()["queued"], 1)
+        self.assertEqual(self.async_dm.cancel_group("mining_tab"), 1)
+        self._drain()
+        self.assertTrue(stale.cancelled())
+        self.assertNotIn("mining", self.dm.calls)
+        self.assertEqual(results, [{"liquid_cash": 100.0}])
+
+    def test_cancel_one_of_shared_futures(self):
+        results = []
+        first = self.async_dm.get_category_stats(lambda r: results.append(("first", r)), "car_rental")
+        self.async_dm.get_category_stats(lambda r: results.append(("second", r)), "car_rental")
+        first.cancel()
+        self._drain()
+        self.assertEqual(results, [("second", {"category": "car_rental"})])
+
+    def test_errors_are_reported_on_the_future(self):
+        self.dm.get_transactions = lambda category: 1 / 0
+        future = self.async_dm.get_transactions(lambda r: self.fail("callback on error"), "mining")
+        self._drain()
+        self.assertIsInstance(future.error, ZeroDivisionError)
+        self.assertEqual(self.async_dm.stats()["failed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
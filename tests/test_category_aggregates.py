@@ -0,0 +1,92 @@
+import unittest
+import os
+import shutil
+import tempfile
+from data_manager import DataManager
+
+
+class TestCategoryAggregates(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.managers = []
+
+    def tearDown(self):
+        for dm in self.managers:
+            dm.close()
+            if dm.store:
+                dm.store.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _make_dm(self, storage="json"):
+        folder = os.path.join(self.tmp_dir, storage)
+        os.makedirs(folder)
+        dm = DataManager(os.path.join(folder, "data.json"), storage=storage)
+        dm.data = {"profiles": [], "active_profile_id": None}
+        dm.create_profile("Aggregates Profile", 1000.0)
+        # Writes without changes invalidate the totals; keep them in memory for the test
+        dm.save_data = lambda changes=None: None
+        self.managers.append(dm)
+        return dm
+
+    def _warm(self, dm):
+        for cat in ["car_rental", "mining", "fishing", "cars_trade", "clothes"]:
+            dm.get_category_stats(cat)
+        dm.get_total_capital_balance()
+
+    def _mutate(self, dm):
+        main = dm.add_transaction("car_rental", 1000.0, "Rent", date_str="01.02.2026", item_name="Car", ad_cost=100.0)
+        dm.add_transaction("car_rental", -250.5, "Repair", date_str="03.02.2026", item_name="Car")
+        tx = dm.add_transaction("car_rental", 400.0, "Rent", date_str="02.02.2026", item_name="Bike")
+        dm.update_transaction("car_rental", tx["id"], 450.0, "Rent", "02.02.2026", "Bike", ad_cost=50.0)
+        dm.update_transaction("car_rental", tx["id"], 450.0, "Rent", "02.02.2026", "Bike", ad_cost=0.0)
+
+        # Deleting only the ad cost row makes the parent's ad_cost field count instead
+        child = next(t for t in dm.get_transactions("car_rental") if t.get("parent_id") == main["id"])
+        dm.delete_transaction("car_rental", child["id"])
+
+        ore = dm.add_transaction("mining", 200.0, "Ore", ad_cost=20.0)
+        dm.delete_transaction("mining", ore["id"])
+        dm.add_transaction("fishing", -500.0, "Tackle", ad_cost=10.0)
+
+        dm.add_trade_item("cars_trade", "Banshee", 4000.0, "", coa_price=100.0)
+        dm.add_trade_item("cars_trade", "Comet", 3000.0, "")
+        item = next(i for i in dm.get_trade_inventory("cars_trade") if i["name"] == "Banshee")
+        dm.sell_trade_item("cars_trade", item["id"], 5000.0)
+        comet = next(i for i in dm.get_trade_inventory("cars_trade") if i["name"] == "Comet")
+        dm.delete_trade_item("cars_trade", comet["id"])
+
+    def _check(self, storage):
+        dm = self._make_dm(storage)
+        self._warm(dm)
+        self._mutate(dm)
+
+        self.assertEqual(dm.verify_aggregates(), [])
+        incremental = dm.get_total_capital_balance()
+        dm.invalidate_aggregates()
+        self.assertEqual(dm.get_total_capital_balance(), incremental)
+
+        stats = dm.get_category_stats("car_rental")
+        self.assertEqual(stats["income"], 1450.0)
+        self.assertEqual(stats["expenses"], 350.5)
+        self.assertEqual(dm.get_category_stats("cars_trade")["pure_profit"], 900.0)
+
+    def test_incremental_matches_full_recompute_json(self):
+        self._check("json")
+
+    def test_incremental_matches_full_recompute_sqlite(self):
+        self._check("sqlite")
+
+    def test_untracked_mutation_invalidates(self):
+        dm = DataManager(os.path.join(self.tmp_dir, "data.json"))
+        self.managers.append(dm)
+        dm.data = {"profiles": [], "active_profile_id": None}
+        dm.create_profile("Aggregates Profile", 1000.0)
+        self.assertEqual(dm.get_category_stats("mining")["income"], 0.0)
+
+        dm.get_active_profile()["mining"]["transactions"].append({"id": "x", "date": "01.01.2026", "amount": 75.0})
+        dm.save_data()
+        self.assertEqual(dm.get_category_stats("mining")["income"], 75.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
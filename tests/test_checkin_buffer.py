@@ -0,0 +1,100 @@
+import unittest
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from sqlalchemy import event
+from web import create_app, db
+from web.models import User, Client
+from web.checkin_buffer import CheckinBuffer
+
+
+class CheckinBufferTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.config['TESTING'] = True
+        self.client = self.app.test_client()
+        self.buffer = CheckinBuffer()
+        self.patcher = patch("web.routes.checkin_buffer", self.buffer)
+        self.patcher.start()
+
+        with self.app.app_context():
+            db.create_all()
+            from werkzeug.security import generate_password_hash
+            user = User(username='admin', full_name='Administrator', email='admin@test.com', password=generate_password_hash('password'))
+            db.session.add(user)
+            db.session.commit()
+
+    def tearDown(self):
+        self.patcher.stop()
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def checkin(self, client_id='hwid-1', version='1.0.8'):
+        return self.client.post('/api/client/checkin', json={
+            "client_id": client_id, "version": version, "username": "admin", "name": "Main"
+        })
+
+    def get_client(self, client_id='hwid-1'):
+        with self.app.app_context():
+            return Client.query.filter_by(client_id=client_id).first()
+
+    def test_known_client_is_answered_without_queries(self):
+        self.assertEqual(self.checkin().status_code, 200)
+        with self.app.app_context():
+            self.buffer.flush()
+
+        statements = []
+        with self.app.app_context():
+            listener = lambda *args: statements.append(args[2])
+            event.listen(db.engine, "before_cursor_execute", listener)
+            try:
+                for _ in range(3):
+                    response = self.checkin(version='1.0.9')
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(json.loads(response.data)["commands"], [])
+                self.assertEqual(statements, [])
+
+                self.assertEqual(self.buffer.flush(), 1)
+                self.assertEqual(len(statements), 1)
+            finally:
+                event.remove(db.engine, "before_cursor_execute", listener)
+
+        client = self.get_client()
+        self.assertEqual(client.version, '1.0.9')
+        self.assertEqual(client.status, 'Active')
+        with self.app.app_context():
+            self.assertEqual(db.session.get(Client, client.id).owner.username, 'admin')
+
+    def test_queued_heartbeat_does_not_lift_ban(self):
+        self.checkin()
+        with self.app.app_context():
+            self.buffer.flush()
+        self.checkin()
+
+        with self.app.app_context():
+            client = Client.query.filter_by(client_id='hwid-1').first()
+            client.status = 'Banned'
+            db.session.commit()
+            self.buffer.forget('hwid-1')
+            self.buffer.flush()
+
+        self.assertEqual(self.get_client().status, 'Banned')
+        self.assertEqual(self.checkin().status_code, 403)
+
+    def test_expired_license_is_rejected(self):
+        self.checkin()
+        with self.app.app_context():
+            client = Client.query.filter_by(client_id='hwid-1').first()
+            client.license_expiry = datetime.utcnow() - timedelta(days=1)
+            db.session.commit()
+        self.buffer.forget('hwid-1')
+
+        self.assertEqual(self.checkin().status_code, 402)
+        with self.app.app_context():
+            self.buffer.flush()
+        self.assertEqual(self.get_client().status, 'Active')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from sqlalchemy import event
+from web import create_app, db
+from web.models import User, Client
+from web.checkin_buffer import CheckinBuffer
+
+
+class ClientsApiTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.config['TESTING'] = True
+        self.client = self.app.test_client()
+        self.patcher = patch("web.routes.checkin_buffer", CheckinBuffer())
+        self.patcher.start()
+
+        with self.app.app_context():
+            db.create_all()
+            from werkzeug.security import generate_password_hash
+            user = User(username='admin', full_name='Administrator', email='admin@test.com', password=generate_password_hash('password'))
+            db.session.add(user)
+            db.session.flush()
+            now = datetime.utcnow()
+            for i in range(1, 8):
+                db.session.add(Client(
+                    client_id=f'hwid-{i}', version='1.0.8' if i % 2 else '1.0.7', user_id=user.id,
+                    last_seen=now if i <= 3 else now - timedelta(minutes=10), status='Active'
+                ))
+            db.session.commit()
+
+        self.client.post('/login', data=dict(email='admin@test.com', password='password'))
+
+    def tearDown(self):
+        self.patcher.stop()
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def get(self, **params):
+        response = self.client.get('/api/clients', query_string=params)
+        self.assertEqual(response.status_code, 200)
+        return response, [c['client_id'] for c in json.loads(response.data)]
+
+    def test_keyset_pages_cover_all_clients(self):
+        seen = []
+        params = {'limit': 3}
+        while True:
+            response, ids = self.get(**params)
+            seen += ids
+            cursor = response.headers.get('X-Next-Cursor')
+            if not cursor:
+                break
+            params['after'] = cursor
+        self.assertEqual(seen, [f'hwid-{i}' for i in range(1, 8)])
+
+    def test_filters(self):
+        _, ids = self.get(version='1.0.7')
+        self.assertEqual(ids, ['hwid-2', 'hwid-4', 'hwid-6'])
+        _, ids = self.get(online='1')
+        self.assertEqual(ids, ['hwid-1', 'hwid-2', 'hwid-3'])
+        _, ids = self.get(online='0', version='1.0.8')
+        self.assertEqual(ids, ['hwid-5', 'hwid-7'])
+        _, ids = self.get(status='Active,Banned', version='1.0.7')
+        self.assertEqual(ids, ['hwid-2', 'hwid-4', 'hwid-6'])
+
+    def test_since_returns_only_changed_clients(self):
+        response, _ = self.get()
+        synced_at = response.headers['X-Server-Time']
+        _, ids = self.get(since=synced_at)
+        self.assertEqual(ids, [])
+
+        self.client.post('/api/client/ban', json={"client_id": "hwid-2"})
+        _, ids = self.get(since=synced_at)
+        self.assertEqual(ids, ['hwid-2'])
+
+        # Heartbeats are written by the buffered flush, which also stamps the row
+        self.client.post('/api/client/checkin', json={"client_id": "hwid-3", "version": "1.0.9"})
+        _, ids = self.get(since=synced_at)
+        self.assertEqual(ids, ['hwid-2', 'hwid-3'])
+
+        self.assertEqual(self.client.get('/api/clients?since=yesterday').status_code, 400)
+
+    def test_owner_is_loaded_with_the_page(self):
+        self.get()
+        statements = []
+        with self.app.app_context():
+            listener = lambda *args: statements.append(args[2])
+            event.listen(db.engine, "before_cursor_execute", listener)
+            try:
+                response, ids = self.get()
+            finally:
+                event.remove(db.engine, "before_cursor_execute", listener)
+        self.assertEqual(len(ids), 7)
+        self.assertEqual(json.loads(response.data)[0]['name'], 'Administrator')
+        self.assertEqual(len([s for s in statements if 'FROM client' in s]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
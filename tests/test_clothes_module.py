@@ -77,6 +77,7 @@ class TestClothesModule(unittest.TestCase):
             
         profile["clothes"]["sold_history"].append(bad_item)
         self.dm.save_data()
+        self.dm.flush()
         
         # Reload DataManager to trigger migration (simulating app restart)
         # Note: In our implementation, migration is called in __init__
@@ -0,0 +1,91 @@
+import unittest
+import os
+import shutil
+import tempfile
+from datetime import date
+from unittest.mock import patch
+import columnar_cache
+from columnar_cache import LedgerColumns
+
+D = date(2026, 2, 1).toordinal()
+
+ROWS = [
+    (D + 9, 40000, 0),
+    (D + 2, -25050, 0),
+    (D, 100000, 0),
+    (D, -10000, 0),
+    (D, 5000, 2000),
+    (0, 777, 0),  # unparsable date
+]
+
+
+class TestLedgerColumns(unittest.TestCase):
+    def check(self, columns):
+        self.assertEqual(len(columns), 6)
+        self.assertEqual(columns.totals(), (145777, 35050))
+        self.assertEqual(columns.totals(D, D + 27), (145000, 35050))
+        self.assertEqual(columns.totals(D, D + 27, with_ad_costs=True), (145000, 37050))
+        self.assertEqual(columns.totals(end_ord=D + 2), (105000, 35050))
+        self.assertEqual(columns.totals(D + 3), (40000, 0))
+        self.assertEqual(columns.totals(D + 30, D + 40), (0, 0))
+
+        incomes, expenses = columns.daily(D, D + 3)
+        self.assertEqual(incomes, [105000, 0, 0, 0])
+        self.assertEqual(expenses, [12000, 0, 25050, 0])
+        self.assertEqual(columns.daily(D + 5, D + 4), ([], []))
+
+    def test_reductions(self):
+        self.check(LedgerColumns(ROWS))
+
+    def test_pure_python_fallback(self):
+        with patch.object(columnar_cache, "np", None):
+            self.check(LedgerColumns(ROWS))
+
+    def test_empty(self):
+        columns = LedgerColumns([])
+        self.assertEqual(columns.totals(D, D + 6), (0, 0))
+        self.assertEqual(columns.daily(D, D + 1), ([0, 0], [0, 0]))
+
+
+class TestDataManagerColumns(unittest.TestCase):
+    def setUp(self):
+        from data_manager import DataManager
+        self.tmp_dir = tempfile.mkdtemp()
+        self.managers = {}
+        for storage in ("json", "sqlite"):
+            folder = os.path.join(self.tmp_dir, storage)
+            os.makedirs(folder)
+            dm = DataManager(os.path.join(folder, "data.json"), storage=storage)
+            dm.data = {"profiles": [], "active_profile_id": None}
+            dm.create_profile("Columns Profile", 0.0)
+            dm.add_transaction("car_rental", 1000.0, "Rent", date_str="01.02.2026", ad_cost=100.0)
+            dm.add_transaction("car_rental", -250.5, "Repair", date_str="03.02.2026")
+            self.managers[storage] = dm
+
+    def tearDown(self):
+        for dm in self.managers.values():
+            dm.close()
+            if dm.store:
+                dm.store.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_daily_totals(self):
+        for storage, dm in self.managers.items():
+            incomes, expenses = dm.daily_totals("car_rental", date(2026, 2, 1), date(2026, 2, 3))
+            self.assertEqual(incomes, [1000.0, 0.0, 0.0], storage)
+            self.assertEqual(expenses, [100.0, 0.0, 250.5], storage)
+
+    def test_mutations_refresh_columns(self):
+        window = (date(2026, 2, 1), date(2026, 2, 28))
+        for storage, dm in self.managers.items():
+            self.assertEqual(dm.sum_range("car_rental", *window), (1000.0, 350.5), storage)
+            tx = dm.add_transaction("car_rental", 50.0, "Tip", date_str="02.02.2026")
+            self.assertEqual(dm.sum_range("car_rental", *window), (1050.0, 350.5), storage)
+            dm.update_transaction("car_rental", tx["id"], 70.0, "Tip", "02.03.2026", "")
+            self.assertEqual(dm.sum_range("car_rental", *window), (1000.0, 350.5), storage)
+            dm.delete_transaction("car_rental", tx["id"])
+            self.assertEqual(dm.sum_range("car_rental", date(2026, 3, 1)), (0.0, 0.0), storage)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import patch
+from web import socketio
+from web.dashboard_feed import DashboardFeed
+
+
+class DashboardFeedTestCase(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.feed = DashboardFeed(ack_timeout=10.0, clock=lambda: self.now)
+        self.sent = []
+        self.patcher = patch.object(socketio, "emit", side_effect=self._emit)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def _emit(self, event, payload, to=None, callback=None):
+        self.sent.append((to, event, payload["clients"], callback))
+
+    def test_updates_are_coalesced_per_client(self):
+        self.feed.subscribe("dash")
+        for version in ("1.0.1", "1.0.2", "1.0.3"):
+            self.feed.publish({"client_id": "a", "version": version})
+        self.feed.publish({"client_id": "b", "version": "1.0.0"})
+
+        self.assertEqual(self.feed.tick(), 1)
+        to, event, rows, _ = self.sent[0]
+        self.assertEqual((to, event), ("dash", "clients_delta"))
+        self.assertEqual(sorted((r["client_id"], r["version"]) for r in rows), [("a", "1.0.3"), ("b", "1.0.0")])
+        self.assertEqual(self.feed.tick(), 0)
+
+    def test_slow_socket_skips_intermediate_states(self):
+        self.feed.subscribe("fast")
+        self.feed.subscribe("slow")
+        self.feed.publish({"client_id": "a", "version": "1"})
+        self.feed.tick()
+        acks = {to: callback for to, _, _, callback in self.sent}
+        acks["fast"]()
+
+        for version in ("2", "3"):
+            self.feed.publish({"client_id": "a", "version": version})
+            self.sent.clear()
+            self.feed.tick()
+            self.assertEqual([to for to, *_ in self.sent], ["fast"])
+            self.sent[0][3]()
+
+        # Once the slow dashboard acknowledges, it gets only the latest state
+        acks["slow"]()
+        self.sent.clear()
+        self.feed.tick()
+        self.assertEqual([(to, rows) for to, _, rows, _ in self.sent], [("slow", [{"client_id": "a", "version": "3"}])])
+
+    def test_unacknowledged_batch_times_out(self):
+        self.feed.subscribe("dash")
+        self.feed.publish({"client_id": "a"})
+        self.feed.tick()
+        self.feed.publish({"client_id": "b"})
+        self.assertEqual(self.feed.tick(), 0)
+        self.now = 10.0
+        self.assertEqual(self.feed.tick(), 1)
+
+    def test_no_subscribers_drops_rows(self):
+        self.feed.publish({"client_id": "a"})
+        self.assertEqual(self.feed.tick(), 0)
+        self.feed.subscribe("dash")
+        self.assertEqual(self.feed.tick(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
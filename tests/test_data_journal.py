@@ -0,0 +1,92 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+from data_manager import DataManager
+from data_journal import apply_op
+
+
+class TestDataJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.tmp_dir, "data.json")
+        self.dm = DataManager(self.test_file, journaled=True)
+        self.managers = [self.dm]
+        self.dm.data = {"profiles": [], "active_profile_id": None}
+        self.dm.create_profile("Journal Profile", 1000.0)
+        # Deterministic base snapshot
+        self.dm._save_data_sync()
+
+    def tearDown(self):
+        for dm in self.managers:
+            dm.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def reopen(self):
+        self.dm.flush()
+        dm = DataManager(self.test_file)
+        self.managers.append(dm)
+        return dm
+
+    def test_mutations_go_to_journal(self):
+        mtime = os.path.getmtime(self.test_file)
+        self.dm.add_transaction("mining", 500.0, "Gold", date_str="01.02.2026")
+        self.dm.set_setting("theme", "light")
+        self.dm.flush()
+
+        self.assertTrue(os.path.exists(self.dm.journal.path))
+        self.assertEqual(os.path.getmtime(self.test_file), mtime)
+        with open(self.dm.journal.path, encoding="utf-8") as f:
+            ops = [json.loads(line) for line in f]
+        self.assertEqual([op["seq"] for op in ops], sorted(op["seq"] for op in ops))
+
+    def test_replay_restores_state(self):
+        self.dm.add_transaction("car_rental", 1000.0, "Rent", date_str="01.02.2026", item_name="Car", ad_cost=100.0)
+        self.dm.add_transaction("car_rental", 300.0, "Rent", date_str="05.02.2026")
+        tx = self.dm.add_transaction("car_rental", 50.0, "Old", date_str="01.01.2026")
+        self.dm.update_transaction("car_rental", tx["id"], 70.0, "Edited", "10.02.2026", "Car")
+        self.dm.add_trade_item("cars_trade", "Banshee", 4000.0, "")
+        item = self.dm.get_trade_inventory("cars_trade")[0]
+        self.dm.sell_trade_item("cars_trade", item["id"], 5000.0)
+        self.dm.add_timer("Farm", "countdown", 60)
+
+        reloaded = self.reopen()
+        self.assertEqual(reloaded.get_transactions("car_rental"), self.dm.get_transactions("car_rental"))
+        self.assertEqual(reloaded.get_trade_sold("cars_trade"), self.dm.get_trade_sold("cars_trade"))
+        self.assertEqual(reloaded.get_timers(), self.dm.get_timers())
+        self.assertEqual(reloaded.get_total_capital_balance(), self.dm.get_total_capital_balance())
+
+    def test_delete_is_replayed(self):
+        tx = self.dm.add_transaction("mining", 200.0, "Ore", item_name="Ore", ad_cost=20.0)
+        self.dm.delete_transaction("mining", tx["id"])
+
+        reloaded = self.reopen()
+        self.assertEqual(reloaded.get_transactions("mining"), [])
+
+    def test_compaction_truncates_journal(self):
+        self.dm.add_transaction("mining", 200.0, "Ore")
+        self.dm.flush()
+        self.dm._save_data_sync()
+
+        self.assertFalse(os.path.exists(self.dm.journal.path))
+        with open(self.test_file, encoding="utf-8") as f:
+            snapshot = json.load(f)
+        self.assertEqual(snapshot["_metadata"]["journal_seq"], self.dm.journal.last_seq)
+
+        reloaded = self.reopen()
+        self.assertEqual(len(reloaded.get_transactions("mining")), 1)
+
+    def test_apply_op_is_idempotent(self):
+        data = {"profiles": [{"id": "p1", "mining": {"transactions": [{"id": "a"}]}}]}
+        op = {"op": "insert", "path": ["profiles", "p1", "mining", "transactions"], "index": 0, "value": {"id": "b"}}
+        apply_op(data, op)
+        apply_op(data, op)
+        self.assertEqual(data["profiles"][0]["mining"]["transactions"], [{"id": "b"}, {"id": "a"}])
+
+        apply_op(data, {"op": "set", "path": ["global", "theme"], "value": "dark"})
+        self.assertEqual(data["global"], {"theme": "dark"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+import data_manager
+from data_manager import DataManager
+
+
+class TestImagePathCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.images_dir = os.path.join(self.tmp_dir, "images")
+        os.makedirs(self.images_dir)
+        for patcher in (patch.object(data_manager, "DATA_DIR", self.tmp_dir),
+                        patch.object(data_manager, "IMAGES_DIR", self.images_dir)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.dm = DataManager(os.path.join(self.tmp_dir, "data.json"))
+
+    def tearDown(self):
+        self.dm.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _add_image(self, name):
+        path = os.path.join(self.images_dir, name)
+        with open(path, "wb") as f:
+            f.write(b"png")
+        return path
+
+    def test_resolves_from_directory_listing_once(self):
+        expected = self._add_image("car.png")
+        with patch("os.listdir", wraps=os.listdir) as listdir:
+            self.assertEqual(self.dm.resolve_image_path("car.png"), expected)
+            listed = listdir.call_count
+            self.assertEqual(self.dm.resolve_image_path("/old/machine/images/car.png"), expected)
+            self.assertEqual(self.dm.resolve_image_path("car.png"), expected)
+            self.assertEqual(listdir.call_count, listed)
+
+    def test_miss_is_cached_until_invalidated(self):
+        with self.assertLogs(level="WARNING") as logs:
+            fallback = self.dm.resolve_image_path("later.png")
+            self.dm.resolve_image_path("later.png")
+        self.assertEqual(len([line for line in logs.output if "later.png" in line]), 1)
+        self.assertEqual(fallback, os.path.join(self.tmp_dir, "later.png"))
+
+        expected = self._add_image("later.png")
+        self.dm.invalidate_image_paths(self.images_dir)
+        self.assertEqual(self.dm.resolve_image_path("later.png"), expected)
+
+    def test_store_references_and_data_uris_bypass_cache(self):
+        ref = "sha256:" + "ab" * 32
+        self.assertEqual(self.dm.resolve_image_path(ref), self.dm.image_store.path(ref))
+        self.assertEqual(self.dm.resolve_image_path("data:image/png;base64,AAAA"), "data:image/png;base64,AAAA")
+        self.assertEqual(self.dm._resolved_paths, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
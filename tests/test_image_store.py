@@ -0,0 +1,85 @@
+import unittest
+import os
+import base64
+import shutil
+import tempfile
+from image_store import ImageStore, is_ref
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+DATA_URI = "data:image/png;base64," + base64.b64encode(PNG_BYTES).decode()
+
+
+class TestImageStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = ImageStore(os.path.join(self.tmp_dir, "blobs"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_put_is_content_addressed(self):
+        ref = self.store.put(PNG_BYTES)
+        self.assertTrue(is_ref(ref))
+        self.assertEqual(self.store.put(PNG_BYTES), ref)
+        self.assertEqual(self.store.get(ref), PNG_BYTES)
+        blob_files = [f for _, _, files in os.walk(self.store.root) for f in files]
+        self.assertEqual(len(blob_files), 1)
+
+    def test_extract_inline_replaces_nested_data_uris(self):
+        data = {"profiles": [{
+            "mining": {"transactions": [{"id": "t1", "image_path": DATA_URI}, {"id": "t2", "image_path": DATA_URI}]},
+            "memos": [{"image_path": "images/local.png"}],
+        }]}
+        self.assertEqual(self.store.extract_inline(data), 2)
+        transactions = data["profiles"][0]["mining"]["transactions"]
+        self.assertEqual(transactions[0]["image_path"], transactions[1]["image_path"])
+        self.assertTrue(is_ref(transactions[0]["image_path"]))
+        self.assertEqual(data["profiles"][0]["memos"][0]["image_path"], "images/local.png")
+        self.assertEqual(self.store.extract_inline(data), 0)
+
+    def test_malformed_data_uri_is_kept(self):
+        data = {"image_path": "data:image/png;base64"}
+        self.assertEqual(self.store.extract_inline(data), 0)
+        self.assertEqual(data["image_path"], "data:image/png;base64")
+
+    def test_inline_refs_round_trip(self):
+        ref = self.store.put(PNG_BYTES)
+        record = {"photo_path": ref, "missing": "sha256:" + "0" * 64}
+        portable = self.store.inline_refs(record)
+        self.assertEqual(portable["photo_path"], DATA_URI)
+        self.assertEqual(portable["missing"], record["missing"])
+        self.assertEqual(record["photo_path"], ref)
+
+    def test_copy_to_adds_missing_blobs_only(self):
+        ref = self.store.put(PNG_BYTES)
+        backup = ImageStore(os.path.join(self.tmp_dir, "backup_blobs"))
+        self.assertEqual(self.store.copy_to(backup.root), 1)
+        self.assertEqual(backup.get(ref), PNG_BYTES)
+        self.assertEqual(self.store.copy_to(backup.root), 0)
+
+
+class TestBackupImages(unittest.TestCase):
+    def setUp(self):
+        from data_manager import DataManager
+        self.tmp_dir = tempfile.mkdtemp()
+        self.dm = DataManager(os.path.join(self.tmp_dir, "data.json"))
+
+    def tearDown(self):
+        self.dm.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_restore_brings_back_lost_blobs(self):
+        ref = self.dm.image_store.put(PNG_BYTES)
+        self.dm.add_transaction("mining", 10.0, "Ore", date_str="01.02.2026", image_path=ref)
+        self.dm._save_data_sync()
+        self.dm.create_backup()
+        backup_dir = os.path.join(self.tmp_dir, "backups")
+        backup = os.path.join(backup_dir, sorted(f for f in os.listdir(backup_dir) if f.endswith(".json"))[-1])
+
+        shutil.rmtree(self.dm.image_store.root)
+        self.assertTrue(self.dm.restore_from_backup(backup))
+        self.assertEqual(self.dm.image_store.get(ref), PNG_BYTES)
+
+
+if __name__ == "__main__":
+    unittest.main()
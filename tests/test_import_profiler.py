@@ -0,0 +1,97 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import subprocess
+import import_profiler
+from import_profiler import ImportProfiler, lazy_module
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold `import main` must stay under this many seconds (override with IMPORT_BUDGET_S)
+IMPORT_BUDGET_S = float(os.environ.get("IMPORT_BUDGET_S", "1.0"))
+
+
+class TestImportProfiler(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.temp_dir, "profiled_outer.py"), "w") as f:
+            f.write("import time\ntime.sleep(0.02)\nimport profiled_inner\n")
+        with open(os.path.join(self.temp_dir, "profiled_inner.py"), "w") as f:
+            f.write("import time\ntime.sleep(0.03)\nVALUE = 42\n")
+        sys.path.insert(0, self.temp_dir)
+
+    def tearDown(self):
+        sys.path.remove(self.temp_dir)
+        for name in ("profiled_outer", "profiled_inner"):
+            sys.modules.pop(name, None)
+
+    def test_self_and_cumulative_time(self):
+        profiler = ImportProfiler()
+        profiler.start()
+        try:
+            import profiled_outer
+        finally:
+            profiler.stop()
+
+        records = {name: (self_time, cumulative, depth) for name, self_time, cumulative, depth in profiler.records}
+        outer_self, outer_cumulative, outer_depth = records["profiled_outer"]
+        inner_self, inner_cumulative, inner_depth = records["profiled_inner"]
+
+        self.assertEqual((outer_depth, inner_depth), (0, 1))
+        self.assertGreaterEqual(inner_self, 0.03)
+        self.assertGreaterEqual(outer_cumulative, outer_self + inner_cumulative - 1e-6)
+        self.assertLess(outer_self, outer_cumulative - 0.02)
+        self.assertAlmostEqual(ImportProfiler.total(profiler.records), outer_cumulative, places=6)
+
+    def test_stop_restores_import_and_report_is_incremental(self):
+        import builtins
+        original = builtins.__import__
+        profiler = ImportProfiler()
+        profiler.start()
+        import profiled_inner
+        profiler.stop()
+        self.assertIs(builtins.__import__, original)
+
+        with self.assertLogs(level="INFO"):
+            self.assertGreater(profiler.report(), 0)
+        with self.assertLogs(level="INFO"):
+            self.assertEqual(profiler.report(), 0)
+
+    def test_lazy_module_runs_on_first_access(self):
+        module = lazy_module("profiled_inner")
+        self.assertIs(sys.modules["profiled_inner"], module)
+        self.assertEqual(module.VALUE, 42)
+        self.assertIs(lazy_module("profiled_inner"), module)
+
+    def test_enabled_flag(self):
+        self.assertTrue(import_profiler.enabled(["main.py", "--profile-imports"]))
+        os.environ.pop(import_profiler.PROFILE_ENV, None)
+        self.assertFalse(import_profiler.enabled(["main.py"]))
+
+
+class TestStartupImportBudget(unittest.TestCase):
+    def test_cold_import_of_main(self):
+        script = (
+            "import sys, time, json\n"
+            "started = time.perf_counter()\n"
+            "import main\n"
+            "elapsed = time.perf_counter() - started\n"
+            "heavy = [m for m in ('gui.main_window', 'sqlalchemy', 'requests') if m in sys.modules and "
+            "type(sys.modules[m]).__name__ == 'module']\n"
+            "print(json.dumps({'elapsed': elapsed, 'heavy': heavy}))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script], cwd=ROOT_DIR, capture_output=True, text=True, timeout=60
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+
+        self.assertEqual(report["heavy"], [], "Heavy modules are imported before login")
+        self.assertLess(report["elapsed"], IMPORT_BUDGET_S,
+                        f"Cold import of main took {report['elapsed']:.2f}s; run with --profile-imports to find the cause")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+import json_codec
+
+
+class TestJsonCodec(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data = {"profiles": [{"id": "p1", "name": "Профиль", "amount": 12.5, "tags": [1, None, True]}],
+                     "active_profile_id": "p1"}
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_round_trip_matches_stdlib(self):
+        raw = json_codec.dumps(self.data)
+        self.assertIsInstance(raw, bytes)
+        self.assertEqual(json_codec.loads(raw), self.data)
+        self.assertEqual(json.loads(raw.decode("utf-8")), self.data)
+        self.assertIn("Профиль".encode("utf-8"), raw)
+
+    def test_non_string_keys_and_big_ints(self):
+        self.assertEqual(json_codec.loads(json_codec.dumps({1: "a"})), {"1": "a"})
+        self.assertEqual(json_codec.loads(json_codec.dumps({"n": 2 ** 70})), {"n": 2 ** 70})
+
+    def test_load_file_returns_raw_bytes_and_skips_bom(self):
+        path = os.path.join(self.tmp_dir, "data.json")
+        with open(path, "w", encoding="utf-8-sig") as f:
+            json.dump(self.data, f, ensure_ascii=False)
+        data, raw = json_codec.load_file(path)
+        self.assertEqual(data, self.data)
+        with open(path, "rb") as f:
+            self.assertEqual(raw, f.read())
+
+    def test_decode_error(self):
+        with self.assertRaises(json_codec.DecodeError):
+            json_codec.loads(b"{broken")
+
+    def test_digest_is_stable(self):
+        raw = json_codec.dumps(self.data)
+        self.assertEqual(json_codec.digest(raw), json_codec.digest(bytes(raw)))
+        self.assertNotEqual(json_codec.digest(raw), json_codec.digest(raw + b" "))
+
+
+if __name__ == "__main__":
+    unittest.main()
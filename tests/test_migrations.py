@@ -0,0 +1,104 @@
+import unittest
+import os
+import json
+import time
+import shutil
+import tempfile
+from unittest.mock import patch
+from PyQt6.QtWidgets import QApplication
+from data_manager import DataManager
+
+# Ensure QApplication exists
+app = QApplication.instance() or QApplication([])
+
+
+def legacy_data():
+    return {
+        "profiles": [{
+            "id": "p1",
+            "name": "Legacy",
+            "starting_amount": 0.0,
+            "car_rental": [
+                {"id": "t1", "amount": 100.0, "comment": "Rent", "date": "2026-02-01"},
+            ],
+            "clothes": {"inventory": [], "sold_history": [{"id": "c1", "name": "Coat", "date_added": "01.01.2026 10:00"}]},
+        }],
+        "active_profile_id": "p1",
+    }
+
+
+class TestMigrationRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, "data.json")
+        with open(self.filename, "w", encoding="utf-8") as f:
+            json.dump(legacy_data(), f)
+        self.managers = []
+
+    def tearDown(self):
+        for dm in self.managers:
+            dm.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _open(self, **kwargs):
+        dm = DataManager(self.filename, **kwargs)
+        self.managers.append(dm)
+        return dm
+
+    def test_first_launch_applies_and_records_everything(self):
+        dm = self._open(save_delay=0)
+        profile = dm.get_active_profile()
+        transaction = profile["car_rental"]["transactions"][0]
+        self.assertEqual(transaction["date"], "01.02.2026")
+        self.assertIn("date_ord", transaction)
+        self.assertEqual(profile["clothes"]["sold_history"][0]["date_sold"], "01.01.2026 10:00")
+
+        self.assertEqual(dm.pending_migrations(), [])
+        self.assertEqual(dm.data["_metadata"]["migrations"], [m[0] for m in DataManager.MIGRATIONS])
+
+    def test_clean_launch_skips_scans(self):
+        dm = self._open(save_delay=0)
+        dm.flush()
+
+        with patch.object(DataManager, "migrate_profiles") as migrate_profiles, \
+             patch.object(DataManager, "migrate_dates_to_russian_format") as migrate_dates:
+            reopened = self._open(save_delay=0)
+        migrate_profiles.assert_not_called()
+        migrate_dates.assert_not_called()
+        self.assertEqual(reopened.pending_migrations(), [])
+
+    def test_new_migration_runs_alone(self):
+        dm = self._open(save_delay=0)
+        dm.flush()
+
+        calls = []
+        registry = DataManager.MIGRATIONS + [("9999_test", "migrate_test", False)]
+        with patch.object(DataManager, "MIGRATIONS", registry), \
+             patch.object(DataManager, "migrate_test", lambda self: calls.append("test"), create=True), \
+             patch.object(DataManager, "migrate_profiles") as migrate_profiles:
+            reopened = self._open(save_delay=0)
+        self.assertEqual(calls, ["test"])
+        migrate_profiles.assert_not_called()
+        self.assertIn("9999_test", reopened.data["_metadata"]["migrations"])
+
+    def test_deferred_migrations_run_from_event_loop(self):
+        dm = self._open(save_delay=0, defer_migrations=True)
+        progress = []
+        dm.migration_progress.connect(lambda *args: progress.append(args))
+        # Nothing touches the data before the event loop runs
+        deferred = [m[0] for m in DataManager.MIGRATIONS if m[2]]
+        self.assertEqual([m[0] for m in dm.pending_migrations()], deferred)
+
+        deadline = time.time() + 5
+        while dm.pending_migrations() and time.time() < deadline:
+            app.processEvents()
+            time.sleep(0.01)
+        app.processEvents()
+
+        self.assertEqual(dm.pending_migrations(), [])
+        self.assertEqual(progress, [(migration_id, i, len(deferred)) for i, migration_id in enumerate(deferred, 1)])
+        self.assertEqual(dm.get_active_profile()["car_rental"]["transactions"][0]["date"], "01.02.2026")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import copy
+import random
+from utils import Money
+from data_manager import tx_amount_minor
+
+
+class TestMoney(unittest.TestCase):
+    def test_to_minor_matches_from_major_rounding(self):
+        rng = random.Random(7)
+        values = [0.005, 0.015, 1.005, 2.675, -0.125, 100.05, "12.34", 5, None, "abc", ""]
+        values += [round(rng.uniform(-1e6, 1e6), rng.randint(0, 4)) for _ in range(5000)]
+        for value in values:
+            try:
+                expected = round(float(value) * 100)
+            except (ValueError, TypeError):
+                expected = 0
+            self.assertEqual(Money.to_minor(value), expected, value)
+            self.assertEqual(Money.from_major(value).amount, expected, value)
+
+    def test_sum_major(self):
+        values = [0.1, 0.2, "0.3", None, -1.005]
+        self.assertEqual(Money.sum_major(values).amount, sum(Money.from_major(v).amount for v in values))
+        self.assertEqual(Money.sum_major([]).amount, 0)
+
+    def test_immutable(self):
+        money = Money(150)
+        with self.assertRaises(AttributeError):
+            money.amount = 5
+        with self.assertRaises(AttributeError):
+            money.extra = 1
+        total = money
+        total += Money(50)
+        self.assertEqual((money.amount, total.amount), (150, 200))
+        self.assertEqual(copy.deepcopy(money), money)
+
+    def test_tx_amount_minor_fills_legacy_rows(self):
+        t = {"id": "t1", "amount": 19.99}
+        self.assertEqual(tx_amount_minor(t), 1999)
+        self.assertEqual(t["amount_minor"], 1999)
+
+
+if __name__ == "__main__":
+    unittest.main()
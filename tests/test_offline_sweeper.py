@@ -0,0 +1,62 @@
+import unittest
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from web import create_app, db
+from web.models import User, Client
+from web.offline_sweeper import OfflineSweeper
+
+
+class OfflineSweeperTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.config['TESTING'] = True
+        self.client = self.app.test_client()
+        self.sweeper = OfflineSweeper(chunk_size=2)
+        self.published = []
+        self.patcher = patch("web.offline_sweeper.dashboard_feed.publish", side_effect=self.published.append)
+        self.patcher.start()
+
+        with self.app.app_context():
+            db.create_all()
+            from werkzeug.security import generate_password_hash
+            user = User(username='admin', email='admin@test.com', password=generate_password_hash('password'))
+            db.session.add(user)
+            now = datetime.utcnow()
+            for i, (minutes, status) in enumerate([(0, 'Active'), (5, 'Active'), (6, 'Active'), (7, 'Active'), (8, 'Banned')], 1):
+                db.session.add(Client(client_id=f'hwid-{i}', version='1.0.8', status=status, last_seen=now - timedelta(minutes=minutes)))
+            db.session.commit()
+
+    def tearDown(self):
+        self.patcher.stop()
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def statuses(self):
+        with self.app.app_context():
+            return {c.client_id: c.status for c in Client.query.all()}
+
+    def test_stale_clients_are_marked_offline_and_published(self):
+        with self.app.app_context():
+            swept = self.sweeper.sweep()
+        self.assertEqual(sorted(swept), ['hwid-2', 'hwid-3', 'hwid-4'])
+        self.assertEqual(self.statuses(), {
+            'hwid-1': 'Active', 'hwid-2': 'Offline', 'hwid-3': 'Offline', 'hwid-4': 'Offline', 'hwid-5': 'Banned'
+        })
+        self.assertEqual(sorted(row['client_id'] for row in self.published), sorted(swept))
+        self.assertFalse(any(row['is_online'] for row in self.published))
+
+        with self.app.app_context():
+            self.assertEqual(self.sweeper.sweep(), [])
+
+    def test_dashboard_read_does_not_change_status(self):
+        with self.client:
+            self.client.post('/login', data=dict(email='admin@test.com', password='password'))
+            data = json.loads(self.client.get('/api/clients').data)
+        self.assertEqual([c['is_online'] for c in data], [True, False, False, False, False])
+        self.assertEqual(self.statuses()['hwid-2'], 'Active')
+
+
+if __name__ == '__main__':
+    unittest.main()
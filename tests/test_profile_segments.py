@@ -0,0 +1,159 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+from PyQt6.QtWidgets import QApplication
+from data_manager import DataManager
+from profile_segments import ProfileSegments, is_stub, stub
+
+# Ensure QApplication exists
+app = QApplication.instance() or QApplication([])
+
+
+class TestProfileSegments(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.segments = ProfileSegments(os.path.join(self.tmp_dir, "profiles"), max_loaded=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_roundtrip_and_unchanged_skip(self):
+        profile = {"id": "p1", "name": "Main", "car_rental": {"transactions": [{"id": "t1", "amount": 5.0}]}}
+        self.assertTrue(self.segments.write(profile, ["0001"]))
+        self.assertFalse(self.segments.write(profile, ["0001"]))
+        self.assertEqual(self.segments.read("p1"), (profile, ["0001"]))
+        # A freshly read segment is not rewritten either
+        self.assertFalse(self.segments.write(profile, ["0001"]))
+
+    def test_stub_keeps_header_only(self):
+        entry = stub({"id": "p1", "name": "Main", "starting_amount": 10.0, "car_rental": {}})
+        self.assertEqual(entry, {"id": "p1", "name": "Main", "starting_amount": 10.0, "_segment": True})
+        self.assertTrue(is_stub(entry))
+
+    def test_touch_evicts_least_recent(self):
+        self.assertEqual(self.segments.touch("a"), [])
+        self.assertEqual(self.segments.touch("b"), [])
+        self.assertEqual(self.segments.touch("a"), [])
+        self.assertEqual(self.segments.touch("c"), ["b"])
+
+
+class TestSegmentedDataManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, "data.json")
+        data = {"profiles": [], "active_profile_id": "p0"}
+        for i in range(5):
+            data["profiles"].append({
+                "id": f"p{i}", "name": f"Profile {i}", "starting_amount": 0.0,
+                "car_rental": {"transactions": [{"id": f"t{i}", "amount": 10.0 * i, "comment": "Rent", "date": "01.02.2026"}]},
+            })
+        with open(self.filename, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        self.managers = []
+
+    def tearDown(self):
+        for dm in self.managers:
+            dm.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _open(self, **kwargs):
+        dm = DataManager(self.filename, **kwargs)
+        self.managers.append(dm)
+        return dm
+
+    def test_index_holds_stubs_and_inactive_profiles_are_not_loaded(self):
+        dm = self._open(save_delay=0, segmented=True)
+        dm.flush()
+
+        with open(self.filename, encoding="utf-8") as f:
+            index = json.load(f)
+        self.assertTrue(all(is_stub(p) for p in index["profiles"]))
+        self.assertEqual(sorted(os.listdir(os.path.join(self.tmp_dir, "profiles"))), [f"p{i}.json" for i in range(5)])
+
+        loaded = [p["id"] for p in dm.data["profiles"] if not is_stub(p)]
+        self.assertEqual(loaded, ["p0"])
+
+    def test_switch_loads_on_demand_and_keeps_recent(self):
+        dm = self._open(save_delay=0, segmented=True)
+        dm.set_active_profile("p3")
+        self.assertEqual(dm.get_transactions("car_rental")[0]["amount"], 30.0)
+
+        for profile_id in ("p1", "p2", "p4"):
+            dm.set_active_profile(profile_id)
+        loaded = {p["id"] for p in dm.data["profiles"] if not is_stub(p)}
+        self.assertEqual(loaded, {"p1", "p2", "p4"})
+
+    def test_changes_survive_eviction_and_reopen(self):
+        dm = self._open(save_delay=0, segmented=True, journaled=True)
+        dm.add_transaction("car_rental", 7.0, "Journaled", date_str="02.02.2026")
+        dm.update_profile("p0", "Renamed", 5.0)
+        for profile_id in ("p1", "p2", "p3", "p4"):
+            dm.set_active_profile(profile_id)
+        dm.flush()
+
+        reopened = self._open(save_delay=0, segmented=True, journaled=True)
+        reopened.set_active_profile("p0")
+        profile = reopened.get_active_profile()
+        self.assertEqual(profile["name"], "Renamed")
+        self.assertEqual([t["comment"] for t in profile["car_rental"]["transactions"]], ["Journaled", "Rent"])
+
+    def test_delete_removes_segment(self):
+        dm = self._open(save_delay=0, segmented=True)
+        dm.delete_profile("p4")
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir, "profiles", "p4.json")))
+
+    def test_backup_restores_segments(self):
+        dm = self._open(save_delay=0, segmented=True)
+        dm.set_active_profile("p3")
+        dm.add_transaction("car_rental", 7.0, "Before backup", date_str="02.02.2026")
+        dm.set_active_profile("p0")
+        dm.flush()
+        dm.create_backup()
+        backup_dir = os.path.join(self.tmp_dir, "backups")
+        backup = os.path.join(backup_dir, sorted(f for f in os.listdir(backup_dir) if f.endswith(".json"))[-1])
+        self.assertTrue(os.path.isdir(backup[:-len(".json")] + ".profiles"))
+        # Saves back up the previous file too; within the same second they would replace this one
+        kept_dir = os.path.join(self.tmp_dir, "kept")
+        shutil.copytree(backup_dir, kept_dir)
+        backup = os.path.join(kept_dir, os.path.basename(backup))
+
+        dm.set_active_profile("p3")
+        dm.add_transaction("car_rental", 9.0, "After backup", date_str="03.02.2026")
+        dm.delete_profile("p4")
+        dm.flush()
+
+        self.assertTrue(dm.restore_from_backup(backup))
+        self.assertEqual(dm.segments.loaded_ids(), ["p0"])
+        dm.set_active_profile("p3")
+        self.assertEqual([t["comment"] for t in dm.get_transactions("car_rental")], ["Before backup", "Rent"])
+        dm.set_active_profile("p4")
+        self.assertEqual(dm.get_transactions("car_rental")[0]["amount"], 40.0)
+
+    def test_hot_reload_loads_profiles_like_startup(self):
+        dm = self._open(save_delay=0, segmented=True, journaled=True)
+        dm.set_active_profile("p2")
+        dm.set_active_profile("p0")
+        dm.flush()
+        dm.add_transaction("car_rental", 7.0, "Journaled", date_str="02.02.2026")
+
+        # Another instance renames a profile in the index
+        with open(self.filename, encoding="utf-8") as f:
+            index = json.load(f)
+        index["profiles"][1]["name"] = "Edited elsewhere"
+        with open(self.filename, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        dm.loader._on_file_changed(self.filename)
+
+        self.assertEqual(dm.segments.loaded_ids(), ["p0"])
+        profile = dm.get_active_profile()
+        self.assertFalse(is_stub(profile))
+        self.assertEqual([t["comment"] for t in profile["car_rental"]["transactions"]], ["Journaled", "Rent"])
+        self.assertEqual(dm.get_category_stats("car_rental")["income"], 7.0)
+        dm.set_active_profile("p1")
+        self.assertEqual(dm.get_active_profile()["name"], "Edited elsewhere")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import os
+import shutil
+import tempfile
+from datetime import date
+from data_manager import DataManager
+
+
+class TestRangeQueries(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.managers = {storage: self._make_dm(storage) for storage in ("json", "sqlite")}
+
+    def tearDown(self):
+        for dm in self.managers.values():
+            dm.close()
+            if dm.store:
+                dm.store.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _make_dm(self, storage):
+        folder = os.path.join(self.tmp_dir, storage)
+        os.makedirs(folder)
+        dm = DataManager(os.path.join(folder, "data.json"), storage=storage)
+        dm.data = {"profiles": [], "active_profile_id": None}
+        dm.create_profile("Range Profile", 0.0)
+        dm.add_transaction("car_rental", 1000.0, "Rent", date_str="01.02.2026", ad_cost=100.0)
+        dm.add_transaction("car_rental", -250.5, "Repair", date_str="03.02.2026")
+        dm.add_transaction("car_rental", 400.0, "Rent", date_str="10.02.2026")
+        dm.add_transaction("car_rental", 300.0, "Rent", date_str="01.03.2026")
+        return dm
+
+    def test_query_window_and_paging(self):
+        for storage, dm in self.managers.items():
+            feb = dm.query_transactions("car_rental", date(2026, 2, 1), date(2026, 2, 28))
+            self.assertEqual([t["comment"] for t in feb], ["Rent", "Repair", "Rent", "Объявление: "], storage)
+
+            page = dm.query_transactions("car_rental", date(2026, 2, 1), date(2026, 2, 28), limit=2, offset=1)
+            self.assertEqual([t["amount"] for t in page], [-250.5, 1000.0], storage)
+            self.assertEqual(len(dm.query_transactions("car_rental", limit=3)), 3, storage)
+            self.assertEqual(len(dm.query_transactions("car_rental", end=date(2026, 2, 5))), 3, storage)
+
+    def test_sum_range(self):
+        for storage, dm in self.managers.items():
+            self.assertEqual(dm.sum_range("car_rental", date(2026, 2, 1), date(2026, 2, 28)), (1400.0, 350.5), storage)
+            self.assertEqual(dm.sum_range("car_rental", date(2026, 3, 1)), (300.0, 0.0), storage)
+            self.assertEqual(dm.sum_range("car_rental", date(2026, 4, 1), date(2026, 4, 30)), (0.0, 0.0), storage)
+
+    def test_sum_range_counts_legacy_ad_cost_field(self):
+        dm = self.managers["json"]
+        tx = dm.add_transaction("mining", 200.0, "Ore", date_str="05.02.2026", ad_cost=20.0)
+        window = (date(2026, 2, 5), date(2026, 2, 5))
+        self.assertEqual(dm.sum_range("mining", *window, with_ad_costs=True), (200.0, 20.0))
+
+        # Without the separate row the ad_cost field is what counts
+        ad_row = dm.get_transactions("mining")[1]
+        dm.delete_transaction("mining", ad_row["id"])
+        self.assertEqual(dm.sum_range("mining", *window), (200.0, 0.0))
+        self.assertEqual(dm.sum_range("mining", *window, with_ad_costs=True), (200.0, 20.0))
+        self.assertEqual(tx["ad_cost"], 20.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
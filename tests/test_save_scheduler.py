@@ -0,0 +1,135 @@
+import unittest
+import os
+import json
+import time
+import shutil
+import tempfile
+import threading
+from unittest.mock import patch
+from PyQt6.QtWidgets import QApplication
+from save_scheduler import SaveScheduler
+from data_manager import DataManager
+
+# Ensure QApplication exists
+app = QApplication.instance() or QApplication([])
+
+
+class TestSaveScheduler(unittest.TestCase):
+    def setUp(self):
+        self.saves = []
+        self.scheduler = SaveScheduler(lambda: self.saves.append(time.monotonic()), delay=0.05, max_delay=0.5)
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def _wait_for_saves(self, count, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while len(self.saves) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_burst_is_written_once(self):
+        for _ in range(50):
+            self.scheduler.request()
+        self._wait_for_saves(1)
+        time.sleep(0.1)
+        self.assertEqual(len(self.saves), 1)
+        stats = self.scheduler.stats()
+        self.assertEqual(stats["writes"], 1)
+        self.assertEqual(stats["coalesced"], 49)
+        self.assertEqual(stats["queue_depth"], 0)
+
+    def test_concurrent_requests_coalesce(self):
+        threads = [threading.Thread(target=self.scheduler.request) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self._wait_for_saves(1)
+        time.sleep(0.1)
+        self.assertEqual(len(self.saves), 1)
+
+    def test_max_delay_bounds_a_long_burst(self):
+        self.scheduler.max_delay = 0.1
+        started = time.monotonic()
+        while time.monotonic() - started < 0.3:
+            self.scheduler.request()
+            time.sleep(0.01)
+        self.assertGreaterEqual(len(self.saves), 2)
+
+    def test_flush_writes_pending_synchronously(self):
+        self.scheduler.delay = 10
+        self.scheduler.request()
+        self.assertEqual(self.scheduler.stats()["queue_depth"], 1)
+        self.assertTrue(self.scheduler.flush())
+        self.assertEqual(len(self.saves), 1)
+        self.assertFalse(self.scheduler.flush())
+
+    def test_discard_pending_skips_covered_write(self):
+        self.scheduler.request()
+        self.scheduler.discard_pending()
+        self.assertFalse(self.scheduler.flush())
+        time.sleep(0.1)
+        self.assertEqual(self.saves, [])
+
+    def test_discard_pending_keeps_later_requests(self):
+        self.scheduler.delay = 10
+        self.scheduler.request()
+        mark = self.scheduler.mark()
+        self.scheduler.request()
+        self.scheduler.discard_pending(mark)
+        self.assertEqual(self.scheduler.stats()["queue_depth"], 1)
+
+    def test_failed_write_stays_pending(self):
+        calls = []
+
+        def failing_save():
+            calls.append(1)
+            raise OSError("disk full")
+
+        scheduler = SaveScheduler(failing_save, delay=10)
+        scheduler.request()
+        with self.assertRaises(OSError):
+            scheduler.flush()
+        self.assertEqual(scheduler.stats()["queue_depth"], 1)
+        self.assertEqual(scheduler.stats()["writes"], 0)
+        scheduler.save_fn = lambda: None
+        scheduler.stop()
+
+    def test_exit_hook_logs_write_errors(self):
+        def failing_save():
+            raise OSError("folder removed")
+
+        scheduler = SaveScheduler(failing_save, delay=10)
+        scheduler.request()
+        with self.assertLogs(level="ERROR"):
+            scheduler._flush_at_exit()
+        scheduler.save_fn = lambda: None
+        scheduler.stop()
+        self.assertFalse(scheduler._atexit_registered)
+
+
+
+class TestDataManagerSave(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.dm = DataManager(os.path.join(self.tmp_dir, "data.json"), save_delay=10)
+
+    def tearDown(self):
+        self.dm.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_failed_save_is_retried(self):
+        self.dm.create_profile("Saved later", 500.0)
+        with patch("data_manager.json_codec.dumps", side_effect=ValueError("unserializable")):
+            with self.assertRaises(OSError):
+                self.dm.flush()
+        self.assertGreater(self.dm.get_save_stats()["queue_depth"], 0)
+
+        self.dm.flush()
+        self.assertEqual(self.dm.get_save_stats()["queue_depth"], 0)
+        with open(self.dm.filename, encoding="utf-8") as f:
+            self.assertIn("Saved later", [p["name"] for p in json.load(f)["profiles"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import json
+from sqlalchemy import event
+from web import create_app, db
+from web.models import User
+from web.cache import TTLCache
+from web import routes
+
+
+class TTLCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.cache = TTLCache(ttl=10, max_entries=2, clock=lambda: self.now)
+
+    def test_entries_expire(self):
+        self.cache.put("a", 1)
+        self.now = 9.9
+        self.assertEqual(self.cache.get("a"), 1)
+        self.now = 10.0
+        self.assertIsNone(self.cache.get("a"))
+
+    def test_oldest_entries_are_dropped(self):
+        for key in ("a", "b", "c"):
+            self.cache.put(key, key)
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(len(self.cache), 2)
+
+    def test_invalidate(self):
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.cache.invalidate("a")
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.invalidate()
+        self.assertEqual(len(self.cache), 0)
+
+
+class SettingsCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.config['TESTING'] = True
+        self.client = self.app.test_client()
+        routes.invalidate_settings()
+
+        with self.app.app_context():
+            db.create_all()
+            from werkzeug.security import generate_password_hash
+            user = User(username='admin', email='admin@test.com', password=generate_password_hash('password'))
+            db.session.add(user)
+            db.session.commit()
+
+    def tearDown(self):
+        routes.invalidate_settings()
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_update_info_is_cached_until_admin_change(self):
+        self.assertEqual(self.client.get('/update_info').status_code, 200)
+
+        statements = []
+        with self.app.app_context():
+            listener = lambda *args: statements.append(args[2])
+            event.listen(db.engine, "before_cursor_execute", listener)
+            try:
+                self.client.get('/update_info')
+                self.assertEqual(statements, [])
+            finally:
+                event.remove(db.engine, "before_cursor_execute", listener)
+
+        with self.client:
+            self.client.post('/login', data=dict(email='admin@test.com', password='password'))
+            response = self.client.post('/api/set_version', json={"stable_version": "2.0.0", "priority": "stable"})
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(self.client.get('/update_info').data)["version"], "2.0.0")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+import sqlite3
+from data_manager import DataManager
+
+
+class TestSQLiteStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.json_dm = self._make_dm("json")
+        self.sql_dm = self._make_dm("sqlite")
+
+    def tearDown(self):
+        for dm in (self.json_dm, self.sql_dm):
+            dm.close()
+            if dm.store:
+                dm.store.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _make_dm(self, storage):
+        folder = os.path.join(self.tmp_dir, storage)
+        os.makedirs(folder)
+        dm = DataManager(os.path.join(folder, "data.json"), storage=storage)
+        dm.data = {"profiles": [], "active_profile_id": None}
+        dm.create_profile("Storage Profile", 1000.0)
+        return dm
+
+    def _apply(self, dm):
+        dm.add_transaction("car_rental", 1000.0, "Rent", date_str="01.02.2026", item_name="Car", ad_cost=100.0)
+        dm.add_transaction("car_rental", -250.5, "Repair", date_str="03.02.2026", item_name="Car")
+        tx = dm.add_transaction("car_rental", 400.0, "Rent", date_str="02.02.2026", item_name="Bike")
+        dm.update_transaction("car_rental", tx["id"], 450.0, "Rent", "02.02.2026", "Bike", ad_cost=50.0)
+        dm.add_transaction("fishing", -500.0, "Tackle", item_name="Rod")
+        dm.add_transaction("fishing", 2000.0, "Pike")
+        dm.add_trade_item("cars_trade", "Banshee", 4000.0, "")
+        dm.add_trade_item("cars_trade", "Comet", 3000.0, "", coa_price=100.0)
+        item = next(i for i in dm.get_trade_inventory("cars_trade") if i["name"] == "Banshee")
+        dm.sell_trade_item("cars_trade", item["id"], 5000.0)
+
+    def test_same_results_as_json(self):
+        self._apply(self.json_dm)
+        self._apply(self.sql_dm)
+
+        for cat in ["car_rental", "mining", "fishing", "cars_trade", "clothes"]:
+            self.assertEqual(self.sql_dm.get_category_stats(cat), self.json_dm.get_category_stats(cat), cat)
+            self.assertEqual(self.sql_dm.get_item_stats(cat), self.json_dm.get_item_stats(cat), cat)
+        self.assertEqual(self.sql_dm.get_total_capital_balance(), self.json_dm.get_total_capital_balance())
+
+        strip = lambda txs: [(t["date"], t["amount"], t.get("is_ad_cost", False)) for t in txs]
+        self.assertEqual(strip(self.sql_dm.get_transactions("car_rental")), strip(self.json_dm.get_transactions("car_rental")))
+        self.assertEqual(len(self.sql_dm.get_trade_sold("cars_trade")), 1)
+        self.assertEqual(self.sql_dm.get_trade_inventory("cars_trade")[0]["name"], "Comet")
+
+    def test_delete_removes_ad_cost(self):
+        tx = self.sql_dm.add_transaction("mining", 200.0, "Ore", item_name="Ore", ad_cost=20.0)
+        self.assertEqual(len(self.sql_dm.get_transactions("mining")), 2)
+        self.assertTrue(self.sql_dm.delete_transaction("mining", tx["id"]))
+        self.assertEqual(self.sql_dm.get_transactions("mining"), [])
+
+    def test_migrates_existing_json(self):
+        self._apply(self.json_dm)
+        self.json_dm._save_data_sync()
+        expected = self.json_dm.get_total_capital_balance()
+
+        migrated = DataManager(self.json_dm.filename, storage="sqlite")
+        try:
+            profile = migrated.get_active_profile()
+            self.assertEqual(profile["car_rental"]["transactions"], [])
+            self.assertEqual(profile["cars_trade"]["inventory"], [])
+            self.assertEqual(len(migrated.get_transactions("car_rental")), 5)
+            self.assertEqual(migrated.get_total_capital_balance(), expected)
+
+            full = migrated.get_full_profile(profile)
+            self.assertEqual(len(full["car_rental"]["transactions"]), 5)
+            self.assertEqual(len(full["cars_trade"]["sold_history"]), 1)
+        finally:
+            migrated.close()
+            migrated.store.close()
+
+    def _latest_backup(self, dm):
+        backup_dir = os.path.join(os.path.dirname(dm.filename), "backups")
+        return os.path.join(backup_dir, sorted(f for f in os.listdir(backup_dir) if f.endswith(".json"))[-1])
+
+    def test_backup_restores_stored_rows(self):
+        tx = self.sql_dm.add_transaction("car_rental", 1000.0, "Rent", date_str="01.02.2026")
+        self.sql_dm._save_data_sync()
+        self.sql_dm.create_backup()
+        backup = self._latest_backup(self.sql_dm)
+        self.assertTrue(os.path.exists(backup[:-len(".json")] + ".ledger.db"))
+
+        self.sql_dm.delete_transaction("car_rental", tx["id"])
+        self.assertTrue(self.sql_dm.restore_from_backup(backup))
+        self.assertEqual([t["id"] for t in self.sql_dm.get_transactions("car_rental")], [tx["id"]])
+        self.assertEqual(self.sql_dm.get_category_stats("car_rental")["income"], 1000.0)
+
+    def test_switching_back_to_json_keeps_history(self):
+        self._apply(self.sql_dm)
+        expected = self.sql_dm.get_total_capital_balance()
+        self.sql_dm._save_data_sync()
+        self.sql_dm.close()
+        self.sql_dm.store.close()
+
+        self.json_dm.close()
+        self.json_dm = DataManager(self.sql_dm.filename, storage="json")
+        self.assertEqual(len(self.json_dm.get_transactions("car_rental")), 5)
+        self.assertEqual(self.json_dm.get_total_capital_balance(), expected)
+
+        # And forward again: the exported rows are not doubled, deletions stay deleted
+        tx = self.json_dm.get_transactions("fishing")[0]
+        self.json_dm.delete_transaction("fishing", tx["id"])
+        self.json_dm._save_data_sync()
+        self.json_dm.close()
+        self.sql_dm = DataManager(self.sql_dm.filename, storage="sqlite")
+        self.assertEqual(len(self.sql_dm.get_transactions("fishing")), 1)
+        self.assertEqual(len(self.sql_dm.get_transactions("car_rental")), 5)
+
+    def test_import_keeps_existing_rows(self):
+        tx = self.sql_dm.add_transaction("mining", 200.0, "Ore", date_str="01.02.2026")
+        profile = self.sql_dm.get_active_profile()
+        changed = dict(tx, amount=999.0)
+        new = {"id": "imported", "date": "02.02.2026", "amount": 50.0, "comment": "New"}
+        imported = {"profiles": [{"id": profile["id"], "name": profile["name"], "mining": {"transactions": [changed, new]}}]}
+
+        self.assertEqual(self.sql_dm.import_profile_data(imported), 1)
+        amounts = sorted(t["amount"] for t in self.sql_dm.get_transactions("mining"))
+        self.assertEqual(amounts, [50.0, 200.0])
+
+    def test_json_user_leaves_engine_database_alone(self):
+        # data.db is DatabaseManager's SQLAlchemy file and exists for every user
+        folder = os.path.dirname(self.json_dm.filename)
+        engine_db = os.path.join(folder, "data.db")
+        with sqlite3.connect(engine_db) as conn:
+            conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY)")
+        conn.close()
+        self.json_dm._save_data_sync()
+        self.json_dm.close()
+        # Saved before the storage location was recorded
+        with open(self.json_dm.filename, encoding="utf-8") as f:
+            data = json.load(f)
+        del data["_metadata"]["storage_backend"]
+        with open(self.json_dm.filename, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+        self.json_dm = DataManager(self.json_dm.filename, storage="json")
+        with sqlite3.connect(engine_db) as conn:
+            tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        conn.close()
+        self.assertEqual(tables, ["users"])
+        self.assertFalse(os.path.exists(os.path.join(folder, "ledger.db")))
+        self.assertEqual(self.json_dm._storage_location(), "json")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import time
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+from gui.tab_warmup import TabWarmupScheduler
+
+# Ensure QApplication exists
+app = QApplication.instance() or QApplication([])
+
+
+def run_events(ms):
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+class TestTabWarmupScheduler(unittest.TestCase):
+    def test_builds_in_priority_order_one_per_slice(self):
+        built = []
+        scheduler = TabWarmupScheduler(built.append, min_gap_ms=10, input_quiet_ms=0)
+        scheduler.start([3, 1, 2])
+        run_events(200)
+        self.assertEqual(built, [3, 1, 2])
+        self.assertEqual(scheduler.pending(), [])
+
+    def test_discard_skips_tab_built_on_demand(self):
+        built = []
+        scheduler = TabWarmupScheduler(built.append, min_gap_ms=10, input_quiet_ms=0)
+        scheduler.start([0, 1, 2], delay_ms=50)
+        scheduler.discard(1)
+        run_events(200)
+        self.assertEqual(built, [0, 2])
+
+    def test_slow_build_delays_next_slice(self):
+        built = []
+
+        def slow_build(index):
+            built.append(index)
+            time.sleep(0.04)
+
+        scheduler = TabWarmupScheduler(slow_build, slice_budget_ms=8, min_gap_ms=20, input_quiet_ms=0)
+        scheduler.start([0, 1])
+        # 40 ms build is 5x the budget, so the next slice waits ~100 ms
+        run_events(80)
+        self.assertEqual(built, [0])
+        run_events(150)
+        self.assertEqual(built, [0, 1])
+
+    def test_failing_build_does_not_stop_warmup(self):
+        built = []
+
+        def build(index):
+            if index == 0:
+                raise RuntimeError("broken tab")
+            built.append(index)
+
+        scheduler = TabWarmupScheduler(build, min_gap_ms=10, input_quiet_ms=0)
+        scheduler.start([0, 1])
+        run_events(150)
+        self.assertEqual(built, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
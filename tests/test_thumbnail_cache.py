@@ -0,0 +1,85 @@
+import unittest
+import os
+import shutil
+import tempfile
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QImage, QColor
+from thumbnail_cache import ThumbnailCache, PixmapLRU, decode_image, prune_thumbnails, size_bucket
+
+# Ensure QApplication exists
+app = QApplication.instance() or QApplication([])
+
+
+class TestThumbnailCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.thumbs_dir = os.path.join(self.tmp_dir, "thumbs")
+        self.photo = os.path.join(self.tmp_dir, "photo.png")
+        image = QImage(2000, 1000, QImage.Format.Format_RGB32)
+        image.fill(QColor("red"))
+        image.save(self.photo, "PNG")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _thumb_files(self):
+        return [os.path.join(root, f) for root, _, files in os.walk(self.thumbs_dir) for f in files]
+
+    def test_size_bucket(self):
+        self.assertEqual(size_bucket((60, 60)), 64)
+        self.assertEqual(size_bucket((164, 110)), 256)
+        self.assertIsNone(size_bucket((2000, 2000)))
+
+    def test_decode_writes_pyramid_level_and_reuses_it(self):
+        image, error = decode_image(self.photo, self.photo, (200, 200), self.thumbs_dir)
+        self.assertIsNone(error)
+        self.assertEqual((image.width(), image.height()), (200, 100))
+        files = self._thumb_files()
+        self.assertEqual(len(files), 1)
+        self.assertIn(os.path.join("thumbs", "256"), files[0])
+        self.assertEqual(QImage(files[0]).width(), 256)
+
+        # Same bucket, other size: served from the stored level
+        image, _ = decode_image(self.photo, self.photo, (250, 250), self.thumbs_dir)
+        self.assertEqual(image.width(), 250)
+        self.assertEqual(len(self._thumb_files()), 1)
+
+    def test_missing_file(self):
+        missing = os.path.join(self.tmp_dir, "missing.png")
+        self.assertEqual(decode_image(missing, missing, (64, 64), self.thumbs_dir), (None, "Missing"))
+
+    def test_memory_cache_hit(self):
+        cache = ThumbnailCache(self.thumbs_dir)
+        pix, _ = cache.load(self.photo, self.photo, (100, 100))
+        self.assertIs(cache.get(self.photo, (100, 100)), pix)
+        self.assertIsNone(cache.get(self.photo, (50, 50)))
+
+    def test_lru_is_byte_bounded(self):
+        cache = ThumbnailCache(self.thumbs_dir)
+        pix, _ = cache.load(self.photo, self.photo, (100, 100))
+        lru = PixmapLRU(PixmapLRU.cost(pix) * 2)
+        lru.put("a", pix)
+        lru.put("b", pix)
+        lru.get("a")
+        lru.put("c", pix)
+        self.assertIsNone(lru.get("b"))
+        self.assertIsNotNone(lru.get("a"))
+        self.assertEqual(lru.total_bytes, PixmapLRU.cost(pix) * 2)
+
+    def test_prune_drops_least_recently_used_levels(self):
+        paths = []
+        for level, used in ((64, 3), (256, 1), (512, 2)):
+            path = os.path.join(self.thumbs_dir, str(level), "ab", f"ab{level}.png")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(b"x" * 100)
+            os.utime(path, (used, used))
+            paths.append(path)
+
+        self.assertEqual(prune_thumbnails(self.thumbs_dir, 200), 100)
+        self.assertEqual(sorted(self._thumb_files()), sorted([paths[0], paths[2]]))
+        self.assertEqual(prune_thumbnails(self.thumbs_dir, 200), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
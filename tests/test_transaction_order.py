@@ -0,0 +1,84 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+from datetime import date
+from data_manager import DataManager
+
+
+class TestTransactionOrder(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.test_file = os.path.join(self.tmp_dir, "data.json")
+        self.dm = DataManager(self.test_file)
+        self.dm.data = {"profiles": [], "active_profile_id": None}
+        self.dm.create_profile("Order Profile", 0.0)
+
+    def tearDown(self):
+        self.dm.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _dates(self, category):
+        return [t["date"] for t in self.dm.get_transactions(category)]
+
+    def test_sorted_insertion(self):
+        for d in ["05.02.2026", "01.02.2026", "10.01.2026", "03.02.2026", "05.02.2026"]:
+            self.dm.add_transaction("mining", 100.0, d, date_str=d, ad_cost=5.0)
+        txs = self.dm.get_transactions("mining")
+        self.assertEqual(self._dates("mining")[::2], ["05.02.2026", "05.02.2026", "03.02.2026", "01.02.2026", "10.01.2026"])
+        # Newest entry of a day first, each ad cost row right below its parent
+        self.assertEqual(txs[1]["parent_id"], txs[0]["id"])
+        self.assertGreater(txs[0]["timestamp"], txs[2]["timestamp"])
+        self.assertTrue(all(t["date_ord"] for t in txs))
+
+        tx = txs[-2]
+        self.dm.update_transaction("mining", tx["id"], 100.0, "moved", "07.02.2026", "", ad_cost=5.0)
+        self.assertEqual(self._dates("mining")[:2], ["07.02.2026", "07.02.2026"])
+        self.assertEqual(self.dm.get_transactions("mining")[1]["parent_id"], tx["id"])
+
+    def test_range_query(self):
+        for d in ["28.01.2026", "01.02.2026", "02.02.2026", "15.02.2026", "01.03.2026"]:
+            self.dm.add_transaction("car_rental", 10.0, d, date_str=d)
+        rows = self.dm.query_transactions("car_rental", date(2026, 2, 1), date(2026, 2, 28))
+        self.assertEqual([t["date"] for t in rows], ["15.02.2026", "02.02.2026", "01.02.2026"])
+        self.assertEqual(self.dm.query_transactions("car_rental", date(2026, 4, 1), date(2026, 4, 30)), [])
+
+    def test_legacy_lists_are_sorted_on_load(self):
+        data = {"profiles": [{"id": "p1", "name": "Legacy", "starting_amount": 0.0, "mining": {"transactions": [
+            {"id": "a", "date": "01.01.2026", "amount": 1.0},
+            {"id": "b", "date": "bad", "amount": 2.0},
+            {"id": "c", "date": "2026-03-01", "amount": 3.0},
+        ]}}], "active_profile_id": "p1"}
+        self.dm.close()
+        with open(self.test_file, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+        dm = self.dm = DataManager(self.test_file)
+        self.assertEqual([t["id"] for t in dm.get_transactions("mining")], ["c", "a", "b"])
+        rows = dm.query_transactions("mining", date(2000, 1, 1), date(2100, 1, 1))
+        self.assertEqual([t["id"] for t in rows], ["c", "a"])
+
+    def test_cached_fields_follow_date_and_amount(self):
+        stale = {"id": "a", "date": "05.02.2026", "amount": 300.0, "date_ord": date(2020, 1, 1).toordinal(), "amount_minor": 100}
+        data = {"profiles": [{"id": "p1", "name": "Edited", "starting_amount": 0.0, "mining": {"transactions": [stale]}}],
+                "active_profile_id": "p1"}
+        self.dm.close()
+        with open(self.test_file, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+        dm = self.dm = DataManager(self.test_file)
+        self.assertEqual(dm.sum_range("mining", date(2026, 2, 1), date(2026, 2, 28)), (300.0, 0.0))
+
+        # Hand edit picked up by the file watcher
+        data["profiles"][0]["mining"]["transactions"][0].update(amount=50.0, date="06.03.2026")
+        with open(self.test_file, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        dm.loader._on_file_changed(self.test_file)
+        self.assertEqual(dm.sum_range("mining", date(2026, 2, 1), date(2026, 2, 28)), (0.0, 0.0))
+        self.assertEqual(dm.sum_range("mining", date(2026, 3, 1), date(2026, 3, 31)), (50.0, 0.0))
+        self.assertEqual(dm.get_category_stats("mining")["income"], 50.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
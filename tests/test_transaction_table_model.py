@@ -0,0 +1,62 @@
+import unittest
+from datetime import date
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import Qt
+from gui.tabs.generic_tab import TransactionTableModel
+
+# Ensure QApplication exists
+app = QApplication.instance() or QApplication([])
+
+
+class FakeDataManager:
+    def __init__(self, count):
+        self.rows = [{"id": str(i), "amount": 10.0 if i % 2 else -5.0, "item_name": f"Item {i}", "comment": "", "date": "01.02.2026"}
+                     for i in range(count)]
+        self.calls = []
+
+    def query_transactions(self, category, start=None, end=None, limit=None, offset=0):
+        self.calls.append((category, start, end, limit, offset))
+        return self.rows[offset:offset + limit]
+
+
+class TestTransactionTableModel(unittest.TestCase):
+    def setUp(self):
+        self.dm = FakeDataManager(1000)
+        self.model = TransactionTableModel(self.dm, "car_rental")
+
+    def test_loads_first_page_only(self):
+        period = (date(2026, 2, 1), date(2026, 2, 28))
+        self.model.set_period(period)
+        self.assertEqual(self.model.rowCount(), TransactionTableModel.PAGE_SIZE)
+        self.assertEqual(self.dm.calls, [("car_rental", *period, TransactionTableModel.PAGE_SIZE, 0)])
+        self.assertTrue(self.model.canFetchMore())
+
+    def test_fetch_more_until_exhausted(self):
+        self.model.set_period((None, None))
+        while self.model.canFetchMore():
+            self.model.fetchMore()
+        self.assertEqual(self.model.rowCount(), 1000)
+        self.assertEqual(self.model.transaction_at(999)["id"], "999")
+        self.assertIsNone(self.model.transaction_at(1000))
+
+    def test_display_and_id_roles(self):
+        self.model.set_period((None, None))
+        index = self.model.index(1, 0)
+        self.assertEqual(self.model.data(index), "$10")
+        self.assertEqual(self.model.data(index, Qt.ItemDataRole.UserRole), "1")
+        self.assertEqual(self.model.data(self.model.index(1, 1)), "Item 1")
+
+    def test_row_filter_skips_empty_pages(self):
+        self.model.set_period((None, None), lambda t: t["id"] == "950")
+        self.assertEqual(self.model.rowCount(), 1)
+        self.assertEqual(self.model.transaction_at(0)["id"], "950")
+
+    def test_no_period_shows_nothing(self):
+        self.model.set_period(None)
+        self.assertEqual(self.model.rowCount(), 0)
+        self.assertFalse(self.model.canFetchMore())
+        self.assertEqual(self.dm.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -51,6 +51,8 @@ class MockDataManager:
     def load_pixmap(self, path, size=None): 
         from PyQt6.QtGui import QPixmap
         return QPixmap()
+    def load_pixmap_async(self, path, size, callback):
+        callback(self.load_pixmap(path, size))
     def save_data(self): pass
     
     class DataChangedSignal:
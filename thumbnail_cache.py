@@ -0,0 +1,282 @@
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from PyQt6.QtCore import Qt, QObject, QByteArray, QBuffer, QIODevice, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader, QPixmap
+from image_store import REF_PREFIX, is_ref, is_data_uri
+
+# Edge lengths of the on-disk thumbnail levels; requests are served from the smallest level that covers them
+PYRAMID_LEVELS = (64, 128, 256, 512, 1024)
+
+
+def size_bucket(max_size):
+    """Smallest pyramid level covering max_size, or None when it is larger than the top level."""
+    edge = max(max_size)
+    for level in PYRAMID_LEVELS:
+        if edge <= level:
+            return level
+    return None
+
+
+def content_key(path, resolved):
+    """Stable identity of an image's content: the blob digest, or a hash of the source."""
+    if is_ref(path):
+        return path[len(REF_PREFIX):]
+    if is_data_uri(resolved):
+        return hashlib.sha256(resolved.encode()).hexdigest()
+    st = os.stat(resolved)
+    return hashlib.sha256(f"{os.path.abspath(resolved)}|{st.st_mtime_ns}|{st.st_size}".encode()).hexdigest()
+
+
+def _open_reader(resolved):
+    """QImageReader for a file path or a Base64 data URI (the buffer must outlive the reader)."""
+    if is_data_uri(resolved):
+        _, data = resolved.split(",", 1)
+        buffer = QBuffer()
+        buffer.setData(QByteArray.fromBase64(data.encode()))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        return QImageReader(buffer), buffer
+    return QImageReader(resolved), None
+
+
+def decode_image(path, resolved, max_size, thumbs_dir):
+    """
+    Decodes an image at (about) the requested size. Safe to call off the GUI thread.
+    Returns (QImage, None) or (None, placeholder text).
+    """
+    if not is_data_uri(resolved):
+        if not os.path.exists(resolved) or os.path.isdir(resolved):
+            logging.warning(f"Image not found or is dir: {resolved}")
+            return None, "Missing"
+        if os.path.getsize(resolved) == 0:
+            return None, "Empty"
+
+    bucket = size_bucket(max_size) if max_size else None
+    thumb_path = None
+    try:
+        if bucket:
+            key = content_key(path, resolved)
+            thumb_path = os.path.join(thumbs_dir, str(bucket), key[:2], f"{key}.png")
+            image = QImage(thumb_path) if os.path.exists(thumb_path) else QImage()
+            if not image.isNull():
+                _mark_used(thumb_path)
+                thumb_path = None # Already on disk
+            else:
+                image = _read_scaled(resolved, bucket)
+        else:
+            image = _read_scaled(resolved, max(max_size) if max_size else None)
+    except Exception as e:
+        logging.error(f"Failed to decode image {path[:80]}: {e}")
+        return None, "Error"
+
+    if image.isNull():
+        return None, "Bad Format"
+
+    if thumb_path:
+        _save_thumbnail(image, thumb_path)
+
+    if max_size:
+        w, h = max_size
+        image = image.scaled(w, h, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    return image, None
+
+
+def _read_scaled(resolved, edge):
+    """Reads the image, letting the decoder downscale to fit edge x edge (None = full size)."""
+    reader, buffer = _open_reader(resolved)
+    if edge:
+        source_size = reader.size()
+        if source_size.isValid() and max(source_size.width(), source_size.height()) > edge:
+            reader.setScaledSize(source_size.scaled(edge, edge, Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    if buffer:
+        buffer.close()
+    return image
+
+
+def _save_thumbnail(image, thumb_path):
+    try:
+        os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
+        temp_file = f"{thumb_path}.{threading.get_ident()}.tmp"
+        if image.save(temp_file, "PNG"):
+            os.replace(temp_file, thumb_path)
+    except OSError as e:
+        logging.warning(f"Could not persist thumbnail {thumb_path}: {e}")
+
+
+def _mark_used(thumb_path):
+    # The modification time doubles as last use, for prune_thumbnails
+    try:
+        os.utime(thumb_path)
+    except OSError:
+        pass
+
+
+def prune_thumbnails(thumbs_dir, max_bytes):
+    """
+    Deletes the least recently used thumbnails until thumbs_dir holds at most max_bytes.
+    Levels of edited or removed photos are never requested again, so they go first.
+    Returns the number of bytes freed.
+    """
+    entries = []
+    total = 0
+    for root, _, files in os.walk(thumbs_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+    freed = 0
+    for _, size, path in sorted(entries):
+        if total - freed <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            freed += size
+        except OSError:
+            pass
+    if freed:
+        logging.info(f"Pruned {freed} bytes of thumbnails from {thumbs_dir}")
+    return freed
+
+
+class PixmapLRU:
+    """Least-recently-used QPixmap cache bounded by decoded size in bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cost(pix):
+        return pix.width() * pix.height() * max(pix.depth(), 8) // 8
+
+    def get(self, key):
+        with self._lock:
+            pix = self._items.get(key)
+            if pix is not None:
+                self._items.move_to_end(key)
+            return pix
+
+    def put(self, key, pix):
+        cost = self.cost(pix)
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.total_bytes -= self.cost(old)
+            self._items[key] = pix
+            self.total_bytes += cost
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.total_bytes -= self.cost(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._items)
+
+
+class _DecodeTask(QRunnable):
+    def __init__(self, cache, key, path, resolved, max_size):
+        super().__init__()
+        self.cache = cache
+        self.key = key
+        self.path = path
+        self.resolved = resolved
+        self.max_size = max_size
+
+    def run(self):
+        image, error = decode_image(self.path, self.resolved, self.max_size, self.cache.thumbs_dir)
+        self.cache.decoded.emit(self.key, image, error)
+
+
+class ThumbnailCache(QObject):
+    """
+    Pixmaps for image paths at requested sizes.
+
+    Memory: byte-budgeted LRU of QPixmaps. Disk: thumbnails per pyramid level under
+    thumbs_dir, keyed by image content, so later sessions skip full-resolution decodes;
+    trimmed to max_disk_bytes (least recently used first) in the background on startup.
+    load() decodes on the calling thread; load_async() decodes on a small worker pool
+    and calls back on the GUI thread.
+    """
+    decoded = pyqtSignal(object, object, object) # key, QImage or None, placeholder text
+
+    def __init__(self, thumbs_dir, max_bytes=64 * 1024 * 1024, max_threads=2, max_disk_bytes=256 * 1024 * 1024, parent=None):
+        super().__init__(parent)
+        self.thumbs_dir = thumbs_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = PixmapLRU(max_bytes)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._pending = {}
+        self.decoded.connect(self._on_decoded)
+        if os.path.isdir(thumbs_dir):
+            threading.Thread(target=self.prune, name="ThumbnailPrune", daemon=True).start()
+
+    def prune(self):
+        """Trims the on-disk levels to max_disk_bytes; returns the bytes freed."""
+        try:
+            return prune_thumbnails(self.thumbs_dir, self.max_disk_bytes)
+        except OSError as e:
+            logging.warning(f"Thumbnail cleanup failed: {e}")
+            return 0
+
+    @staticmethod
+    def cache_key(path, max_size):
+        return (path, tuple(max_size) if max_size else None)
+
+    def get(self, path, max_size):
+        return self.memory.get(self.cache_key(path, max_size))
+
+    def load(self, path, resolved, max_size):
+        """Returns (QPixmap, None) or (None, placeholder text)."""
+        key = self.cache_key(path, max_size)
+        pix = self.memory.get(key)
+        if pix is not None:
+            return pix, None
+        image, error = decode_image(path, resolved, max_size, self.thumbs_dir)
+        if image is None:
+            return None, error
+        pix = QPixmap.fromImage(image)
+        self.memory.put(key, pix)
+        return pix, None
+
+    def load_async(self, path, resolved, max_size, callback):
+        """callback(QPixmap or None, placeholder text) runs on the GUI thread; repeated requests share one decode."""
+        key = self.cache_key(path, max_size)
+        callbacks = self._pending.get(key)
+        if callbacks is not None:
+            callbacks.append(callback)
+            return
+        self._pending[key] = [callback]
+        self.pool.start(_DecodeTask(self, key, path, resolved, max_size))
+
+    def _on_decoded(self, key, image, error):
+        pix = None
+        if image is not None:
+            pix = QPixmap.fromImage(image)
+            self.memory.put(key, pix)
+        for callback in self._pending.pop(key, []):
+            try:
+                callback(pix, error)
+            except RuntimeError:
+                # The widget waiting for this image was deleted meanwhile
+                pass
+            except Exception as e:
+                logging.error(f"Thumbnail callback failed: {e}")
+
+    def clear_memory(self):
+        self.memory.clear()
@@ -1,4 +1,4 @@
-from .core import resource_path, format_license_date, Money
+from .core import resource_path, format_license_date, parse_date_ordinal, Money
 from .hotkey_manager import HotkeyManager
 
-__all__ = ['resource_path', 'format_license_date', 'Money', 'HotkeyManager']
+__all__ = ['resource_path', 'format_license_date', 'parse_date_ordinal', 'Money', 'HotkeyManager']
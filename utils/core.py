@@ -1,8 +1,11 @@
 import sys
 import os
 from datetime import datetime
+from functools import lru_cache
 import logging
 
+DATE_FORMATS = ("%d.%m.%Y", "%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y")
+
 def resource_path(relative_path):
     if hasattr(sys, '_MEIPASS'):
         return os.path.join(sys._MEIPASS, relative_path)
@@ -66,18 +69,52 @@ def format_license_date(date_str):
 
     return "Неверный формат"
 
+@lru_cache(maxsize=8192)
+def parse_date_ordinal(date_str):
+    """
+    Day ordinal (date.toordinal()) of a transaction date string, 0 if it can't be parsed.
+    A time part is ignored. Cached, since the same few dates repeat across many rows.
+    """
+    if not date_str:
+        return 0
+    date_only = date_str.split(" ")[0]
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_only, fmt).toordinal()
+        except ValueError:
+            continue
+    return 0
+
 class Money:
-    """Handles monetary values in minor units (cents/kopecks)."""
+    """Handles monetary values in minor units (cents/kopecks). Immutable."""
+    __slots__ = ("amount",)
+
     def __init__(self, amount_in_minor=0):
-        self.amount = int(round(amount_in_minor))
+        object.__setattr__(self, "amount", int(round(amount_in_minor)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Money is immutable")
+
+    def __reduce__(self):
+        return (Money, (self.amount,))
+
+    @staticmethod
+    def to_minor(amount_in_major):
+        """Minor units of a major amount as a plain int; from_major without the object."""
+        try:
+            return round(float(amount_in_major) * 100)
+        except (ValueError, TypeError):
+            return 0
 
     @classmethod
     def from_major(cls, amount_in_major):
         """Creates Money from major unit (float/int dollars)."""
-        try:
-            return cls(round(float(amount_in_major) * 100))
-        except (ValueError, TypeError):
-            return cls(0)
+        return cls(Money.to_minor(amount_in_major))
+
+    @classmethod
+    def sum_major(cls, amounts_in_major):
+        """Sum of major amounts, each rounded like from_major."""
+        return cls(sum(map(Money.to_minor, amounts_in_major)))
 
     def to_major(self):
         """Returns value in major unit (float dollars)."""
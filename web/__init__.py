@@ -6,11 +6,14 @@ from werkzeug.middleware.proxy_fix import ProxyFix
 from .config import Config
 import os
 
+# Per-event SocketIO/Engine.IO logging is expensive under heartbeat load; opt in for debugging
+SOCKETIO_DEBUG = os.environ.get('SOCKETIO_DEBUG') == '1'
+
 db = SQLAlchemy()
 login_manager = LoginManager()
 login_manager.login_view = 'main.login'
 login_manager.login_message_category = 'info'
-socketio = SocketIO(cors_allowed_origins="*", async_mode='gevent', logger=True, engineio_logger=True)
+socketio = SocketIO(cors_allowed_origins="*", async_mode='gevent', logger=SOCKETIO_DEBUG, engineio_logger=SOCKETIO_DEBUG)
 
 def create_app(config_class=Config):
     print("DEBUG: create_app() started")
@@ -40,6 +43,16 @@ def create_app(config_class=Config):
     app.register_blueprint(api_routes)
     print("DEBUG: Routes registered")
 
+    # Periodic write of buffered client heartbeats
+    from .checkin_buffer import checkin_buffer
+    checkin_buffer.start(app)
+    # Batched client updates for admin dashboards
+    from .dashboard_feed import dashboard_feed
+    dashboard_feed.start(app)
+    # Periodic Active -> Offline status update for silent clients
+    from .offline_sweeper import offline_sweeper
+    offline_sweeper.start(app)
+
     # Logging Configuration
     if not app.debug:
         import logging
@@ -113,6 +126,20 @@ def migrate_db(app):
                     conn.execute(text("ALTER TABLE client ADD COLUMN license_expiry DATETIME"))
                     conn.commit()
 
+            # Check for 'updated_at'
+            if "updated_at" not in columns:
+                app.logger.info("Migrating: Adding updated_at to client")
+                with db.engine.connect() as conn:
+                    conn.execute(text("ALTER TABLE client ADD COLUMN updated_at DATETIME"))
+                    conn.execute(text("UPDATE client SET updated_at = last_seen"))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_client_updated_at ON client (updated_at)"))
+                    conn.commit()
+
+            # Index used by the offline sweeper
+            with db.engine.connect() as conn:
+                conn.execute(text("CREATE INDEX IF NOT EXISTS ix_client_last_seen ON client (last_seen)"))
+                conn.commit()
+
         # 2. Check User table
         if inspector.has_table("user"):
             columns = [c['name'] for c in inspector.get_columns("user")]
@@ -0,0 +1,48 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Process-local key/value cache. Entries expire `ttl` seconds after they were stored;
+    with max_entries the oldest entries are dropped first. Writers that change the
+    underlying rows call invalidate() so readers do not wait for the TTL.
+    """
+
+    def __init__(self, ttl, max_entries=None, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            stored_at, value = entry
+            if self._clock() - stored_at >= self.ttl:
+                del self._entries[key]
+                return default
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (self._clock(), value)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        """Drops one entry, or all of them when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,164 @@
+import threading
+from sqlalchemy import bindparam, case, func
+
+from . import db, socketio
+from .cache import TTLCache
+from .models import Client
+
+
+class ClientState:
+    """What a check-in needs to know about a client, kept between heartbeats."""
+    __slots__ = (
+        "id", "client_id", "status", "license_expiry", "user_id", "owner_login", "owner_full_name",
+        "username", "name", "hwid", "version", "ip_address", "last_seen",
+    )
+
+    @classmethod
+    def from_client(cls, client):
+        state = cls()
+        state.id = client.id
+        state.client_id = client.client_id
+        state.status = client.status
+        state.license_expiry = client.license_expiry
+        state.user_id = client.user_id
+        state.owner_login = client.owner.username if client.owner else None
+        state.owner_full_name = client.owner.full_name if client.owner else None
+        state.username = client.username
+        state.name = client.name
+        state.hwid = client.hwid
+        state.version = client.version
+        state.ip_address = client.ip_address
+        state.last_seen = client.last_seen
+        return state
+
+    def link_owner(self, user):
+        self.user_id = user.id
+        self.owner_login = user.username
+        self.owner_full_name = user.full_name
+
+    def to_dashboard(self):
+        """Row as the admin dashboard shows it (same login/name mapping as /api/clients)."""
+        # LOGIN column: registered username if available, otherwise what the client sent
+        display_login = self.owner_login or self.username or "Unknown"
+        # NAME column: registered full name if available, otherwise the client profile name
+        display_name = self.owner_full_name or self.name
+        if not display_name or display_name == "Unknown":
+            display_name = display_login
+        return {
+            "id": self.id,
+            "client_id": self.client_id,
+            "username": display_login,
+            "name": display_name,
+            "hwid": self.hwid,
+            "version": self.version,
+            "last_seen": self.last_seen.isoformat() if self.last_seen else None,
+            "ip": self.ip_address,
+            "status": self.status,
+            "license_expiry": self.license_expiry.isoformat() if self.license_expiry else None
+        }
+
+
+_client_table = Client.__table__
+
+# One statement for the whole batch. A queued heartbeat never lifts a ban that was set
+# after it was received, and only heartbeats that passed the checks mark a client Active.
+_HEARTBEAT_UPDATE = _client_table.update().where(
+    _client_table.c.client_id == bindparam("b_client_id")
+).values(
+    last_seen=bindparam("b_last_seen"),
+    ip_address=bindparam("b_ip_address"),
+    version=func.coalesce(bindparam("b_version"), _client_table.c.version),
+    username=bindparam("b_username"),
+    name=bindparam("b_name"),
+    hwid=bindparam("b_hwid"),
+    user_id=func.coalesce(bindparam("b_user_id"), _client_table.c.user_id),
+    status=case(
+        ((bindparam("b_active") == 1) & (func.coalesce(_client_table.c.status, "") != "Banned"), "Active"),
+        else_=_client_table.c.status
+    ),
+)
+
+
+class CheckinBuffer:
+    """
+    Write-behind store for client heartbeats.
+
+    Check-ins are answered from the cached ClientState of each client, reloaded from the
+    database after `state_ttl` seconds (changes made by other workers). Their last_seen,
+    IP and reported fields are queued per client and written by flush() as one
+    executemany, every `interval` seconds from a background task (or earlier once
+    `max_pending` clients are queued). Admin actions write the database directly and
+    drop the cached state with forget(), so the next check-in decides on fresh data.
+    """
+
+    def __init__(self, interval=5.0, max_pending=500, state_ttl=300.0, max_states=50000):
+        self.interval = interval
+        self.max_pending = max_pending
+        self._states = TTLCache(state_ttl, max_states)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._started = False
+
+    def get(self, client_id):
+        return self._states.get(client_id)
+
+    def put(self, state):
+        self._states.put(state.client_id, state)
+
+    def forget(self, client_id):
+        self._states.invalidate(client_id)
+
+    def record(self, state, active):
+        """Queues the heartbeat fields of state; active marks the client Active on flush."""
+        with self._lock:
+            self._pending[state.client_id] = {
+                "b_client_id": state.client_id,
+                "b_last_seen": state.last_seen,
+                "b_ip_address": state.ip_address,
+                "b_version": state.version,
+                "b_username": state.username,
+                "b_name": state.name,
+                "b_hwid": state.hwid,
+                "b_user_id": state.user_id,
+                "b_active": 1 if active else 0,
+            }
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Writes queued heartbeats in one statement; returns the number of clients written."""
+        with self._lock:
+            batch, self._pending = list(self._pending.values()), {}
+        if not batch:
+            return 0
+        try:
+            db.session.execute(_HEARTBEAT_UPDATE, batch)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            # Keep the heartbeats for the next attempt unless newer ones arrived meanwhile
+            with self._lock:
+                for row in batch:
+                    self._pending.setdefault(row["b_client_id"], row)
+            raise
+        return len(batch)
+
+    def start(self, app):
+        """Starts the periodic flush as a SocketIO background task (once per process)."""
+        if self._started:
+            return
+        self._started = True
+        socketio.start_background_task(self._run, app)
+
+    def _run(self, app):
+        while True:
+            socketio.sleep(self.interval)
+            with app.app_context():
+                try:
+                    self.flush()
+                except Exception as e:
+                    app.logger.error(f"[Checkin] Heartbeat flush failed: {e}")
+
+
+checkin_buffer = CheckinBuffer()
@@ -0,0 +1,101 @@
+import time
+import threading
+from flask import request
+from flask_login import current_user
+
+from . import socketio
+
+
+class _Subscriber:
+    __slots__ = ("pending", "sent_at")
+
+    def __init__(self):
+        self.pending = {}
+        self.sent_at = None
+
+
+class DashboardFeed:
+    """
+    Coalesced client updates for admin dashboards.
+
+    publish() keeps only the latest row per client; every `tick` seconds the rows are
+    handed to each subscribed dashboard socket as one clients_delta event. A socket gets
+    its next batch only after acknowledging the previous one (or after ack_timeout);
+    rows arriving meanwhile replace each other, so a slow dashboard skips intermediate
+    states instead of queueing them.
+    """
+
+    def __init__(self, tick=0.25, ack_timeout=10.0, clock=time.monotonic):
+        self.tick_interval = tick
+        self.ack_timeout = ack_timeout
+        self._clock = clock
+        self._rows = {}
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._started = False
+
+    def publish(self, row):
+        with self._lock:
+            self._rows[row["client_id"]] = row
+
+    def subscribe(self, sid):
+        with self._lock:
+            self._subscribers.setdefault(sid, _Subscriber())
+
+    def unsubscribe(self, sid):
+        with self._lock:
+            self._subscribers.pop(sid, None)
+
+    def tick(self):
+        """Sends the rows published since the last tick; returns the number of events emitted."""
+        with self._lock:
+            rows, self._rows = self._rows, {}
+            now = self._clock()
+            batches = []
+            for sid, subscriber in self._subscribers.items():
+                subscriber.pending.update(rows)
+                if not subscriber.pending:
+                    continue
+                if subscriber.sent_at is not None and now - subscriber.sent_at < self.ack_timeout:
+                    continue # Previous batch not acknowledged yet
+                batches.append((sid, list(subscriber.pending.values())))
+                subscriber.pending = {}
+                subscriber.sent_at = now
+        for sid, batch in batches:
+            socketio.emit('clients_delta', {"clients": batch}, to=sid, callback=lambda *args, sid=sid: self._acked(sid))
+        return len(batches)
+
+    def _acked(self, sid):
+        with self._lock:
+            subscriber = self._subscribers.get(sid)
+            if subscriber:
+                subscriber.sent_at = None
+
+    def start(self, app):
+        """Starts the periodic fan-out as a SocketIO background task (once per process)."""
+        if self._started:
+            return
+        self._started = True
+        socketio.start_background_task(self._run, app)
+
+    def _run(self, app):
+        while True:
+            socketio.sleep(self.tick_interval)
+            try:
+                self.tick()
+            except Exception as e:
+                app.logger.error(f"[Dashboard] Fan-out failed: {e}")
+
+
+dashboard_feed = DashboardFeed()
+
+
+@socketio.on('dashboard_subscribe')
+def dashboard_subscribe():
+    if current_user.is_authenticated:
+        dashboard_feed.subscribe(request.sid)
+
+
+@socketio.on('disconnect')
+def dashboard_disconnect(*args):
+    dashboard_feed.unsubscribe(request.sid)
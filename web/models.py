@@ -25,7 +25,9 @@ class Client(db.Model):
     name = db.Column(db.String(100), nullable=True)
     hwid = db.Column(db.String(100), nullable=True)
     version = db.Column(db.String(20), nullable=False)
-    last_seen = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_seen = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    # Set on every write to the row; /api/clients?since= syncs on it
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     ip_address = db.Column(db.String(50))
     status = db.Column(db.String(20), default='Active') # Active, Offline, Banned
     license_expiry = db.Column(db.DateTime, nullable=True) # None means Lifetime
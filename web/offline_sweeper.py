@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+from . import db, socketio
+from .checkin_buffer import checkin_buffer
+from .dashboard_feed import dashboard_feed
+from .models import Client
+
+# A client is online while its last heartbeat is younger than this
+ONLINE_THRESHOLD = timedelta(minutes=3)
+
+
+class OfflineSweeper:
+    """
+    Marks Active clients without a heartbeat for ONLINE_THRESHOLD as Offline.
+
+    Runs every `interval` seconds as a SocketIO background task, so status stays current
+    whether or not a dashboard is open. Stale rows are found through the last_seen index
+    and updated in chunks of `chunk_size`; each changed client is published to the
+    dashboard feed.
+    """
+
+    def __init__(self, interval=30.0, chunk_size=500):
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self._started = False
+
+    def sweep(self, now=None):
+        """Marks stale clients Offline; returns the client_ids that changed."""
+        # Queued heartbeats first, so a client that just checked in is not swept
+        checkin_buffer.flush()
+        cutoff = (now or datetime.utcnow()) - ONLINE_THRESHOLD
+        stale = (Client.status == 'Active', Client.last_seen < cutoff)
+
+        rows = db.session.query(Client.id, Client.client_id).filter(*stale).all()
+        swept = []
+        try:
+            for i in range(0, len(rows), self.chunk_size):
+                chunk = rows[i:i + self.chunk_size]
+                db.session.execute(
+                    db.update(Client)
+                    .where(Client.id.in_([row.id for row in chunk]), *stale)
+                    .values(status='Offline')
+                )
+                swept.extend(row.client_id for row in chunk)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        for client_id in swept:
+            dashboard_feed.publish({"client_id": client_id, "status": "Offline", "is_online": False})
+        return swept
+
+    def start(self, app):
+        """Starts the periodic sweep as a SocketIO background task (once per process)."""
+        if self._started:
+            return
+        self._started = True
+        socketio.start_background_task(self._run, app)
+
+    def _run(self, app):
+        while True:
+            socketio.sleep(self.interval)
+            with app.app_context():
+                try:
+                    swept = self.sweep()
+                    if swept:
+                        app.logger.info(f"[Sweeper] Marked {len(swept)} clients offline")
+                except Exception as e:
+                    app.logger.error(f"[Sweeper] Offline sweep failed: {e}")
+
+
+offline_sweeper = OfflineSweeper()
@@ -1,9 +1,15 @@
 from flask import Blueprint, render_template, url_for, flash, redirect, request, jsonify, current_app, send_file
 from . import db, socketio
 from .models import User, Client, ServerSettings, AdminLog
+from .checkin_buffer import checkin_buffer, ClientState
+from .cache import TTLCache
+from .dashboard_feed import dashboard_feed
+from .offline_sweeper import ONLINE_THRESHOLD
 from flask_login import login_user, current_user, logout_user, login_required
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta
+from sqlalchemy.orm import joinedload
+from types import SimpleNamespace
 import os
 import hashlib
 import requests
@@ -58,12 +64,30 @@ def get_server_settings():
             last_upload_notes = "Update highly recommended."
         return DummySettings()
 
+# Read-only snapshot of ServerSettings for the public endpoints; admin changes invalidate it
+_settings_cache = TTLCache(ttl=60)
+
+def get_cached_settings():
+    snapshot = _settings_cache.get("settings")
+    if snapshot is None:
+        settings = get_server_settings()
+        snapshot = SimpleNamespace(**{
+            column.name: getattr(settings, column.name, None) for column in ServerSettings.__table__.columns
+        })
+        # Keep retrying the DB while it only yields the fallback settings
+        if isinstance(settings, ServerSettings):
+            _settings_cache.put("settings", snapshot)
+    return snapshot
+
+def invalidate_settings():
+    _settings_cache.invalidate()
+
 @main_routes.route('/update_info', methods=['GET'])
 def update_info():
     """
     Returns update metadata. Supports priority versioning (stable vs latest).
     """
-    settings = get_server_settings()
+    settings = get_cached_settings()
     base_url = request.url_root.rstrip('/')
     
     # Determine which version to serve based on priority
@@ -140,6 +164,7 @@ def force_hotfix():
              settings.last_upload_date = datetime.utcnow()
              
              db.session.commit()
+             invalidate_settings()
              log_admin_action("Force Hotfix", "All", f"Manifest updated. Hash: {new_hash[:8]}...")
              return jsonify({"status": "ok", "msg": "Хотфикс успешно запущен. Манифест обновлен на основе текущего файла."})
         else:
@@ -160,6 +185,7 @@ def force_update():
         settings.force_update = not settings.force_update
         
     db.session.commit()
+    invalidate_settings()
     log_admin_action("Toggle Force Update", "All", f"Enabled: {settings.force_update}")
     return jsonify({"status": "ok", "force_update": settings.force_update})
 
@@ -183,6 +209,7 @@ def set_version():
         settings.priority_version = priority
         
     db.session.commit()
+    invalidate_settings()
     return jsonify({
         "status": "ok", 
         "current_version": settings.current_version,
@@ -232,6 +259,7 @@ def upload_update():
         settings.last_upload_notes = notes
         
         db.session.commit()
+        invalidate_settings()
         
         current_app.logger.info(f"New version {version} uploaded. Size: {file_size}, Hash: {signature}")
         
@@ -266,93 +294,76 @@ def client_checkin():
         return jsonify({"error": "Missing client_id"}), 400
     
     try:
-        # Check database for client
-        client = Client.query.filter_by(client_id=client_id).first()
-        # Find user by LOGIN (username)
-        user = User.query.filter_by(username=received_login).first()
-        
-        if client:
-            # Update last seen and IP always
-            client.last_seen = datetime.utcnow()
-            client.ip_address = ip_address
-            client.version = version
-            client.username = received_login
-            client.name = received_name
-            client.hwid = hwid
-            
-            # Check if banned
-            if client.status == 'Banned':
-                db.session.commit() # Save the updated last_seen even if banned
-                current_app.logger.warning(f"[Checkin] REJECTED: Banned client {client_id}")
-                return jsonify({
-                    "status": "banned", 
-                    "message": "Ваш доступ заблокирован администратором. Пожалуйста, свяжитесь с поддержкой для выяснения причин."
-                }), 403
-
-            # Check if license expired
-            if client.license_expiry and client.license_expiry < datetime.utcnow():
+        now = datetime.utcnow()
+        # Known clients are answered from the heartbeat buffer, without touching the DB
+        state = checkin_buffer.get(client_id)
+        if state is None:
+            client = Client.query.filter_by(client_id=client_id).first()
+            if not client:
+                # Create new client record
+                client = Client(
+                    client_id=client_id, 
+                    version=version, 
+                    username=received_login, 
+                    name=received_name,
+                    hwid=hwid,
+                    ip_address=ip_address, 
+                    status='Active',
+                    license_expiry=now + timedelta(days=7) # Default 7 days for new clients
+                )
+                db.session.add(client)
                 db.session.commit()
-                current_app.logger.info(f"[Checkin] License expired for client {client_id}")
-                return jsonify({
-                    "status": "expired",
-                    "message": f"Срок действия вашей лицензии истек {client.license_expiry.strftime('%d.%m.%Y %H:%M')}. Пожалуйста, продлите подписку."
-                }), 402
-
-            # Only update status to Active if it's not Banned
-            client.status = 'Active'
-            
-            if user:
-                client.owner = user
+            state = ClientState.from_client(client)
+            checkin_buffer.put(state)
+            login_changed = True
         else:
-            # Create new client record
-            client = Client(
-                client_id=client_id, 
-                version=version, 
-                username=received_login, 
-                name=received_name,
-                hwid=hwid,
-                ip_address=ip_address, 
-                status='Active',
-                license_expiry=datetime.utcnow() + timedelta(days=7) # Default 7 days for new clients
-            )
-            if user: 
-                client.owner = user
-            db.session.add(client)
-        
-        db.session.commit()
+            login_changed = state.username != received_login
         
-        # Mapping logic for response/broadcast
-        owner_login = client.owner.username if client.owner else None
-        owner_full_name = client.owner.full_name if client.owner else None
-        
-        # LOGIN column: Use registered username if available, otherwise what client sent
-        display_login = owner_login or client.username or "Unknown"
-        
-        # NAME column: Use registered full name if available, otherwise client profile name
-        display_name = owner_full_name or client.name
-        if not display_name or display_name == "Unknown":
-            display_name = display_login # Fallback to login if name is missing
-
-        # Broadcast to all connected clients via WebSocket (Admin panel update)
-        socketio.emit('client_update', {
-            "id": client.id,
-            "client_id": client.client_id,
-            "username": display_login,
-            "name": display_name,
-            "hwid": client.hwid,
-            "version": client.version,
-            "last_seen": client.last_seen.isoformat(),
-            "ip": client.ip_address,
-            "status": client.status,
-            "license_expiry": client.license_expiry.isoformat() if client.license_expiry else None
-        })
+        # Find user by LOGIN (username), only when the client reports a different login
+        if login_changed:
+            user = User.query.filter_by(username=received_login).first()
+            if user:
+                state.link_owner(user)
+
+        # Update last seen and IP always
+        state.last_seen = now
+        state.ip_address = ip_address
+        state.version = version or state.version
+        state.username = received_login
+        state.name = received_name
+        state.hwid = hwid
+
+        # Check if banned
+        if state.status == 'Banned':
+            checkin_buffer.record(state, active=False) # Save the updated last_seen even if banned
+            current_app.logger.warning(f"[Checkin] REJECTED: Banned client {client_id}")
+            return jsonify({
+                "status": "banned", 
+                "message": "Ваш доступ заблокирован администратором. Пожалуйста, свяжитесь с поддержкой для выяснения причин."
+            }), 403
+
+        # Check if license expired
+        if state.license_expiry and state.license_expiry < now:
+            checkin_buffer.record(state, active=False)
+            current_app.logger.info(f"[Checkin] License expired for client {client_id}")
+            return jsonify({
+                "status": "expired",
+                "message": f"Срок действия вашей лицензии истек {state.license_expiry.strftime('%d.%m.%Y %H:%M')}. Пожалуйста, продлите подписку."
+            }), 402
+
+        # Only update status to Active if it's not Banned
+        state.status = 'Active'
+        checkin_buffer.record(state, active=True)
+
+        # Admin panel update, coalesced with other heartbeats into one clients_delta per tick
+        dashboard_feed.publish(dict(state.to_dashboard(), is_online=True))
 
         return jsonify({
             "status": "ok",
             "message": "Checkin successful",
-            "commands": commands,
-            "license_expiry": client.license_expiry.isoformat() if client.license_expiry else None,
-            "server_time": datetime.utcnow().isoformat()
+            "commands": PENDING_COMMANDS.pop(client_id, []),
+            "license_expiry": state.license_expiry.isoformat() if state.license_expiry else None,
+            "server_time": now.isoformat()
         })
         
     except Exception as e:
@@ -519,6 +530,7 @@ def logout():
 @main_routes.route("/dashboard")
 @login_required
 def dashboard():
+    checkin_buffer.flush()
     clients = Client.query.order_by(Client.last_seen.desc()).all()
     settings = get_server_settings()
     admin_logs = AdminLog.query.order_by(AdminLog.timestamp.desc()).limit(20).all()
@@ -533,68 +545,99 @@ def sync():
 def health():
     return jsonify({"status": "healthy", "timestamp": datetime.utcnow()})
 
+CLIENTS_PAGE_MAX = 1000
+
+def _parse_timestamp(value):
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+def _client_row(c, now):
+    # Mapping logic for Login (username) and Name (full_name/profile_name)
+    owner_login = c.owner.username if c.owner else None
+    owner_full_name = c.owner.full_name if c.owner else None
+
+    # LOGIN column: registered login or client-sent username
+    display_login = owner_login or c.username or "Unknown"
+
+    # NAME column: registered full name or client-sent profile name
+    display_name = owner_full_name or c.name
+    if not display_name or display_name == "Unknown":
+        display_name = display_login # Fallback
+
+    return {
+        "id": c.id,
+        "client_id": c.client_id,
+        "username": display_login,
+        "name": display_name,
+        "hwid": c.hwid or "—",
+        "version": c.version or "1.0.0",
+        "last_seen": c.last_seen.isoformat() if c.last_seen else None,
+        "ip": c.ip_address or "0.0.0.0",
+        "status": c.status,
+        "is_online": (now - c.last_seen) < ONLINE_THRESHOLD if c.last_seen else False,
+        "license_expiry": c.license_expiry.isoformat() if c.license_expiry else None
+    }
+
 @main_routes.route("/api/clients")
 @login_required
 def api_clients():
+    """
+    One page of clients ordered by id, as a JSON list.
+
+    Query parameters: after=<id> (keyset cursor), limit, status (comma separated),
+    version, online=1|0 and since=<ISO timestamp> (only rows changed after it).
+    X-Next-Cursor carries the cursor of the next page when there is one; X-Server-Time
+    is the value to pass as since on the next poll.
+    """
     # Admin session required via @login_required
     current_app.logger.info("[API] /api/clients requested")
+    after = request.args.get('after', 0, type=int)
+    limit = min(max(request.args.get('limit', 200, type=int), 1), CLIENTS_PAGE_MAX)
+    since = None
+    if request.args.get('since'):
+        since = _parse_timestamp(request.args['since'])
+        if since is None:
+            return jsonify({"error": "Invalid since timestamp"}), 400
+
     try:
-        # Optimization: Sort by ID ASC to keep positions stable
-        limit = request.args.get('limit', 200, type=int)
-        clients = Client.query.order_by(Client.id.asc()).limit(limit).all()
-        
-        # Determine who is REALLY online (last seen within 3 minutes)
+        # Queued heartbeats first, so last_seen is current
+        checkin_buffer.flush()
+
+        # Taken before reading, so rows written during this request show up in the next poll.
+        # Status is kept by the offline sweeper; is_online below is derived from last_seen.
         now = datetime.utcnow()
-        online_threshold = timedelta(minutes=3)
+        online_since = now - ONLINE_THRESHOLD
+
+        query = Client.query.options(joinedload(Client.owner)).filter(Client.id > after)
+        if request.args.get('status'):
+            query = query.filter(Client.status.in_(request.args['status'].split(',')))
+        if request.args.get('version'):
+            query = query.filter(Client.version == request.args['version'])
+        online = request.args.get('online')
+        if online in ('1', 'true'):
+            query = query.filter(Client.last_seen >= online_since)
+        elif online in ('0', 'false'):
+            query = query.filter(Client.last_seen < online_since)
+        if since is not None:
+            query = query.filter(Client.updated_at > since)
+        # Sort by ID ASC to keep positions stable; the id is also the page cursor
+        clients = query.order_by(Client.id.asc()).limit(limit).all()
 
         result = []
-        needs_commit = False
-        
         for c in clients:
             try:
-                is_online = (now - c.last_seen) < online_threshold if c.last_seen else False
-                
-                # Update status to Offline if threshold passed, but don't commit yet
-                if not is_online and c.status == 'Active':
-                    c.status = 'Offline'
-                    needs_commit = True
-
-                # Mapping logic for Login (username) and Name (full_name/profile_name)
-                owner_login = c.owner.username if c.owner else None
-                owner_full_name = c.owner.full_name if c.owner else None
-                
-                # LOGIN column: registered login or client-sent username
-                display_login = owner_login or c.username or "Unknown"
-                
-                # NAME column: registered full name or client-sent profile name
-                display_name = owner_full_name or c.name
-                if not display_name or display_name == "Unknown":
-                    display_name = display_login # Fallback
-
-                result.append({
-                    "id": c.id,
-                    "client_id": c.client_id,
-                    "username": display_login,
-                    "name": display_name,
-                    "hwid": c.hwid or "—",
-                    "version": c.version or "1.0.0",
-                    "last_seen": c.last_seen.isoformat() if c.last_seen else None,
-                    "ip": c.ip_address or "0.0.0.0",
-                    "status": c.status,
-                    "is_online": is_online,
-                    "license_expiry": c.license_expiry.isoformat() if c.license_expiry else None
-                })
+                result.append(_client_row(c, now))
             except Exception as e:
                 current_app.logger.error(f"[API] Error serializing client: {e}")
                 continue
-        
-        if needs_commit:
-            try:
-                db.session.commit()
-            except:
-                db.session.rollback()
-                
-        return jsonify(result)
+
+        response = jsonify(result)
+        response.headers['X-Server-Time'] = now.isoformat()
+        if len(clients) == limit:
+            response.headers['X-Next-Cursor'] = str(clients[-1].id)
+        return response
     except Exception as e:
         current_app.logger.error(f"[API] Global error in api_clients: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
@@ -663,6 +706,7 @@ def client_extend():
         action_msg = f"Extended by {days} days"
         
     db.session.commit()
+    checkin_buffer.forget(client_id)
     log_admin_action("Extend License", client_id, action_msg)
     return jsonify({"status": "ok", "license_expiry": client.license_expiry.isoformat() if client.license_expiry else None})
 
@@ -678,6 +722,7 @@ def client_revoke():
         
     client.license_expiry = datetime.utcnow() - timedelta(seconds=1)
     db.session.commit()
+    checkin_buffer.forget(client_id)
     log_admin_action("Revoke License", client_id)
     return jsonify({"status": "ok"})
 
@@ -693,6 +738,7 @@ def client_ban():
         
     client.status = 'Banned'
     db.session.commit()
+    checkin_buffer.forget(client_id)
     log_admin_action("Ban Client", client_id)
     return jsonify({"status": "ok"})
 
@@ -708,6 +754,7 @@ def client_unban():
         
     client.status = 'Active'
     db.session.commit()
+    checkin_buffer.forget(client_id)
     log_admin_action("Unban Client", client_id)
     return jsonify({"status": "ok"})
 
@@ -724,6 +771,7 @@ def client_reset_hwid():
     old_hwid = client.hwid
     client.hwid = None
     db.session.commit()
+    checkin_buffer.forget(client_id)
     log_admin_action("Reset HWID", client_id, f"Old HWID: {old_hwid}")
     return jsonify({"status": "ok"})
 
@@ -739,6 +787,7 @@ def client_disconnect():
         
     client.status = 'Offline'
     db.session.commit()
+    checkin_buffer.forget(client_id)
     log_admin_action("Disconnect Client", client_id)
     # Ideally we'd send a websocket message to the client to force close
     socketio.emit('force_disconnect', {"client_id": client_id})